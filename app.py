@@ -1,8 +1,16 @@
 # -*- coding: utf-8 -*-
 # Punto de entrada (Page) y montaje del controlador
+# Uso: python app.py                 (ventana de escritorio)
+#      python app.py --server [--port 8550]   (web, varias sesiones a la vez)
+#      python app.py --startup-profile        (coste de import por módulo)
 
+import argparse
+import sys
 import flet as ft
 from logic.controller import AssistantController
+from logic import result_table
+from logic.sessions import SESSIONS
+from games import registry
 
 def app(page: ft.Page):
     page.title = "Chatbot de Orientación Vocacional"
@@ -11,10 +19,30 @@ def app(page: ft.Page):
     page.vertical_alignment = ft.MainAxisAlignment.START
 
     controller = AssistantController(page)
+    sid = SESSIONS.register(controller, getattr(page, "session_id", None))
+    page.on_close = lambda e: SESSIONS.drop(sid)
     controller.mount()  # Construye layout y lanza el saludo
+    registry.preload("ruleta", "damas")  # importa los juegos en segundo plano
 
 
 if __name__ == "__main__":
-    ft.app(target=app, assets_dir="assets")
+    parser = argparse.ArgumentParser(description="Chatbot de Orientación Vocacional")
+    parser.add_argument("--server", action="store_true",
+                        help="Servir como app web (muchas sesiones, limpieza de inactivas)")
+    parser.add_argument("--port", type=int, default=8550)
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Mostrar el coste de import por módulo y salir (falla si supera el presupuesto)")
+    args = parser.parse_args()
 
+    if args.startup_profile:
+        from tools.startup_profile import report
+        sys.exit(report())
 
+    result_table.warm()  # tabla de resultados del test (se regenera si cambió el catálogo)
+    from games.ruleta import cache as wheel_cache
+    wheel_cache.warm()   # rueda de la ruleta (disco o render) en segundo plano
+    if args.server:
+        SESSIONS.start()  # desaloja sesiones inactivas y reporta sesiones/memoria
+        ft.app(target=app, assets_dir="assets", view=ft.AppView.WEB_BROWSER, port=args.port)
+    else:
+        ft.app(target=app, assets_dir="assets")
@@ -0,0 +1,497 @@
+# -*- coding: utf-8 -*-
+# games/damas/ai.py
+# Rival de computadora para Damas: negamax alfa-beta con profundización iterativa,
+# hash Zobrist + tabla de transposición acotada, orden de jugadas y límite de tiempo
+from __future__ import annotations
+
+import heapq
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from . import bitboard as bb
+from .bitboard import Move
+from .tablebase import Tablebase, get_tablebase
+
+# nivel -> (profundidad máxima, segundos por jugada, ruido en la evaluación de la raíz)
+LEVELS: Dict[str, Tuple[int, float, int]] = {
+    "facil":   (2, 0.25, 60),
+    "medio":   (4, 0.6, 15),
+    "dificil": (8, 1.5, 0),
+    "experto": (32, 3.0, 0),
+}
+DEFAULT_LEVEL = "medio"
+
+WIN = 100_000                 # victoria a distancia 0 (se resta el ply para preferir la más corta)
+PIECE = 100
+TT_BITS = 18                  # 2^18 entradas (~260k) en la tabla de transposición
+ZOBRIST_SEED = 0x5EED_DA3A    # fija: mismas claves en todos los procesos
+CHECK_EVERY = 1024            # nodos entre consultas del reloj
+MAX_PLY = 64
+PARALLEL_LEVELS = ("dificil", "experto")    # niveles que reparten la raíz entre procesos
+MAX_WORKERS = 4
+SHARED_TT = 4096              # entradas de la tabla que viajan entre procesos por iteración
+TIMEOUT_GRACE = 0.25          # margen para que los procesos devuelvan tras su límite
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+# ---------- Zobrist ----------
+def _zobrist():
+    rng = random.Random(ZOBRIST_SEED)
+    pieces = {p: tuple(rng.getrandbits(64) for _ in range(bb.SQUARES)) for p in (1, 2)}
+    return pieces, rng.getrandbits(64)
+
+
+ZOBRIST, ZOBRIST_SIDE = _zobrist()
+
+
+def zobrist_key(red: int, blue: int, turn: int) -> int:
+    key = ZOBRIST_SIDE if turn == 2 else 0
+    for p, mask in ((1, red), (2, blue)):
+        z = ZOBRIST[p]
+        for i in bb.bits(mask):
+            key ^= z[i]
+    return key
+
+
+def position_key(pos: bb.Position) -> int:
+    return zobrist_key(pos.pieces[1], pos.pieces[2], pos.turn)
+
+
+# ---------- evaluación ----------
+def _center_bonus():
+    out = []
+    for i in range(bb.SQUARES):
+        f, c = bb.square_rc(i)
+        d = max(abs(2 * f - 7), abs(2 * c - 7))     # 1 (centro) .. 7 (borde)
+        out.append((7 - d) // 2 * 3)                # 9 / 6 / 3 / 0
+    return tuple(out)
+
+
+CENTER = _center_bonus()
+
+
+def evaluate(me: int, opp: int) -> int:
+    """Material + control del centro, desde el punto de vista de `me`."""
+    score = (me.bit_count() - opp.bit_count()) * PIECE
+    for i in bb.bits(me):
+        score += CENTER[i]
+    for i in bb.bits(opp):
+        score -= CENTER[i]
+    return score
+
+
+# ---------- tabla de transposición ----------
+class TranspositionTable:
+    """Tabla de tamaño fijo indexada por los bits bajos de la clave (reemplazo por profundidad)."""
+
+    def __init__(self, bits: int = TT_BITS):
+        self.mask = (1 << bits) - 1
+        self.slots: List[Optional[tuple]] = [None] * (1 << bits)
+
+    def get(self, key: int) -> Optional[tuple]:
+        e = self.slots[key & self.mask]
+        return e if e is not None and e[0] == key else None
+
+    def put(self, key: int, depth: int, flag: int, score: int, move: Optional[Move]):
+        i = key & self.mask
+        old = self.slots[i]
+        if old is None or old[0] == key or depth >= old[1]:
+            self.slots[i] = (key, depth, flag, score, move)
+
+    def clear(self):
+        self.slots = [None] * (self.mask + 1)
+
+    def __len__(self) -> int:
+        return sum(1 for e in self.slots if e is not None)
+
+
+@dataclass
+class SearchResult:
+    move: Optional[Move]
+    score: int
+    depth: int
+    nodes: int
+    seconds: float
+
+
+class _Timeout(Exception):
+    pass
+
+
+# ---------- búsqueda ----------
+class Searcher:
+    """Estado reutilizable entre jugadas (tabla, killers, historia)."""
+
+    def __init__(self, tt_bits: int = TT_BITS, forced: bool = bb.FORCED_CAPTURES,
+                 tablebase: Optional[Tablebase] = None):
+        self.tt = TranspositionTable(tt_bits)
+        self.forced = forced
+        self.tb = tablebase
+        self.tb_pieces = tablebase.max_pieces if tablebase else 0
+        self.killers: List[List[Optional[Move]]] = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.history: Dict[Move, int] = {}
+        self.nodes = 0
+        self.deadline = 0.0
+
+    # orden: jugada de la tabla, capturas, killers, historia
+    def _ordered(self, moves: List[Move], tt_move: Optional[Move], ply: int) -> List[Move]:
+        k1, k2 = self.killers[ply] if ply <= MAX_PLY else (None, None)
+        hist = self.history
+
+        def rank(m):
+            if m == tt_move:
+                return 1 << 30
+            if m[2] >= 0:
+                return 1 << 29
+            if m == k1:
+                return 1 << 28
+            if m == k2:
+                return (1 << 28) - 1
+            return hist.get(m, 0)
+
+        return sorted(moves, key=rank, reverse=True)
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise _Timeout
+
+    def _quiesce(self, me: int, opp: int, alpha: int, beta: int, ply: int) -> int:
+        """Solo capturas (opcionales en estas reglas: se permite “quedarse” con la evaluación)."""
+        self._tick()
+        if not opp:
+            return WIN - ply
+        stand = evaluate(me, opp)
+        if stand >= beta:
+            return stand
+        alpha = max(alpha, stand)
+        for m in bb.captures(me, opp):
+            a, b = bb.apply(me, opp, m)
+            score = -self._quiesce(b, a, -beta, -alpha, ply + 1)
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _negamax(self, me: int, opp: int, turn: int, key: int, depth: int,
+                 alpha: int, beta: int, ply: int) -> int:
+        self._tick()
+        if not me:
+            return -(WIN - ply)
+        if (me | opp).bit_count() <= self.tb_pieces:     # final en la tabla: valor exacto
+            outcome, d = self.tb.probe(me, opp)
+            return 0 if outcome == 0 else (WIN - ply - d) * outcome
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiesce(me, opp, alpha, beta, ply)
+
+        alpha0 = alpha
+        tt_move = None
+        e = self.tt.get(key)
+        if e is not None:
+            _, d, flag, score, tt_move = e
+            if d >= depth:
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                elif flag == UPPER:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        moves = bb.generate(me, opp, self.forced)
+        if not moves:
+            return -(WIN - ply)
+
+        other = 3 - turn
+        zm, zo = ZOBRIST[turn], ZOBRIST[other]
+        best, best_move = -WIN - 1, None
+        for m in self._ordered(moves, tt_move, ply):
+            frm, to, cap = m
+            a, b = bb.apply(me, opp, m)
+            k = key ^ zm[frm] ^ zm[to] ^ ZOBRIST_SIDE
+            if cap >= 0:
+                k ^= zo[cap]
+            score = -self._negamax(b, a, other, k, depth - 1, -beta, -alpha, ply + 1)
+            if score > best:
+                best, best_move = score, m
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if cap < 0:
+                            ks = self.killers[ply]
+                            if ks[0] != m:
+                                ks[0], ks[1] = m, ks[0]
+                            self.history[m] = self.history.get(m, 0) + depth * depth
+                        break
+
+        flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+        self.tt.put(key, depth, flag, best, best_move)
+        return best
+
+    def _children(self, pos: bb.Position, moves: List[Move]):
+        """(jugada, me, opp, clave) de cada hijo de la raíz (ya desde la perspectiva del rival)."""
+        me, opp, turn = pos.me, pos.opp, pos.turn
+        key = position_key(pos)
+        zm, zo = ZOBRIST[turn], ZOBRIST[3 - turn]
+        for m in moves:
+            frm, to, cap = m
+            a, b = bb.apply(me, opp, m)
+            k = key ^ zm[frm] ^ zm[to] ^ ZOBRIST_SIDE
+            if cap >= 0:
+                k ^= zo[cap]
+            yield m, b, a, k
+
+    def root_scores(self, pos: bb.Position, depth: int, moves: List[Move]) -> List[Tuple[int, Move]]:
+        """Puntaje exacto de cada jugada de la raíz a `depth` (sin poda entre hermanas)."""
+        other = 3 - pos.turn
+        return [(-self._negamax(me, opp, other, k, depth - 1, -WIN - 1, WIN + 1, 1), m)
+                for m, me, opp, k in self._children(pos, moves)]
+
+    def root_search(self, pos: bb.Position, depth: int, moves: List[Move],
+                    tt_move: Optional[Move] = None,
+                    alpha: int = -WIN - 1) -> Tuple[int, Move, List[Tuple[int, Move]]]:
+        """
+        Mejor jugada de `moves` a `depth`. Devuelve (puntaje, jugada, [(puntaje, jugada)]);
+        en la lista solo el mejor es exacto (si supera `alpha`), el resto son cotas superiores.
+        """
+        other = 3 - pos.turn
+        beta = WIN + 1
+        best, best_move, scores = -WIN - 1, moves[0], []
+        for m, me, opp, k in self._children(pos, self._ordered(moves, tt_move, 0)):
+            score = -self._negamax(me, opp, other, k, depth - 1, -beta, -alpha, 1)
+            scores.append((score, m))
+            if score > best:
+                best, best_move = score, m
+                alpha = max(alpha, score)
+        return best, best_move, scores
+
+    def export(self, pos: bb.Position, moves: List[Move]) -> List[tuple]:
+        """Entradas de la tabla para hijos y nietos de la raíz (lo que se comparte entre procesos)."""
+        out = []
+        get = self.tt.get
+        for _, me, opp, k in self._children(pos, moves):
+            e = get(k)
+            if e is None:
+                continue
+            out.append(e)
+            child = bb.Position(opp, me, 3 - pos.turn, self.forced) if pos.turn == 1 else \
+                bb.Position(me, opp, 3 - pos.turn, self.forced)
+            for _, _, _, kk in self._children(child, bb.generate(me, opp, self.forced)):
+                ee = get(kk)
+                if ee is not None:
+                    out.append(ee)
+        return out
+
+    def search(self, pos: bb.Position, max_depth: int = 32, time_limit: float = 1.0) -> SearchResult:
+        """Profundización iterativa: devuelve la mejor jugada de la última profundidad completa."""
+        t0 = time.perf_counter()
+        self.deadline = t0 + time_limit
+        self.nodes = 0
+        moves = pos.legal_moves()
+        if not moves:
+            return SearchResult(None, -WIN, 0, 0, 0.0)
+        if len(moves) == 1:
+            return SearchResult(moves[0], 0, 0, 0, time.perf_counter() - t0)
+
+        key = position_key(pos)
+        result = SearchResult(moves[0], 0, 0, 0, 0.0)
+        for depth in range(1, max_depth + 1):
+            e = self.tt.get(key)
+            try:
+                score, move, _ = self.root_search(pos, depth, moves, e[4] if e else result.move)
+            except _Timeout:
+                break
+            self.tt.put(key, depth, EXACT, score, move)
+            result = SearchResult(move, score, depth, self.nodes, time.perf_counter() - t0)
+            if abs(score) >= WIN - MAX_PLY:       # victoria/derrota forzada: no hace falta más
+                break
+        result.nodes, result.seconds = self.nodes, time.perf_counter() - t0
+        return result
+
+
+# ---------- búsqueda paralela en la raíz ----------
+# Cada proceso guarda su propio Searcher (tabla incluida) entre tareas; las jugadas de la
+# raíz se reparten entre procesos y las entradas cercanas a la raíz se fusionan y reenvían.
+_worker: Optional[Searcher] = None
+
+
+def _worker_init(forced: bool):
+    global _worker
+    _worker = Searcher(forced=forced, tablebase=get_tablebase(forced))   # abre (o hereda) el mmap
+
+
+def _ping(_) -> int:
+    return os.getpid()
+
+
+def _search_chunk(red: int, blue: int, turn: int, depth: int, moves: List[Move],
+                  alpha: int, seconds: float, hints: List[tuple]):
+    s = _worker
+    for e in hints:
+        s.tt.put(*e)
+    pos = bb.Position(red, blue, turn, s.forced)
+    s.deadline = time.perf_counter() + seconds      # el reloj se mide en cada proceso
+    s.nodes = 0
+    try:
+        _, _, scores = s.root_search(pos, depth, moves, alpha=alpha)
+        done = True
+    except _Timeout:
+        scores, done = [], False
+    return done, scores, s.nodes, s.export(pos, moves)
+
+
+class ParallelSearcher:
+    """
+    Reparte las jugadas de la raíz entre `workers` procesos en cada iteración.
+    Los procesos se crean en el constructor (al empezar la partida), no en la primera jugada.
+    """
+
+    def __init__(self, workers: int, forced: bool = bb.FORCED_CAPTURES):
+        self.workers = workers
+        self.forced = forced
+        self.shared: Dict[int, tuple] = {}          # clave -> entrada fusionada (acotado a SHARED_TT)
+        self.nodes = 0
+        self.pool = ProcessPoolExecutor(workers, initializer=_worker_init, initargs=(forced,))
+        list(self.pool.map(_ping, range(workers)))  # fuerza el arranque de todos los procesos
+
+    def _merge(self, entries: List[tuple]):
+        shared = self.shared
+        for e in entries:
+            old = shared.get(e[0])
+            if old is None or e[1] >= old[1]:
+                shared[e[0]] = e
+        if len(shared) > SHARED_TT:
+            keep = heapq.nlargest(SHARED_TT, shared.values(), key=lambda e: e[1])
+            self.shared = {e[0]: e for e in keep}
+
+    def _run(self, pos: bb.Position, depth: int, chunks, alpha: int, t0: float, time_limit: float):
+        """Lanza un trozo de la raíz por proceso; None si se acabó el tiempo."""
+        left = time_limit - (time.perf_counter() - t0)
+        if left <= 0:
+            return None
+        hints = list(self.shared.values())
+        futures = [self.pool.submit(_search_chunk, pos.pieces[1], pos.pieces[2], pos.turn,
+                                    depth, chunk, alpha, left, hints) for chunk in chunks]
+        done, _ = wait(futures, timeout=left + TIMEOUT_GRACE)
+        if len(done) < len(futures):
+            return None
+        complete, scores = True, []
+        for f in futures:
+            ok, part, nodes, entries = f.result()
+            self.nodes += nodes
+            self._merge(entries)
+            complete = complete and ok
+            scores += part
+        return scores if complete else None
+
+    def search(self, pos: bb.Position, max_depth: int = 32, time_limit: float = 1.0) -> SearchResult:
+        t0 = time.perf_counter()
+        self.nodes = 0
+        moves = pos.legal_moves()
+        if not moves:
+            return SearchResult(None, -WIN, 0, 0, 0.0)
+        if len(moves) == 1:
+            return SearchResult(moves[0], 0, 0, 0, time.perf_counter() - t0)
+
+        order = moves
+        result = SearchResult(moves[0], 0, 0, 0, 0.0)
+        for depth in range(1, max_depth + 1):
+            # 1) la mejor jugada anterior en un proceso: da una cota alfa exacta
+            # 2) el resto se reparte (intercalado) con esa cota, así casi todo se poda
+            first = self._run(pos, depth, [[order[0]]], -WIN - 1, t0, time_limit)
+            if first is None:
+                break
+            rest = order[1:]
+            scores = first
+            if rest:
+                chunks = [rest[i::self.workers] for i in range(min(self.workers, len(rest)))]
+                part = self._run(pos, depth, chunks, first[0][0], t0, time_limit)
+                if part is None:
+                    break
+                scores = first + part
+            scores.sort(key=lambda sm: sm[0], reverse=True)
+            order = [m for _, m in scores]
+            result = SearchResult(order[0], scores[0][0], depth, self.nodes, time.perf_counter() - t0)
+            if abs(result.score) >= WIN - MAX_PLY:
+                break
+        result.nodes, result.seconds = self.nodes, time.perf_counter() - t0
+        return result
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def default_workers(level: str) -> int:
+    """Procesos para un nivel: solo los niveles altos, y solo si hay más de un núcleo."""
+    if level not in PARALLEL_LEVELS:
+        return 1
+    return max(1, min(os.cpu_count() or 1, MAX_WORKERS))
+
+
+class DamasAI:
+    """Rival por nivel de dificultad; mantiene la tabla entre jugadas de la misma partida."""
+
+    def __init__(self, level: str = DEFAULT_LEVEL, seed: Optional[int] = None,
+                 forced: bool = bb.FORCED_CAPTURES, workers: Optional[int] = None,
+                 book_randomness: Optional[float] = None):
+        from .book import RANDOMNESS, get_book    # book importa este módulo
+        if level not in LEVELS:
+            raise ValueError(f"Nivel desconocido: {level} (usa {', '.join(LEVELS)})")
+        self.level = level
+        self.max_depth, self.time_limit, self.noise = LEVELS[level]
+        self.rng = random.Random(seed)
+        self.tablebase = get_tablebase(forced)
+        self.book = get_book()
+        self.book_randomness = RANDOMNESS if book_randomness is None else book_randomness
+        workers = default_workers(level) if workers is None else workers
+        if workers > 1 and not self.noise:
+            self.searcher = ParallelSearcher(workers, forced)
+        else:
+            self.searcher = Searcher(forced=forced, tablebase=self.tablebase)
+        self.last: Optional[SearchResult] = None
+
+    def choose(self, pos: bb.Position) -> Optional[Move]:
+        """Jugada para el bando que mueve en `pos` (None si no tiene)."""
+        if self.book:
+            m = self.book.choose(pos, self.book_randomness, self.rng)   # apertura: sin buscar
+            if m is not None:
+                self.last = SearchResult(m, 0, 0, 0, 0.0)
+                return m
+        if self.tablebase and not self.noise:
+            m = self.tablebase.best_move(pos)      # final con pocas piezas: juego perfecto al instante
+            if m is not None:
+                self.last = SearchResult(m, 0, 0, 0, 0.0)
+                return m
+        if self.noise:
+            return self._choose_noisy(pos)
+        self.last = self.searcher.search(pos, self.max_depth, self.time_limit)
+        return self.last.move
+
+    def _choose_noisy(self, pos: bb.Position) -> Optional[Move]:
+        # niveles bajos: puntaje real de cada jugada + ruido, a poca profundidad
+        moves = pos.legal_moves()
+        if not moves:
+            return None
+        s = self.searcher
+        t0 = time.perf_counter()
+        s.deadline, s.nodes = t0 + self.time_limit, 0
+        scored = [(0, m) for m in moves]
+        for depth in range(1, self.max_depth + 1):
+            try:
+                scored = s.root_scores(pos, depth, moves)
+            except _Timeout:
+                break
+        best = max(scored, key=lambda sm: sm[0] + self.rng.randint(-self.noise, self.noise))
+        self.last = SearchResult(best[1], best[0], depth, s.nodes, time.perf_counter() - t0)
+        return best[1]
+
+    def close(self):
+        """Libera los procesos de la búsqueda paralela (si los hay)."""
+        if isinstance(self.searcher, ParallelSearcher):
+            self.searcher.close()
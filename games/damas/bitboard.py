@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de Damas sobre bitboards de 32 casillas (sin pygame).
+
+Casillas oscuras numeradas 0..31 por filas, de arriba abajo:
+    índice = fila * 4 + col // 2      (las oscuras cumplen (fila + col) % 2 == 1)
+Cada bando es un int de 32 bits. Reglas del juego vocacional:
+  - las fichas se mueven en las 4 diagonales (no hay coronación)
+  - captura simple: saltar una ficha rival adyacente a una casilla vacía
+  - `forced=True` obliga a capturar si hay alguna captura disponible
+Jugador 1 (rojo) empieza abajo; jugador 2 (azul) arriba.
+"""
+from __future__ import annotations
+
+import time
+from typing import List, Optional, Tuple
+
+SQUARES = 32
+FULL = (1 << SQUARES) - 1
+DIRS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+PIECES = 12
+FORCED_CAPTURES = False     # el juego original no obliga a capturar
+
+# Move = (origen, destino, capturada | -1)
+Move = Tuple[int, int, int]
+
+
+def square_index(fila: int, col: int) -> int:
+    """Índice 0..31 de una casilla oscura (-1 si es clara o está fuera)."""
+    if not (0 <= fila < 8 and 0 <= col < 8) or (fila + col) % 2 == 0:
+        return -1
+    return fila * 4 + col // 2
+
+
+def square_rc(i: int) -> Tuple[int, int]:
+    fila = i // 4
+    return fila, 2 * (i % 4) + (1 if fila % 2 == 0 else 0)
+
+
+def _tables():
+    step = [0] * SQUARES                       # máscara de vecinas
+    neighbor = [[-1] * 4 for _ in range(SQUARES)]
+    jumps = [[] for _ in range(SQUARES)]       # [(bit_saltada, bit_destino, saltada, destino)]
+    for i in range(SQUARES):
+        f, c = square_rc(i)
+        for d, (df, dc) in enumerate(DIRS):
+            n = square_index(f + df, c + dc)
+            if n < 0:
+                continue
+            neighbor[i][d] = n
+            step[i] |= 1 << n
+            land = square_index(f + 2 * df, c + 2 * dc)
+            if land >= 0:
+                jumps[i].append((1 << n, 1 << land, n, land))
+    return tuple(step), tuple(tuple(r) for r in neighbor), tuple(tuple(j) for j in jumps)
+
+
+STEP_MASK, NEIGHBOR, JUMPS = _tables()
+# destinos de cada máscara de pasos, precalculados como listas de índices
+STEP_TARGETS = tuple(tuple(n for n in row if n >= 0) for row in NEIGHBOR)
+
+TOP_ROWS = sum(1 << i for i in range(12))          # filas 0-2
+BOTTOM_ROWS = sum(1 << i for i in range(20, 32))   # filas 5-7
+
+
+def initial() -> Tuple[int, int]:
+    """(rojo, azul) de la posición inicial."""
+    return BOTTOM_ROWS, TOP_ROWS
+
+
+def bits(mask: int):
+    """Índices de los bits encendidos (de menor a mayor)."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def captures(me: int, opp: int) -> List[Move]:
+    empty = FULL & ~(me | opp)
+    out = []
+    for i in bits(me):
+        for over_bit, land_bit, over, land in JUMPS[i]:
+            if opp & over_bit and empty & land_bit:
+                out.append((i, land, over))
+    return out
+
+
+def steps(me: int, opp: int) -> List[Move]:
+    empty = FULL & ~(me | opp)
+    out = []
+    for i in bits(me):
+        if STEP_MASK[i] & empty:
+            for n in STEP_TARGETS[i]:
+                if empty >> n & 1:
+                    out.append((i, n, -1))
+    return out
+
+
+def generate(me: int, opp: int, forced: bool = FORCED_CAPTURES) -> List[Move]:
+    """Movimientos legales del bando `me` (capturas primero)."""
+    caps = captures(me, opp)
+    if forced and caps:
+        return caps
+    return caps + steps(me, opp)
+
+
+def moves_from(me: int, opp: int, square: int, forced: bool = FORCED_CAPTURES) -> List[Move]:
+    """Movimientos legales de UNA ficha (para resaltar en la interfaz)."""
+    return [m for m in generate(me, opp, forced) if m[0] == square]
+
+
+def apply(me: int, opp: int, move: Move) -> Tuple[int, int]:
+    """Devuelve (me, opp) tras el movimiento (sin cambiar de perspectiva)."""
+    frm, to, cap = move
+    me = (me & ~(1 << frm)) | (1 << to)
+    if cap >= 0:
+        opp &= ~(1 << cap)
+    return me, opp
+
+
+def perft(me: int, opp: int, depth: int, forced: bool = FORCED_CAPTURES) -> int:
+    """Nodos hoja a `depth` plies (un bando sin piezas no tiene jugadas: la rama termina)."""
+    if depth == 0:
+        return 1
+    moves = generate(me, opp, forced)
+    if depth == 1:
+        return len(moves)
+    total = 0
+    for m in moves:
+        a, b = apply(me, opp, m)
+        total += perft(b, a, depth - 1, forced)
+    return total
+
+
+class Position:
+    """Estado de una partida: piezas por jugador (1 = rojo, 2 = azul) y turno."""
+    __slots__ = ("pieces", "turn", "forced")
+
+    def __init__(self, red: Optional[int] = None, blue: Optional[int] = None,
+                 turn: int = 1, forced: bool = FORCED_CAPTURES):
+        r, b = initial()
+        self.pieces = {1: r if red is None else red, 2: b if blue is None else blue}
+        self.turn = turn
+        self.forced = forced
+
+    @property
+    def me(self) -> int:
+        return self.pieces[self.turn]
+
+    @property
+    def opp(self) -> int:
+        return self.pieces[3 - self.turn]
+
+    def owner(self, square: int) -> int:
+        """0 vacía, 1 rojo, 2 azul."""
+        bit = 1 << square
+        return 1 if self.pieces[1] & bit else 2 if self.pieces[2] & bit else 0
+
+    def legal_moves(self) -> List[Move]:
+        return generate(self.me, self.opp, self.forced)
+
+    def moves_from(self, square: int) -> List[Move]:
+        return moves_from(self.me, self.opp, square, self.forced)
+
+    def play(self, move: Move):
+        me, opp = apply(self.me, self.opp, move)
+        self.pieces[self.turn], self.pieces[3 - self.turn] = me, opp
+        self.turn = 3 - self.turn
+
+    def captured(self, player: int) -> int:
+        """Fichas que ha capturado `player`."""
+        return PIECES - bin(self.pieces[3 - player]).count("1")
+
+    def winner(self) -> int:
+        """0 si sigue; si no, el jugador que ganó (rival sin fichas o sin jugadas)."""
+        for p in (1, 2):
+            if not self.pieces[p]:
+                return 3 - p
+        if not self.legal_moves():
+            return 3 - self.turn
+        return 0
+
+    def copy(self) -> "Position":
+        return Position(self.pieces[1], self.pieces[2], self.turn, self.forced)
+
+    def to_matrix(self) -> List[List[int]]:
+        """Tablero 8×8 (0/1/2) como el antiguo crear_tablero()."""
+        t = [[0] * 8 for _ in range(8)]
+        for p in (1, 2):
+            for i in bits(self.pieces[p]):
+                f, c = square_rc(i)
+                t[f][c] = p
+        return t
+
+
+def perft_report(depths=range(1, 8), forced: bool = FORCED_CAPTURES) -> List[Tuple[int, int, float]]:
+    """[(profundidad, nodos, segundos)] desde la posición inicial (mueve rojo)."""
+    red, blue = initial()
+    out = []
+    for d in depths:
+        t = time.perf_counter()
+        n = perft(red, blue, d, forced)
+        out.append((d, n, time.perf_counter() - t))
+    return out
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+# games/damas/book.py
+# Libro de aperturas de Damas generado offline con partidas de la IA contra sí misma
+# Uso: python -m games.damas.book --games 2000 --plies 10     (genera data/damas/book.bin)
+"""
+Cada entrada es (clave Zobrist de la posición, jugada, partidas, puntos), donde los
+puntos son medios puntos del bando que movió: 2 victoria, 1 tablas, 0 derrota.
+
+Formato (little endian), claves ordenadas para búsqueda binaria sobre el mmap:
+    cabecera  "DMOB" | versión u16 | plies u8 | forced u8 | n u32 | relleno (16 bytes)
+    claves    n × u64
+    datos     n × (jugada u16, partidas u32, puntos u32)
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from . import ai
+from . import bitboard as bb
+from .bitboard import Move
+from .tablebase import get_tablebase
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, "..", ".."))
+BOOK_PATH = os.path.join(ROOT, "data", "damas", "book.bin")
+
+BOOK_PLIES = 10           # plies de apertura que se guardan
+BOOK_DEPTH = 4            # profundidad al elegir las jugadas de apertura
+PLAYOUT_DEPTH = 3         # profundidad en el resto de la partida
+OPENING_MARGIN = 25       # jugadas a <= 25 puntos de la mejor se eligen al azar (variedad)
+MAX_GAME_PLIES = 160      # después se adjudica (tabla de finales o material)
+MIN_GAMES = 3             # entradas con menos partidas no se guardan
+RANDOMNESS = 0.5          # 0 = siempre la mejor jugada del libro; 1 = proporcional a partidas × puntaje
+
+MAGIC = b"DMOB"
+VERSION = 1
+_HEAD = struct.Struct("<4sHBBI4x")          # 16 bytes: las claves quedan alineadas a 8
+_ENTRY = struct.Struct("<HII")
+
+
+def pack_move(m: Move) -> int:
+    frm, to, cap = m
+    return frm | to << 5 | (cap + 1) << 10
+
+
+def unpack_move(v: int) -> Move:
+    return v & 31, v >> 5 & 31, (v >> 10) - 1
+
+
+# ---------- autojuego ----------
+def _adjudicate(pos: bb.Position) -> int:
+    """Ganador de una partida cortada: tabla de finales si cubre, si no, 2+ fichas de ventaja."""
+    tb = get_tablebase(pos.forced)
+    if tb is not None:
+        r = tb.probe(pos.me, pos.opp)
+        if r is not None:
+            return 0 if r[0] == 0 else pos.turn if r[0] > 0 else 3 - pos.turn
+    diff = pos.captured(1) - pos.captured(2)
+    return 1 if diff >= 2 else 2 if diff <= -2 else 0
+
+
+def _self_play(seed: int, games: int, plies: int, forced: bool) -> Dict[Tuple[int, int], List[int]]:
+    """Juega `games` partidas; devuelve {(clave, jugada): [partidas, puntos]}."""
+    rng = random.Random(seed)
+    s = ai.Searcher(tt_bits=16, forced=forced, tablebase=get_tablebase(forced))
+    stats: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0])
+    for _ in range(games):
+        pos = bb.Position(forced=forced)
+        line = []          # (clave, jugada, jugador)
+        for ply in range(MAX_GAME_PLIES):
+            if pos.winner():
+                break
+            if ply < plies:
+                moves = pos.legal_moves()
+                s.deadline, s.nodes = float("inf"), 0
+                scored = s.root_scores(pos, BOOK_DEPTH, moves)
+                top = max(sc for sc, _ in scored)
+                m = rng.choice([mv for sc, mv in scored if sc >= top - OPENING_MARGIN])
+                line.append((ai.position_key(pos), pack_move(m), pos.turn))
+            else:
+                m = s.search(pos, PLAYOUT_DEPTH, 60.0).move
+            pos.play(m)
+        winner = pos.winner() or _adjudicate(pos)
+        for key, move, player in line:
+            e = stats[(key, move)]
+            e[0] += 1
+            e[1] += 1 if winner == 0 else 2 if winner == player else 0
+    return dict(stats)
+
+
+def build(games: int = 2000, plies: int = BOOK_PLIES, path: str = BOOK_PATH, workers: Optional[int] = None,
+          seed: int = 0, forced: bool = bb.FORCED_CAPTURES, min_games: int = MIN_GAMES, log=print) -> int:
+    """Autojuego repartido en procesos; escribe el libro y devuelve el número de entradas."""
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, min(50, games // (workers * 4) or 1))
+    jobs = [(seed + k, min(chunk, games - k * chunk)) for k in range((games + chunk - 1) // chunk)]
+    merged: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0])
+    t0 = time.perf_counter()
+    done = 0
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_self_play, s, n, plies, forced) for s, n in jobs]
+        for (_, n), f in zip(jobs, futures):
+            for k, (g, p) in f.result().items():
+                e = merged[k]
+                e[0] += g
+                e[1] += p
+            done += n
+            log(f"  {done}/{games} partidas ({time.perf_counter() - t0:.0f}s)")
+    entries = sorted((key, move, g, p) for (key, move), (g, p) in merged.items() if g >= min_games)
+    write(entries, path, plies, forced)
+    log(f"💾 {path}: {len(entries):,} entradas de {len(merged):,} ({os.path.getsize(path) / 1024:.0f} KiB)")
+    return len(entries)
+
+
+def write(entries: List[Tuple[int, int, int, int]], path: str, plies: int, forced: bool):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEAD.pack(MAGIC, VERSION, plies, int(forced), len(entries)))
+        f.write(struct.pack(f"<{len(entries)}Q", *(e[0] for e in entries)))
+        for _, move, g, p in entries:
+            f.write(_ENTRY.pack(move, g, p))
+    os.replace(tmp, path)
+
+
+# ---------- consulta ----------
+class OpeningBook:
+    """Libro en mmap: búsqueda binaria sobre las claves, sin cargar nada al abrir."""
+
+    def __init__(self, path: str = BOOK_PATH):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.plies, forced, self.n = _HEAD.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: no es un libro de aperturas v{VERSION}")
+        self.forced = bool(forced)
+        self._data = _HEAD.size + 8 * self.n
+        self._keys = memoryview(self._mm)[_HEAD.size:self._data]
+        if sys.byteorder == "little":
+            self._keys = self._keys.cast("Q")
+        else:
+            self._keys = [struct.unpack_from("<Q", self._mm, _HEAD.size + 8 * i)[0] for i in range(self.n)]
+
+    def moves(self, pos: bb.Position) -> List[Tuple[Move, int, float]]:
+        """[(jugada, partidas, puntaje 0..1)] del libro para `pos` (solo jugadas legales)."""
+        key = ai.position_key(pos)
+        i = bisect.bisect_left(self._keys, key)
+        out = []
+        legal = None
+        while i < self.n and self._keys[i] == key:
+            move, g, p = _ENTRY.unpack_from(self._mm, self._data + _ENTRY.size * i)
+            m = unpack_move(move)
+            legal = legal if legal is not None else set(pos.legal_moves())
+            if m in legal:                     # defensa ante colisiones de la clave
+                out.append((m, g, p / (2 * g)))
+            i += 1
+        return out
+
+    def choose(self, pos: bb.Position, randomness: float = RANDOMNESS,
+               rng: Optional[random.Random] = None) -> Optional[Move]:
+        """Jugada del libro (None fuera del libro). randomness 0 = la de mejor puntaje."""
+        if pos.forced != self.forced:
+            return None
+        cands = self.moves(pos)
+        if not cands:
+            return None
+        if randomness <= 0:
+            return max(cands, key=lambda c: (c[2], c[1]))[0]
+        rng = rng or random
+        weights = [g * max(score, 1e-3) ** (1.0 / randomness) for _, g, score in cands]
+        return rng.choices([c[0] for c in cands], weights=weights)[0]
+
+    def close(self):
+        if isinstance(self._keys, memoryview):
+            self._keys.release()
+        self._mm.close()
+        self._file.close()
+
+
+_OPEN: Dict[str, Optional[OpeningBook]] = {}
+
+
+def get_book(path: str = BOOK_PATH) -> Optional[OpeningBook]:
+    """Libro compartido por proceso (None si no se ha generado)."""
+    if path not in _OPEN:
+        book = None
+        if os.path.exists(path):
+            try:
+                book = OpeningBook(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Libro de aperturas ignorado: {e}")
+        _OPEN[path] = book
+    return _OPEN[path]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Genera el libro de aperturas de Damas por autojuego")
+    ap.add_argument("--games", type=int, default=2000)
+    ap.add_argument("--plies", type=int, default=BOOK_PLIES)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--min-games", type=int, default=MIN_GAMES)
+    ap.add_argument("--forced", action="store_true", help="captura obligatoria")
+    ap.add_argument("--out", default=BOOK_PATH)
+    a = ap.parse_args(argv)
+    build(a.games, a.plies, a.out, a.workers, a.seed, a.forced, a.min_games)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,38 +2,49 @@
 """
 Damas Vocacional
 - Modo standalone (pygame): run_damas()
-- Modo Flet (como ruleta): open_damas_dialog(page, on_finish)
+- Modo Flet: launch_damas(page, on_finish) lanza run_damas en otro proceso y recibe
+  el resultado por games.damas.link; open_damas_dialog (slider) queda como respaldo
 
 on_finish recibe:
   {"game": "Damas Vocacional", "area": DAMAS_AREA, "score": 0..100, "why": "..."}
 """
 from __future__ import annotations
-import os, sys, json
+import os, sys, json, threading, uuid
 from datetime import datetime
 
-# --- pygame es opcional si solo usas el modal de Flet ---
 try:
-    import pygame
-except Exception:  # no disponible en algunos entornos
-    pygame = None
+    from games.damas import bitboard as bb, link, responses
+    from games.damas.ai import DamasAI, DEFAULT_LEVEL
+    from games.damas.render import (ANCHO, ALTO, TAB_W, TAM_CASILLA, BLANCO, NEGRO, ROJO, AZUL,
+                                    BoardRenderer, STATS_EVERY)
+except ImportError:      # ejecutado como script (python games/damas/damas_vocacional.py)
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    from games.damas import bitboard as bb, link, responses
+    from games.damas.ai import DamasAI, DEFAULT_LEVEL
+    from games.damas.render import (ANCHO, ALTO, TAB_W, TAM_CASILLA, BLANCO, NEGRO, ROJO, AZUL,
+                                    BoardRenderer, STATS_EVERY)
+
+# --- pygame es opcional si solo usas el modal de Flet: se importa en run_damas ---
+pygame = None
+
+def _cargar_pygame() -> bool:
+    global pygame
+    if pygame is None:
+        try:
+            import pygame as _pg
+            pygame = _pg
+        except Exception:  # no disponible en algunos entornos
+            return False
+    return True
 
 # -----------------------------
-# Configuración / colores / área
+# Configuración / colores / área (el tablero y sus colores viven en render.py)
 # -----------------------------
-ANCHO, ALTO = 1200, 800           # 800 tablero + panel lateral
-TAB_W = 800
-TAM_CASILLA = TAB_W // 8
-
-BLANCO   = (255, 255, 255)
-NEGRO    = (0, 0, 0)
-ROJO     = (200, 50, 50)
-AZUL     = (50, 50, 200)
-VERDE    = (0, 200, 0)
-AMARILLO = (200, 200, 0)
-GRISUI   = (220, 220, 220)
+JUGADOR_IA = 2                    # la computadora lleva las azules
 
 # Ajusta al nombre exacto en tu catálogo AREAS
 DAMAS_AREA = "Tecnología"
+GAME_NAME = "Damas Vocacional"
 
 # -----------------------------
 # Utilidades de rutas
@@ -70,9 +81,14 @@ def cargar_preguntas(ruta: str | None = None):
 # Registro de respuestas (Excel)
 # -----------------------------
 class VocationalRecorder:
+    """
+    Respuestas de una partida. guardar() solo anexa al registro JSONL (rápido y seguro
+    con varias partidas a la vez); el Excel se genera bajo demanda con
+    `python -m games.damas.responses`.
+    """
     def __init__(self, archivo: str | None = None):
-        self.archivo = archivo or _p("data", "Respuestas_Registradas.xlsx")
-        os.makedirs(os.path.dirname(self.archivo), exist_ok=True)
+        self.archivo = responses.log_path_for(archivo)    # ruta .xlsx antigua -> .jsonl al lado
+        self.partida = uuid.uuid4().hex[:12]
         self.respuestas = []
 
     def registrar(self, jugador: int, pregunta: str, respuesta: str):
@@ -81,89 +97,22 @@ class VocationalRecorder:
             "pregunta": pregunta,
             "respuesta": respuesta,
             "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "partida": self.partida,
         })
 
     def guardar(self):
         if not self.respuestas:
             return
         try:
-            import pandas as pd
-            nuevo = pd.DataFrame(self.respuestas)
-            if os.path.exists(self.archivo):
-                viejo = pd.read_excel(self.archivo)
-                out = pd.concat([viejo, nuevo], ignore_index=True)
-            else:
-                out = nuevo
-            out.to_excel(self.archivo, index=False)
+            responses.append(self.respuestas, self.archivo)
             print(f"📂 Respuestas guardadas en {self.archivo}")
-        except Exception as e:
-            print(f"⚠️ No se pudo guardar Excel: {e}")
+            self.respuestas = []
+        except OSError as e:
+            print(f"⚠️ No se pudieron guardar las respuestas: {e}")
 
 # =========================================================
 # ==============   MODO PYGAME (standalone)   =============
 # =========================================================
-def crear_tablero():
-    t = [[0]*8 for _ in range(8)]
-    for fila in range(3):            # Jugador 2 (azul) arriba
-        for col in range(8):
-            if (fila+col) % 2 != 0:
-                t[fila][col] = 2
-    for fila in range(5, 8):         # Jugador 1 (rojo) abajo
-        for col in range(8):
-            if (fila+col) % 2 != 0:
-                t[fila][col] = 1
-    return t
-
-def dibujar_tablero(s):
-    s.fill(NEGRO)
-    for f in range(8):
-        for c in range(8):
-            if (f + c) % 2 == 0:
-                pygame.draw.rect(s, BLANCO, (c*TAM_CASILLA, f*TAM_CASILLA, TAM_CASILLA, TAM_CASILLA))
-
-def dibujar_fichas(s, t):
-    for f in range(8):
-        for c in range(8):
-            v = t[f][c]
-            if v:
-                color = ROJO if v == 1 else AZUL
-                pygame.draw.circle(
-                    s, color,
-                    (c*TAM_CASILLA + TAM_CASILLA//2, f*TAM_CASILLA + TAM_CASILLA//2),
-                    TAM_CASILLA//2 - 10
-                )
-
-def movimientos_validos(t, f, c):
-    j = t[f][c]
-    if j == 0:
-        return []
-    dirs = [(-1,-1), (-1,1), (1,-1), (1,1)]
-    moves = []
-    for df, dc in dirs:
-        nf, nc = f+df, c+dc
-        if 0 <= nf < 8 and 0 <= nc < 8:
-            if t[nf][nc] == 0:
-                moves.append((nf, nc, "normal"))
-            elif t[nf][nc] != j:
-                sf, sc = nf+df, nc+dc
-                if 0 <= sf < 8 and 0 <= sc < 8 and t[sf][sc] == 0:
-                    moves.append((sf, sc, "captura"))
-    return moves
-
-def resaltar_movs(s, moves):
-    for f, c, tipo in moves:
-        col = VERDE if tipo == "normal" else AMARILLO
-        pygame.draw.rect(s, col, (c*TAM_CASILLA, f*TAM_CASILLA, TAM_CASILLA, TAM_CASILLA), 5)
-
-def dibujar_panel(s, turno, puntos):
-    font_t = pygame.font.SysFont(None, 40, bold=True)
-    font_p = pygame.font.SysFont(None, 30)
-    pygame.draw.rect(s, GRISUI, (TAB_W, 0, ANCHO-TAB_W, ALTO))
-    s.blit(font_t.render("TEST DAMAS VOCACIONAL", True, NEGRO), (TAB_W+10, 30))
-    s.blit(font_p.render(f"Turno: {'ROJO' if turno==1 else 'AZUL'}", True, NEGRO), (TAB_W+10, 100))
-    s.blit(font_p.render(f"Rojo: {puntos[1]} pts", True, ROJO), (TAB_W+10, 160))
-    s.blit(font_p.render(f"Azul: {puntos[2]} pts", True, AZUL), (TAB_W+10, 200))
-
 def _pregunta_tk(pregunta: dict, jugador: int) -> str | None:
     """Muestra pregunta con Tkinter; si falla, devuelve 1ª opción."""
     try:
@@ -193,11 +142,36 @@ def pantalla_final(s, ganador, perdedor):
     s.blit(font.render(f"Recomendación perdedor: {carreras[perdedor % len(carreras)]}", True, AZUL), (200, 450))
     pygame.display.flip(); pygame.time.wait(3000)
 
-def run_damas(questions_path: str | None = None, output_excel: str | None = None, use_tk: bool = True):
-    """Ejecución del juego en pygame."""
-    if pygame is None:
+def resultado(pos: "bb.Position", respondidas: int, ai_level: str | None) -> dict:
+    """Resultado para on_finish desde el punto de vista de las rojas (el estudiante)."""
+    rojo, azul = pos.captured(1), pos.captured(2)
+    gano = pos.winner() == 1
+    score = round(60 * rojo / bb.PIECES + (40 if gano else 0))
+    rival = f"la IA ({ai_level})" if ai_level else "otro jugador"
+    return {
+        "game": GAME_NAME,
+        "area": DAMAS_AREA,
+        "score": score,
+        "why": (f"{'Ganaste' if gano else 'Perdiste'} contra {rival} con {rojo} capturas "
+                f"(rival: {azul}) y {respondidas} preguntas respondidas: "
+                "razonamiento lógico y planificación."),
+    }
+
+def run_damas(questions_path: str | None = None, output_excel: str | None = None, use_tk: bool = True,
+              ai_level: str | None = DEFAULT_LEVEL) -> dict | None:
+    """
+    Ejecución del juego en pygame (ai_level=None: dos jugadores en el mismo mouse).
+    Devuelve el resultado (None si se cerró antes de terminar); si lo lanzó la app,
+    también envía el progreso y el resultado por games.damas.link.
+    """
+    if not _cargar_pygame():
         print("⚠️ pygame no está disponible en este entorno.")
-        return
+        return None
+
+    reporter = link.connect_from_env()
+
+    # la IA se crea antes de pygame.init(): en niveles altos arranca aquí sus procesos
+    ia = DamasAI(ai_level) if ai_level else None
 
     pygame.init()
     ventana = pygame.display.set_mode((ANCHO, ALTO))
@@ -206,76 +180,158 @@ def run_damas(questions_path: str | None = None, output_excel: str | None = None
     questions = cargar_preguntas(questions_path)
     recorder  = VocationalRecorder(output_excel)
 
-    tablero = crear_tablero()
-    turno = 1
-    reloj = pygame.time.Clock()
-    seleccionado = None
-    puntos = {1: 0, 2: 0}
+    pos = bb.Position()              # bitboards + turno (1 = rojo, 2 = azul)
+    seleccionado = None              # casilla 0..31
+    movs_sel = []                    # jugadas de la ficha seleccionada (se calculan al seleccionar)
     q_index = {1: 0, 2: 0}
+    respondidas = 0                  # preguntas contestadas por las rojas
+    plies = 0
+    final = None
+
+    renderer = BoardRenderer(ventana)
+    EV_IA = pygame.USEREVENT + 1                 # la IA terminó de pensar
+    EV_STATS = pygame.USEREVENT + 2              # refresco del contador de frames/CPU
+    EV_EXPOSE = {pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE)}
+    pygame.time.set_timer(EV_STATS, int(STATS_EVERY * 1000))
+    pygame.event.set_blocked(pygame.MOUSEMOTION)  # no se usa: no despierta el bucle
+
+    # la IA piensa en un hilo con tiempo acotado y avisa con EV_IA al terminar
+    hilo_ia = None
+    jugada_ia = []
+
+    def pensar(snapshot):
+        jugada_ia.append(ia.choose(snapshot))
+        pygame.event.post(pygame.event.Event(EV_IA))
+
+    def turno_ia() -> bool:
+        return ia is not None and pos.turn == JUGADOR_IA
+
+    def jugar(m) -> bool:
+        """Aplica la jugada; True si la partida terminó."""
+        nonlocal respondidas, final, plies
+        turno = pos.turn
+        pos.play(m)                  # la ficha saltada sale del tablero
+        plies += 1
+        if m[2] >= 0 and not (ia and turno == JUGADOR_IA):
+            if q_index[turno] < len(questions):
+                q = questions[q_index[turno]]
+                resp = _pregunta_tk(q, turno) if use_tk else (q["opciones"][0] if q.get("opciones") else None)
+                if resp:
+                    recorder.registrar(turno, q["pregunta"], resp)
+                    respondidas += turno == 1
+                q_index[turno] += 1
+                renderer.invalidate()    # la ventana de Tk pudo tapar el tablero
+        ganador = pos.winner()
+        if reporter:
+            reporter.send("progress", ply=plies, capturas=(pos.captured(1), pos.captured(2)),
+                          turno=pos.turn)
+        if ganador:
+            perdedor = 2 if ganador == 1 else 1
+            recorder.guardar()
+            final = resultado(pos, respondidas, ai_level)
+            if reporter:
+                reporter.send("result", result=final)   # la app sigue sin esperar a la pantalla final
+            pantalla_final(ventana, ganador, perdedor)
+        return bool(ganador)
 
     running = True
     while running:
-        dibujar_tablero(ventana); dibujar_fichas(ventana, tablero)
-        if seleccionado:
-            resaltar_movs(ventana, movimientos_validos(tablero, *seleccionado))
-        dibujar_panel(ventana, turno, puntos)
-        pygame.display.flip()
-
-        for ev in pygame.event.get():
+        if turno_ia() and hilo_ia is None:
+            hilo_ia = threading.Thread(target=pensar, args=(pos.copy(),), daemon=True)
+            hilo_ia.start()
+        renderer.draw(pos, movs_sel, pensando=turno_ia())
+
+        # sin cambios no se dibuja nada: el bucle duerme hasta el próximo evento
+        for ev in [pygame.event.wait()] + pygame.event.get():
+            if not running:
+                break
             if ev.type == pygame.QUIT:
                 recorder.guardar(); running = False
-            if ev.type == pygame.MOUSEBUTTONDOWN:
+            elif ev.type == EV_IA:
+                hilo_ia = None
+                m = jugada_ia.pop() if jugada_ia else None
+                if m is None or jugar(m):
+                    running = False
+            elif ev.type == EV_STATS:
+                renderer.stats.tick()
+            elif ev.type in EV_EXPOSE:
+                renderer.invalidate()
+            elif ev.type == pygame.MOUSEBUTTONDOWN and not turno_ia():
                 x, y = ev.pos
                 if x < TAB_W:
-                    c, f = x // TAM_CASILLA, y // TAM_CASILLA
-                    if tablero[f][c] == turno:
-                        seleccionado = (f, c)
-                    elif seleccionado:
-                        f0, c0 = seleccionado
-                        for nf, nc, tipo in movimientos_validos(tablero, f0, c0):
-                            if (nf, nc) == (f, c):
-                                tablero[f][c] = turno
-                                tablero[f0][c0] = 0
-                                if tipo == "captura":
-                                    puntos[turno] += 1
-                                    if q_index[turno] < len(questions):
-                                        q = questions[q_index[turno]]
-                                        resp = _pregunta_tk(q, turno) if use_tk else (q["opciones"][0] if q.get("opciones") else None)
-                                        if resp: recorder.registrar(turno, q["pregunta"], resp)
-                                        q_index[turno] += 1
-                                turno = 2 if turno == 1 else 1
-                                seleccionado = None
-                                if puntos[1] >= 12 or puntos[2] >= 12:
-                                    ganador = 1 if puntos[1] >= 12 else 2
-                                    perdedor = 2 if ganador == 1 else 1
-                                    recorder.guardar()
-                                    pantalla_final(ventana, ganador, perdedor)
+                    sq = bb.square_index(y // TAM_CASILLA, x // TAM_CASILLA)
+                    if sq < 0:
+                        continue
+                    if pos.owner(sq) == pos.turn:
+                        seleccionado, movs_sel = sq, pos.moves_from(sq)
+                    elif seleccionado is not None:
+                        for m in movs_sel:
+                            if m[1] == sq:
+                                seleccionado, movs_sel = None, []
+                                if jugar(m):
                                     running = False
                                 break
 
-        reloj.tick(30)
-
+    pygame.time.set_timer(EV_STATS, 0)
+    if ia:
+        ia.close()
     pygame.quit()
+    if reporter:
+        if final is None:
+            reporter.send("abandon")
+        reporter.close()
+    return final
 
 # =========================================================
 # ==============   MODO FLET (modal estilo ruleta)  =======
 # =========================================================
-def open_damas_dialog(page, on_finish):
+def _sheet(page, content):
     """
-    Abre un diálogo tipo bottom-sheet para registrar el score de Damas.
+    (abrir, cerrar) de un bottom-sheet con `content`.
     Compatible con Flet antiguo (BottomSheet) y nuevo (ModalBottomSheet).
     """
     import flet as ft
+    from ui.batching import UpdateBatcher
+
+    if hasattr(ft, "ModalBottomSheet"):
+        sheet = ft.ModalBottomSheet(content=content)
+        return (lambda: page.open(sheet)), (lambda: page.close(sheet))
+
+    # Flet clásico: BottomSheet + overlay
+    ui = UpdateBatcher.for_page(page)
+    sheet = ft.BottomSheet(content=content)
+
+    def _open():
+        if sheet not in page.overlay:
+            page.overlay.append(sheet)
+        sheet.open = True
+        ui.update()
+
+    def _close():
+        sheet.open = False
+        ui.update()
+
+    return _open, _close
+
+def open_damas_dialog(page, on_finish):
+    """
+    Abre un diálogo tipo bottom-sheet para registrar el score de Damas a mano.
+    Solo se usa si el juego externo falla (ver launch_damas).
+    """
+    import flet as ft
+    from ui.batching import UpdateBatcher
 
+    ui = UpdateBatcher.for_page(page)
     score = ft.Slider(min=0, max=100, value=70, divisions=20, width=320)
     lbl = ft.Text("Valora tu desempeño en Damas (0–100): 70")
 
     def on_change(e):
         lbl.value = f"Valora tu desempeño en Damas (0–100): {int(score.value)}"
-        page.update()
+        ui.schedule()   # el slider dispara ráfagas de on_change: debounce
     score.on_change = on_change
 
-    # UI del sheet
+    guardar = ft.ElevatedButton("Guardar puntaje")
+    cancelar = ft.OutlinedButton("Cancelar")
     content = ft.Container(
         padding=20,
         content=ft.Column(
@@ -283,70 +339,78 @@ def open_damas_dialog(page, on_finish):
             spacing=12,
             controls=[
                 ft.Text("♟ Damas Vocacional", size=18, weight=ft.FontWeight.W_600),
-                ft.Text("Cuando termines el juego externo, registra tu puntaje aquí."),
+                ft.Text("El juego se cerró inesperadamente; registra tu puntaje aquí."),
                 lbl, score,
-                ft.Row(
-                    alignment=ft.MainAxisAlignment.END,
-                    controls=[
-                        ft.ElevatedButton("Guardar puntaje"),
-                        ft.OutlinedButton("Cancelar"),
-                    ],
-                ),
+                ft.Row(alignment=ft.MainAxisAlignment.END, controls=[guardar, cancelar]),
             ],
         ),
     )
+    _open, _close = _sheet(page, content)
+
+    guardar.on_click = lambda e: (
+        _close(),
+        on_finish({
+            "game": GAME_NAME,
+            "area": DAMAS_AREA,
+            "score": int(score.value),
+            "why": "Juego estratégico que evalúa razonamiento lógico y planificación.",
+        })
+    )
+    cancelar.on_click = lambda e: _close()
+    _open()
 
-    # Elegir componente según versión de Flet
-    if hasattr(ft, "ModalBottomSheet"):
-        sheet = ft.ModalBottomSheet(content=content)
+def launch_damas(page, on_finish, level: str = DEFAULT_LEVEL):
+    """
+    Lanza la ventana pygame en otro proceso y muestra su progreso en un bottom-sheet.
+    El resultado real llega por games.damas.link y se pasa a on_finish sin sondeo;
+    si el proceso muere sin enviarlo, se abre el slider de open_damas_dialog.
+    """
+    import flet as ft
+    from ui.batching import UpdateBatcher
+
+    ui = UpdateBatcher.for_page(page)
+    estado = ft.Text("Juega en la ventana de Damas; el resultado se registrará solo.")
+    marcador = ft.Text("Rojo 0 · Azul 0")
+    content = ft.Container(
+        padding=20,
+        content=ft.Column(
+            tight=True,
+            spacing=12,
+            controls=[
+                ft.Text("♟ Damas Vocacional", size=18, weight=ft.FontWeight.W_600),
+                estado, marcador, ft.ProgressBar(width=320),
+            ],
+        ),
+    )
+    _open, _close = _sheet(page, content)
+
+    def on_progress(msg):
+        rojo, azul = msg.get("capturas", (0, 0))
+        marcador.value = f"Jugada {msg.get('ply', 0)} · Rojo {rojo} · Azul {azul}"
+        ui.schedule()   # una jugada puede llegar en ráfaga con la de la IA
+
+    def on_result(result):
+        _close()
+        on_finish(result)
+
+    def on_abandon():
+        print("⚠️ Partida de Damas cerrada antes de terminar: no se registra puntaje.")
+        _close()
+
+    def on_crash(code):
+        print(f"⚠️ El juego de Damas terminó sin resultado (código {code}): se pide el puntaje a mano.")
+        _close()
+        open_damas_dialog(page, on_finish)
+
+    game = link.GameLink(on_progress, on_result, on_abandon, on_crash)
+    _open()
+    try:
+        game.launch([sys.executable, os.path.join(HERE, "damas_vocacional.py"), level or "humano"], cwd=ROOT)
+    except OSError as e:
+        on_crash(f"no se pudo lanzar: {e}")
+    return game
 
-        def _open():
-            page.open(sheet)
-
-        def _close():
-            page.close(sheet)
-
-        # conectar botones
-        content.content.controls[-1].controls[0].on_click = lambda e: (
-            _close(),
-            on_finish({
-                "game": "Damas Vocacional",
-                "area": DAMAS_AREA,
-                "score": int(score.value),
-                "why": "Juego estratégico que evalúa razonamiento lógico y planificación.",
-            })
-        )
-        content.content.controls[-1].controls[1].on_click = lambda e: _close()
-
-        _open()
-
-    else:
-        # Flet clásico: BottomSheet + overlay
-        sheet = ft.BottomSheet(content=content)
-
-        def _open():
-            if sheet not in page.overlay:
-                page.overlay.append(sheet)
-            sheet.open = True
-            page.update()
-
-        def _close():
-            sheet.open = False
-            page.update()
-
-        # conectar botones
-        content.content.controls[-1].controls[0].on_click = lambda e: (
-            _close(),
-            on_finish({
-                "game": "Damas Vocacional",
-                "area": DAMAS_AREA,
-                "score": int(score.value),
-                "why": "Juego estratégico que evalúa razonamiento lógico y planificación.",
-            })
-        )
-        content.content.controls[-1].controls[1].on_click = lambda e: _close()
-
-        _open()
-        
 if __name__ == "__main__":
-    run_damas()
+    # python games/damas/damas_vocacional.py [facil|medio|dificil|experto|humano]
+    nivel = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LEVEL
+    run_damas(ai_level=None if nivel == "humano" else nivel)
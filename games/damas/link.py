@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# games/damas/link.py
+# Canal local entre la app (Flet) y el proceso del juego de Damas (pygame):
+# Listener en 127.0.0.1 con authkey; la dirección y la clave viajan en el entorno del hijo
+from __future__ import annotations
+
+import os
+import secrets
+import socket
+import subprocess
+import threading
+from multiprocessing.connection import Client, Listener
+from typing import Callable, List, Optional
+
+ENV_ADDR = "DAMAS_IPC_ADDR"      # "127.0.0.1:puerto"
+ENV_KEY = "DAMAS_IPC_KEY"        # authkey en hexadecimal
+JOIN_TIMEOUT = 5.0               # espera al lector tras la salida del hijo
+
+# mensajes (dict) del hijo al padre:
+#   {"type": "progress", "ply": n, "capturas": (rojo, azul), "turno": 1|2}
+#   {"type": "result", "result": {...como on_finish...}}
+#   {"type": "abandon"}          cerró la ventana sin terminar
+
+
+class GameLink:
+    """
+    Lanza el juego y escucha en un hilo (sin sondeo): cada mensaje llama a su callback.
+    Si el proceso termina sin enviar "result" ni "abandon", se llama a on_crash(returncode).
+    Los callbacks se ejecutan en hilos del enlace, no en el de la interfaz.
+    """
+
+    def __init__(self, on_progress: Optional[Callable[[dict], None]] = None,
+                 on_result: Optional[Callable[[dict], None]] = None,
+                 on_abandon: Optional[Callable[[], None]] = None,
+                 on_crash: Optional[Callable[[int], None]] = None):
+        self.on_progress = on_progress
+        self.on_result = on_result
+        self.on_abandon = on_abandon
+        self.on_crash = on_crash
+        self.proc: Optional[subprocess.Popen] = None
+        self._connected = False      # el hijo abrió la conexión
+        self._finished = False       # llegó "result" o "abandon"
+        self._key = secrets.token_bytes(32)
+        self._listener = Listener(("127.0.0.1", 0), authkey=self._key)
+        self._reader = threading.Thread(target=self._read, daemon=True, name="damas-link")
+
+    def launch(self, cmd: List[str], cwd: Optional[str] = None) -> subprocess.Popen:
+        host, port = self._listener.address
+        env = dict(os.environ, **{ENV_ADDR: f"{host}:{port}", ENV_KEY: self._key.hex()})
+        try:
+            self.proc = subprocess.Popen(cmd, cwd=cwd, env=env)
+        except OSError:
+            self._listener.close()
+            raise
+        self._reader.start()
+        threading.Thread(target=self._watch, daemon=True, name="damas-link-wait").start()
+        return self.proc
+
+    def _read(self):
+        try:
+            conn = self._listener.accept()
+        except Exception:                    # despertado por _watch (el hijo no llegó a conectar)
+            return
+        self._connected = True
+        with conn:
+            while True:
+                try:
+                    msg = conn.recv()
+                except (EOFError, OSError):
+                    return
+                kind = msg.get("type") if isinstance(msg, dict) else None
+                if kind == "progress" and self.on_progress:
+                    self.on_progress(msg)
+                elif kind == "result":
+                    self._finished = True
+                    if self.on_result:
+                        self.on_result(msg.get("result") or {})
+                elif kind == "abandon":
+                    self._finished = True
+                    if self.on_abandon:
+                        self.on_abandon()
+
+    def _watch(self):
+        code = self.proc.wait()
+        if not self._connected:
+            # cerrar el Listener no despierta un accept() bloqueado: se le entrega una conexión vacía
+            try:
+                socket.create_connection(self._listener.address, timeout=1).close()
+            except OSError:
+                pass
+        self._reader.join(JOIN_TIMEOUT)
+        self._listener.close()
+        if not self._finished and self.on_crash:
+            self.on_crash(code)
+
+
+class Reporter:
+    """Lado del juego: envía progreso y resultado; si el padre ya no está, sigue sin avisar."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def send(self, kind: str, **data):
+        if self._conn is None:
+            return
+        try:
+            self._conn.send({"type": kind, **data})
+        except (OSError, EOFError, ValueError):
+            self._conn = None
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def connect_from_env() -> Optional[Reporter]:
+    """Reporter si el juego lo lanzó la app (variables de entorno presentes); si no, None."""
+    addr, key = os.environ.get(ENV_ADDR), os.environ.get(ENV_KEY)
+    if not addr or not key:
+        return None
+    host, _, port = addr.rpartition(":")
+    try:
+        return Reporter(Client((host, int(port)), authkey=bytes.fromhex(key)))
+    except Exception as e:                   # sin padre el juego funciona igual
+        print(f"⚠️ No se pudo conectar con la app: {e}")
+        return None
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# games/damas/render.py
+# Dibujo del tablero de Damas por rectángulos sucios: superficies pre-renderizadas,
+# fuentes y textos en caché, y solo se actualiza lo que cambió (display.update(rects))
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import bitboard as bb
+
+# pygame se importa al crear el renderer (el modo Flet no lo necesita)
+pygame = None
+
+ANCHO, ALTO = 1200, 800           # 800 tablero + panel lateral
+TAB_W = 800
+TAM_CASILLA = TAB_W // 8
+
+BLANCO   = (255, 255, 255)
+NEGRO    = (0, 0, 0)
+ROJO     = (200, 50, 50)
+AZUL     = (50, 50, 200)
+VERDE    = (0, 200, 0)
+AMARILLO = (200, 200, 0)
+GRISUI   = (220, 220, 220)
+GRIS     = (110, 110, 110)
+
+TEXT_CACHE = 256                  # superficies de texto distintas en memoria
+STATS_EVERY = 1.0                 # segundos entre actualizaciones del contador
+
+# líneas del panel: y, alto
+_LINES = {"titulo": (30, 40), "turno": (100, 32), "rojo": (160, 32), "azul": (200, 32), "stats": (ALTO - 40, 28)}
+
+
+class FrameStats:
+    """Frames dibujados, ms por frame y % de CPU del proceso en la última ventana de tiempo."""
+
+    def __init__(self, every: float = STATS_EVERY):
+        self.every = every
+        self._t0, self._cpu0 = time.perf_counter(), time.process_time()
+        self._frames = 0
+        self._draw = 0.0
+        self.fps = self.ms = self.cpu = 0.0
+
+    def add(self, seconds: float):
+        self._frames += 1
+        self._draw += seconds
+
+    def tick(self) -> bool:
+        """Cierra la ventana si pasó `every`; True si hay valores nuevos."""
+        now, cpu = time.perf_counter(), time.process_time()
+        wall = now - self._t0
+        if wall < self.every:
+            return False
+        self.fps = self._frames / wall
+        self.ms = self._draw * 1000 / self._frames if self._frames else 0.0
+        self.cpu = 100.0 * (cpu - self._cpu0) / wall
+        self._t0, self._cpu0, self._frames, self._draw = now, cpu, 0, 0.0
+        return True
+
+    def text(self) -> str:
+        return f"{self.fps:4.1f} frames/s · {self.ms:4.1f} ms · CPU {self.cpu:4.1f}%"
+
+
+class BoardRenderer:
+    """
+    Guarda lo último que se dibujó en cada casilla y en cada línea del panel;
+    draw() repinta solo lo que cambió y devuelve esos rectángulos.
+    """
+
+    def __init__(self, screen):
+        global pygame
+        import pygame as _pg
+        pygame = _pg
+        self.screen = screen
+        self.stats = FrameStats()
+        self._fonts: Dict[Tuple[int, bool], object] = {}
+        self._texts: Dict[tuple, object] = {}
+        self._board = self._make_board()
+        self._panel = self._make_panel()
+        self._pieces = {1: self._make_piece(ROJO), 2: self._make_piece(AZUL)}
+        self._marks = {False: self._make_mark(VERDE), True: self._make_mark(AMARILLO)}
+        self.invalidate()
+
+    # ---------- superficies pre-renderizadas ----------
+    def _make_board(self):
+        s = pygame.Surface((TAB_W, TAB_W)).convert()
+        s.fill(NEGRO)
+        for f in range(8):
+            for c in range(8):
+                if (f + c) % 2 == 0:
+                    pygame.draw.rect(s, BLANCO, (c * TAM_CASILLA, f * TAM_CASILLA, TAM_CASILLA, TAM_CASILLA))
+        return s
+
+    def _make_panel(self):
+        s = pygame.Surface((ANCHO - TAB_W, ALTO)).convert()
+        s.fill(GRISUI)
+        y, _ = _LINES["titulo"]
+        s.blit(self.text("TEST DAMAS VOCACIONAL", 40, NEGRO, bold=True), (10, y))
+        return s
+
+    def _make_piece(self, color):
+        s = pygame.Surface((TAM_CASILLA, TAM_CASILLA), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(s, color, (TAM_CASILLA // 2, TAM_CASILLA // 2), TAM_CASILLA // 2 - 10)
+        return s
+
+    def _make_mark(self, color):
+        s = pygame.Surface((TAM_CASILLA, TAM_CASILLA), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.rect(s, color, (0, 0, TAM_CASILLA, TAM_CASILLA), 5)
+        return s
+
+    # ---------- fuentes y textos en caché ----------
+    def font(self, size: int, bold: bool = False):
+        key = (size, bold)
+        if key not in self._fonts:
+            self._fonts[key] = pygame.font.SysFont(None, size, bold=bold)
+        return self._fonts[key]
+
+    def text(self, msg: str, size: int, color, bold: bool = False):
+        key = (msg, size, color, bold)
+        surf = self._texts.get(key)
+        if surf is None:
+            if len(self._texts) >= TEXT_CACHE:
+                self._texts.clear()
+            surf = self._texts[key] = self.font(size, bold).render(msg, True, color)
+        return surf
+
+    # ---------- dibujo incremental ----------
+    def invalidate(self):
+        """Olvida lo dibujado: el próximo draw() repinta todo (inicio, tras un diálogo, etc.)."""
+        self._cells: List[Optional[tuple]] = [None] * bb.SQUARES
+        self._lines: Dict[str, Optional[tuple]] = {k: None for k in _LINES}
+        self._full = True
+
+    def _cell(self, i: int, state: tuple):
+        owner, mark = state
+        f, c = bb.square_rc(i)
+        rect = pygame.Rect(c * TAM_CASILLA, f * TAM_CASILLA, TAM_CASILLA, TAM_CASILLA)
+        self.screen.blit(self._board, rect, rect)
+        if owner:
+            self.screen.blit(self._pieces[owner], rect)
+        if mark is not None:
+            self.screen.blit(self._marks[mark], rect)
+        return rect
+
+    def _line(self, name: str, surf):
+        y, h = _LINES[name]
+        rect = pygame.Rect(TAB_W, y, ANCHO - TAB_W, h)
+        self.screen.blit(self._panel, rect, rect.move(-TAB_W, 0))
+        if surf is not None:
+            self.screen.blit(surf, (TAB_W + 10, y))
+        return rect
+
+    def draw(self, pos: bb.Position, moves: Sequence[bb.Move] = (), pensando: bool = False,
+             show_stats: bool = True) -> List:
+        """Repinta lo que cambió desde el último draw() y llama a display.update con esos rects."""
+        t = time.perf_counter()
+        dirty = []
+        if self._full:
+            self.screen.blit(self._board, (0, 0))
+            self.screen.blit(self._panel, (TAB_W, 0))
+            dirty.append(self.screen.get_rect())
+
+        marks = {to: cap >= 0 for _, to, cap in moves}
+        for i in range(bb.SQUARES):
+            state = (pos.owner(i), marks.get(i))
+            if state != self._cells[i]:
+                self._cells[i] = state
+                r = self._cell(i, state)
+                if not self._full:
+                    dirty.append(r)
+
+        turno = f"Turno: {'ROJO' if pos.turn == 1 else 'AZUL'}{' (pensando…)' if pensando else ''}"
+        lines = {
+            "turno": (turno, 30, NEGRO),
+            "rojo": (f"Rojo: {pos.captured(1)} pts", 30, ROJO),
+            "azul": (f"Azul: {pos.captured(2)} pts", 30, AZUL),
+            "stats": (self.stats.text(), 22, GRIS) if show_stats else None,
+        }
+        for name, spec in lines.items():
+            if spec != self._lines[name]:
+                self._lines[name] = spec
+                r = self._line(name, self.text(*spec) if spec else None)
+                if not self._full:
+                    dirty.append(r)
+
+        if dirty:
+            pygame.display.update(dirty)
+            self.stats.add(time.perf_counter() - t)
+        self._full = False
+        return dirty
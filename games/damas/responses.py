@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# games/damas/responses.py
+# Registro de respuestas solo-anexar (JSONL) con bloqueo de fichero; el Excel es una vista
+# que se genera bajo demanda: python -m games.damas.responses [--excel ruta.xlsx]
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+# bloqueo entre procesos: fcntl (Linux/macOS) o msvcrt (Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, "..", ".."))
+LOG_PATH = os.path.join(ROOT, "data", "Respuestas_Registradas.jsonl")
+EXCEL_PATH = os.path.join(ROOT, "data", "Respuestas_Registradas.xlsx")
+COLUMNS = ["jugador", "pregunta", "respuesta", "fecha", "partida"]
+
+_thread_lock = threading.Lock()     # flock no excluye hilos del mismo proceso en todos los SO
+
+
+@contextmanager
+def _locked(f):
+    """Bloqueo exclusivo del fichero abierto `f` (espera si otro proceso lo tiene)."""
+    with _thread_lock:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            pos = f.tell()
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)    # reintenta ~10 s antes de fallar
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                f.seek(pos)
+        else:
+            yield
+
+
+def log_path_for(archivo: Optional[str]) -> str:
+    """Ruta del registro para una ruta de Excel antigua (misma carpeta y nombre, .jsonl)."""
+    if not archivo:
+        return LOG_PATH
+    base, ext = os.path.splitext(archivo)
+    return base + ".jsonl" if ext.lower() in (".xlsx", ".xls") else archivo
+
+
+def _append_locked(f, rows: List[dict]):
+    blob = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in rows).encode("utf-8")
+    f.seek(0, os.SEEK_END)
+    if f.tell() > 0:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            blob = b"\n" + blob
+        f.seek(0, os.SEEK_END)
+    f.write(blob)
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def append(rows: List[dict], path: str = LOG_PATH):
+    """
+    Añade las filas de una partida con una sola escritura + fsync, bajo bloqueo.
+    Si un corte dejó la última línea a medias, la nueva empieza en una línea propia.
+    """
+    if not rows:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as f, _locked(f):
+        _append_locked(f, rows)
+
+
+def _rows(f) -> Iterator[dict]:
+    # desde el principio del fichero abierto `f` (binario)
+    f.seek(0)
+    for line in f:
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(row, dict):
+            yield row
+
+
+def read(path: str = LOG_PATH) -> Iterator[dict]:
+    """Filas válidas del registro (las líneas corruptas o a medias se saltan)."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        yield from _rows(f)
+
+
+def _import_legacy_locked(f, excel: str, path: str) -> int:
+    # una sola vez: las filas del Excel anterior pasan al registro antes de reescribirlo
+    marker = path + ".legacy"
+    if os.path.exists(marker) or not os.path.exists(excel):
+        return 0
+    import pandas as pd
+    old = pd.read_excel(excel).astype(object)
+    rows = [{k: (None if pd.isna(v) else v) for k, v in r.items()} for r in old.to_dict("records")]
+    for r in rows:
+        r["partida"] = r.get("partida") or "xlsx"
+    _append_locked(f, rows)
+    with open(marker, "w", encoding="utf-8") as m:
+        m.write(f"{len(rows)} filas importadas de {os.path.basename(excel)}\n")
+    return len(rows)
+
+
+def export_excel(excel: str = EXCEL_PATH, path: str = LOG_PATH) -> int:
+    """
+    Materializa la vista Excel del registro (escritura atómica) y devuelve las filas.
+    La primera vez conserva las filas que ya tenía el Excel antiguo.
+    """
+    import pandas as pd
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as f, _locked(f):
+        _import_legacy_locked(f, excel, path)
+        # por el mismo descriptor: en Windows el byte bloqueado no se lee desde otro handle
+        rows = list(_rows(f))
+    df = pd.DataFrame(rows)
+    cols = [c for c in COLUMNS if c in df.columns] + [c for c in df.columns if c not in COLUMNS]
+    if "fecha" in df.columns:
+        df = df.sort_values("fecha", kind="stable")     # las filas antiguas quedan primero
+    tmp = f"{excel}.{os.getpid()}.tmp.xlsx"
+    df.reindex(columns=cols or COLUMNS).to_excel(tmp, index=False)
+    os.replace(tmp, excel)
+    return len(rows)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Genera la vista Excel del registro de respuestas de Damas")
+    ap.add_argument("--log", default=LOG_PATH)
+    ap.add_argument("--excel", default=EXCEL_PATH)
+    a = ap.parse_args(argv)
+    try:
+        n = export_excel(a.excel, a.log)
+    except ImportError:
+        print("⚠️ Se necesita pandas + openpyxl para generar el Excel")
+        return 1
+    except OSError as e:
+        print(f"⚠️ No se pudo generar el Excel: {e}")
+        return 1
+    print(f"📂 {n} respuestas -> {a.excel}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+# games/damas/tablebase.py
+# Tablas de finales de Damas: análisis retrógrado offline + consulta O(1) vía mmap
+# Uso: python -m games.damas.tablebase --pieces 5        (genera data/damas/tablebase.bin)
+"""
+Cada posición se guarda desde el bando que mueve: (me, opp) con a = |me|, b = |opp|.
+Como las fichas de ambos colores se mueven igual (4 diagonales, sin coronación),
+el valor no depende del color, solo de quién mueve.
+
+Índice dentro de una clase (a, b): rango colex de `me` entre las 32 casillas por
+C(32-a, b) + rango colex de `opp` entre las 32-a casillas libres.
+
+Valor uint16: 0 = tablas (o ciclo sin salida), v > 0 -> d = v - 1 plies hasta el
+final; d par = pierde el que mueve, d impar = gana.
+
+Formato del fichero (little endian):
+    cabecera  "DMTB" | versión u16 | forced u8 | max_piezas u8 | n_clases u32
+    clases    n_clases × (a u8, b u8, reservado u16, offset u64, cuenta u64)
+    datos     uint16 por posición, clase tras clase
+"""
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from itertools import combinations
+from math import comb
+from typing import Dict, List, Optional, Tuple
+
+from . import bitboard as bb
+from .bitboard import Move
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, "..", ".."))
+TABLEBASE_PATH = os.path.join(ROOT, "data", "damas", "tablebase.bin")
+MAX_PIECES = 5
+
+MAGIC = b"DMTB"
+VERSION = 1
+_HEAD = struct.Struct("<4sHBBI")
+_CLASS = struct.Struct("<BBHQQ")
+
+DRAW = 0
+UNKNOWN = 0xFFFF          # solo durante la construcción
+
+C = [[comb(n, k) for k in range(bb.SQUARES + 1)] for n in range(bb.SQUARES + 1)]
+
+
+# ---------- indexación combinatoria ----------
+def _rank(squares) -> int:
+    """Rango colex de un conjunto creciente de casillas."""
+    r = 0
+    for i, s in enumerate(squares, 1):
+        r += C[s][i]
+    return r
+
+
+def class_size(a: int, b: int) -> int:
+    return C[bb.SQUARES][a] * C[bb.SQUARES - a][b]
+
+
+def index(me: int, opp: int, a: int, b: int) -> int:
+    r_me = 0
+    i = 0
+    for s in bb.bits(me):
+        i += 1
+        r_me += C[s][i]
+    r_opp = 0
+    i = 0
+    for s in bb.bits(opp):
+        i += 1
+        r_opp += C[s - (me & ((1 << s) - 1)).bit_count()][i]   # casilla entre las libres
+    return r_me * C[bb.SQUARES - a][b] + r_opp
+
+
+def _colex(n: int, k: int) -> List[Tuple[int, ...]]:
+    return sorted(combinations(range(n), k), key=lambda t: t[::-1])
+
+
+def classes(max_pieces: int) -> List[Tuple[int, int]]:
+    """(a, b) con a, b >= 1 y a + b <= max_pieces, de menos a más piezas."""
+    return [(a, t - a) for t in range(2, max_pieces + 1) for a in range(1, t)]
+
+
+def positions(a: int, b: int):
+    """(índice, me, opp) de toda la clase, en orden de índice."""
+    opp_combos = _colex(bb.SQUARES - a, b)
+    idx = 0
+    for me_sq in _colex(bb.SQUARES, a):
+        me = 0
+        for s in me_sq:
+            me |= 1 << s
+        free = [s for s in range(bb.SQUARES) if not me >> s & 1]
+        for oc in opp_combos:
+            opp = 0
+            for j in oc:
+                opp |= 1 << free[j]
+            yield idx, me, opp
+            idx += 1
+
+
+# ---------- análisis retrógrado ----------
+def _solve_pair(pair: List[Tuple[int, int]], tables: Dict[Tuple[int, int], array],
+                forced: bool, log=print):
+    """
+    Resuelve juntas (a, b) y (b, a): sus jugadas sin captura van de una a otra.
+    Las capturas llevan a (b-1, a), ya resuelta.
+    """
+    win = {}        # menor distancia de victoria candidata (UNKNOWN = ninguna)
+    lossmax = {}    # mayor distancia entre hijos ganados
+    pending = {}    # jugadas internas aún sin resolver
+    drawish = {}    # algún hijo externo es tablas: nunca será derrota
+    final = {}
+    buckets: List[List[Tuple[Tuple[int, int], int]]] = [[]]
+
+    def push(d, cls, i):
+        while len(buckets) <= d:
+            buckets.append([])
+        buckets[d].append((cls, i))
+
+    for cls in pair:
+        a, b = cls
+        n = class_size(a, b)
+        win[cls] = array("H", [UNKNOWN]) * n
+        lossmax[cls] = array("H", [0]) * n
+        pending[cls] = array("B", [0]) * n
+        drawish[cls] = bytearray(n)
+        final[cls] = array("H", [UNKNOWN]) * n
+        ext = tables.get((b - 1, a))
+        t = time.perf_counter()
+        for i, me, opp in positions(a, b):
+            moves = bb.generate(me, opp, forced)
+            if not moves:
+                push(0, cls, i)                 # sin jugadas: pierde ya
+                continue
+            w, lm, internal, dr = UNKNOWN, 0, 0, 0
+            for m in moves:
+                if m[2] < 0:
+                    internal += 1
+                    continue
+                x, y = bb.apply(me, opp, m)
+                if b == 1:                       # capturó la última ficha
+                    w = 1
+                    continue
+                v = ext[index(y, x, b - 1, a)]
+                if v == DRAW:
+                    dr = 1
+                elif (v - 1) % 2 == 0:           # hijo perdido -> gano en d+1
+                    w = min(w, v)
+                else:
+                    lm = max(lm, v)
+            pending[cls][i] = internal
+            lossmax[cls][i] = lm
+            drawish[cls][i] = dr
+            if w != UNKNOWN:
+                win[cls][i] = w
+                push(w, cls, i)
+            elif internal == 0 and not dr:
+                push(lm, cls, i)                 # todos los hijos (externos) ganan
+        log(f"  {a}v{b}: {n:,} posiciones iniciadas en {time.perf_counter() - t:.1f}s")
+
+    other = {pair[0]: pair[-1], pair[-1]: pair[0]}
+    d = 0
+    while d < len(buckets):
+        for cls, i in buckets[d]:
+            fin = final[cls]
+            if fin[i] != UNKNOWN:
+                continue
+            is_win = d % 2 == 1
+            if is_win and win[cls][i] != d:
+                continue                         # entrada vieja: ya tiene una victoria más corta
+            fin[i] = d + 1
+            # predecesores: el rival deshace una jugada sin captura
+            a, b = cls
+            me, opp = _unindex(cls, i)
+            pcls = other[cls]
+            empty = bb.FULL & ~(me | opp)
+            for to in bb.bits(opp):
+                for frm in bb.STEP_TARGETS[to]:
+                    if not empty >> frm & 1:
+                        continue
+                    q_me, q_opp = (opp & ~(1 << to)) | (1 << frm), me
+                    if forced and bb.captures(q_me, q_opp):
+                        continue                 # con captura obligatoria esa jugada no era legal
+                    q = index(q_me, q_opp, b, a)
+                    if final[pcls][q] != UNKNOWN:
+                        continue
+                    if not is_win:               # lo dejo perdido: el predecesor gana en d+1
+                        if d + 1 < win[pcls][q]:
+                            win[pcls][q] = d + 1
+                            push(d + 1, pcls, q)
+                    else:
+                        lossmax[pcls][q] = max(lossmax[pcls][q], d + 1)
+                        pending[pcls][q] -= 1
+                        if pending[pcls][q] == 0 and win[pcls][q] == UNKNOWN and not drawish[pcls][q]:
+                            push(lossmax[pcls][q], pcls, q)
+        buckets[d] = []
+        d += 1
+
+    for cls in pair:
+        fin = final[cls]
+        for i in range(len(fin)):
+            if fin[i] == UNKNOWN:
+                fin[i] = DRAW                   # nunca se resolvió: ciclo / tablas
+        tables[cls] = fin
+
+
+_UNRANK: Dict[Tuple[int, int], List[Tuple[int, ...]]] = {}
+
+
+def _unindex(cls: Tuple[int, int], i: int) -> Tuple[int, int]:
+    a, b = cls
+    for key in ((bb.SQUARES, a), (bb.SQUARES - a, b)):
+        if key not in _UNRANK:
+            _UNRANK[key] = _colex(*key)
+    r_me, r_opp = divmod(i, C[bb.SQUARES - a][b])
+    me = 0
+    for s in _UNRANK[(bb.SQUARES, a)][r_me]:
+        me |= 1 << s
+    free = [s for s in range(bb.SQUARES) if not me >> s & 1]
+    opp = 0
+    for j in _UNRANK[(bb.SQUARES - a, b)][r_opp]:
+        opp |= 1 << free[j]
+    return me, opp
+
+
+def build(max_pieces: int = MAX_PIECES, path: str = TABLEBASE_PATH,
+          forced: bool = bb.FORCED_CAPTURES, log=print) -> Dict[Tuple[int, int], array]:
+    """Genera todas las clases hasta `max_pieces` piezas y las escribe en `path`."""
+    tables: Dict[Tuple[int, int], array] = {}
+    done = set()
+    t0 = time.perf_counter()
+    for a, b in classes(max_pieces):
+        if (a, b) in done:
+            continue
+        pair = [(a, b)] if a == b else [(a, b), (b, a)]
+        log(f"Clase {a + b} piezas: {' + '.join(f'{x}v{y}' for x, y in pair)}")
+        _solve_pair(pair, tables, forced, log)
+        done.update(pair)
+    write(tables, path, max_pieces, forced)
+    log(f"💾 {path} ({os.path.getsize(path) / 1e6:.1f} MB) en {time.perf_counter() - t0:.0f}s")
+    return tables
+
+
+def write(tables: Dict[Tuple[int, int], array], path: str, max_pieces: int, forced: bool):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    order = classes(max_pieces)
+    offset = _HEAD.size + _CLASS.size * len(order)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEAD.pack(MAGIC, VERSION, int(forced), max_pieces, len(order)))
+        for a, b in order:
+            n = class_size(a, b)
+            f.write(_CLASS.pack(a, b, 0, offset, n))
+            offset += 2 * n
+        for cls in order:
+            data = tables[cls]
+            if sys.byteorder != "little":
+                data = array("H", data)
+                data.byteswap()
+            data.tofile(f)
+    os.replace(tmp, path)
+
+
+# ---------- consulta ----------
+class Tablebase:
+    """Consulta por mmap: abrir no lee los datos, cada probe es un acceso O(1)."""
+
+    def __init__(self, path: str = TABLEBASE_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, forced, max_pieces, n = _HEAD.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: no es una tabla de finales v{VERSION}")
+        self.forced = bool(forced)
+        self.max_pieces = max_pieces
+        self.offsets: Dict[Tuple[int, int], int] = {}
+        for k in range(n):
+            a, b, _, offset, _ = _CLASS.unpack_from(self._mm, _HEAD.size + k * _CLASS.size)
+            self.offsets[(a, b)] = offset
+
+    def raw(self, me: int, opp: int) -> Optional[int]:
+        """Valor almacenado (0 tablas, d + 1) o None si la posición no está en la tabla."""
+        a, b = me.bit_count(), opp.bit_count()
+        off = self.offsets.get((a, b))
+        if off is None:
+            return None
+        return struct.unpack_from("<H", self._mm, off + 2 * index(me, opp, a, b))[0]
+
+    def probe(self, me: int, opp: int) -> Optional[Tuple[int, int]]:
+        """(resultado, plies): 1 gana el que mueve, -1 pierde, 0 tablas; None fuera de la tabla."""
+        if not me:
+            return -1, 0
+        if not opp:
+            return 1, 0
+        v = self.raw(me, opp)
+        if v is None:
+            return None
+        if v == DRAW:
+            return 0, 0
+        d = v - 1
+        return (1 if d % 2 else -1), d
+
+    def best_move(self, pos: bb.Position) -> Optional[Move]:
+        """Jugada perfecta: ganar lo antes posible, perder lo más tarde posible, o mantener tablas."""
+        me, opp = pos.me, pos.opp
+        if (me | opp).bit_count() > self.max_pieces or pos.forced != self.forced:
+            return None
+        best, best_key = None, None
+        for m in pos.legal_moves():
+            a, b = bb.apply(me, opp, m)
+            r = self.probe(b, a)
+            if r is None:
+                return None
+            outcome, d = r
+            # el resultado del hijo es del rival: -1 para él = victoria para mí
+            key = (1, -d) if outcome < 0 else (0, 0) if outcome == 0 else (-1, d)
+            if best_key is None or key > best_key:
+                best, best_key = m, key
+        return best
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+_OPEN: Dict[str, Optional[Tablebase]] = {}
+
+
+def get_tablebase(forced: bool = bb.FORCED_CAPTURES, path: str = TABLEBASE_PATH) -> Optional[Tablebase]:
+    """Tabla compartida por proceso (None si no se ha generado o es de otras reglas)."""
+    if path not in _OPEN:
+        tb = None
+        if os.path.exists(path):
+            try:
+                tb = Tablebase(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Tabla de finales ignorada: {e}")
+        _OPEN[path] = tb
+    tb = _OPEN[path]
+    return tb if tb is not None and tb.forced == forced else None
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Genera la tabla de finales de Damas")
+    ap.add_argument("--pieces", type=int, default=MAX_PIECES, help="máximo de piezas en el tablero")
+    ap.add_argument("--forced", action="store_true", help="captura obligatoria")
+    ap.add_argument("--out", default=TABLEBASE_PATH)
+    a = ap.parse_args(argv)
+    build(a.pieces, a.out, a.forced)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Registro de juegos y servicios: se importan la primera vez que se usan
+# (PIL, pygame, reportlab… no se cargan hasta que el usuario los necesita)
+
+import importlib
+import threading
+from typing import Callable, Dict, Tuple
+
+# nombre -> (módulo, atributo)
+ENTRIES: Dict[str, Tuple[str, str]] = {
+    "debug_runner": ("games.debug_runner", "build_debug_runner"),
+    "color_quest":  ("games.color_quest", "build_color_quest"),
+    "ruleta":       ("games.ruleta.dialog", "open_ruleta_dialog"),
+    "damas":        ("games.damas.damas_vocacional", "launch_damas"),
+    "export":       ("services.exporter", "export_all"),
+}
+
+_LOADED: Dict[str, Callable] = {}
+_LOCK = threading.Lock()
+
+
+def load(name: str) -> Callable:
+    """Devuelve la función registrada, importando su módulo si hace falta."""
+    fn = _LOADED.get(name)
+    if fn is None:
+        module, attr = ENTRIES[name]
+        with _LOCK:
+            fn = _LOADED.get(name)
+            if fn is None:
+                fn = getattr(importlib.import_module(module), attr)
+                _LOADED[name] = fn
+    return fn
+
+
+def preload(*names: str):
+    """Importa en segundo plano (p. ej. tras mostrar el saludo)."""
+    def _run():
+        for n in names or tuple(ENTRIES):
+            try:
+                load(n)
+            except Exception as e:
+                print(f"⚠️ No se pudo precargar {n}: {e}")
+    threading.Thread(target=_run, name="games-preload", daemon=True).start()
@@ -1,3 +1,9 @@
-from .dialog import open_ruleta_dialog
-
 __all__ = ["open_ruleta_dialog"]
+
+
+def __getattr__(name):
+    # el diálogo (Flet) se importa solo si se pide; simulate/scoring funcionan sin él
+    if name == "open_ruleta_dialog":
+        from .dialog import open_ruleta_dialog
+        return open_ruleta_dialog
+    raise AttributeError(name)
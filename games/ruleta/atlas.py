@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# games/ruleta/atlas.py
+# Atlas de glifos rotados para las etiquetas de la ruleta
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    from .config import ATLAS_ANGLE_STEP, ATLAS_BUDGET_MB
+except Exception:
+    ATLAS_ANGLE_STEP = 1.0   # grados
+    ATLAS_BUDGET_MB = 48
+
+STROKE_FILL = (0, 0, 0, 220)
+
+Tile = Tuple[Image.Image, int, int]   # imagen recortada + desplazamiento desde el centro
+
+
+def _font_id(font) -> Tuple[str, int]:
+    return (getattr(font, "path", None) or str(id(font)), int(getattr(font, "size", 0)))
+
+
+class GlyphAtlas:
+    """
+    Cada (carácter, fuente, tamaño, trazo) se dibuja UNA vez; cada giro,
+    cuantizado a `angle_step` grados, se rota UNA vez. Las teselas se guardan
+    recortadas a su alfa, con el desplazamiento respecto al punto de anclaje,
+    en un LRU limitado por bytes (`budget_mb`).
+    """
+
+    def __init__(self, angle_step: float = ATLAS_ANGLE_STEP, budget_mb: float = ATLAS_BUDGET_MB):
+        self.angle_step = float(angle_step)
+        self.budget = int(budget_mb * 1024 * 1024)
+        self._widths: Dict[tuple, Tuple[int, int]] = {}
+        self._glyphs: Dict[tuple, Image.Image] = {}
+        self._rotated: "OrderedDict[tuple, Tile]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    # ---------- medidas ----------
+    def size(self, ch: str, font: ImageFont.FreeTypeFont) -> Tuple[int, int]:
+        """Ancho/alto de UNA línea (igual que draw.textbbox con anchor 'lt')."""
+        key = (_font_id(font), ch)
+        wh = self._widths.get(key)
+        if wh is None:
+            b = font.getbbox(ch, anchor="lt")
+            wh = self._widths[key] = (int(b[2] - b[0]), int(b[3] - b[1]))
+        return wh
+
+    # ---------- glifos ----------
+    def _glyph(self, ch: str, font, stroke: int, pad: int, min_side: int) -> Image.Image:
+        key = (_font_id(font), ch, stroke, pad, min_side)
+        g = self._glyphs.get(key)
+        if g is None:
+            ch_w, ch_h = self.size(ch, font)
+            cw = max(min_side, int(ch_w + pad))
+            chh = max(min_side, int(ch_h + pad))
+            g = Image.new("RGBA", (cw, chh), (0, 0, 0, 0))
+            ImageDraw.Draw(g).text(
+                (cw // 2, chh // 2), ch, font=font, fill="white", anchor="mm",
+                stroke_width=stroke, stroke_fill=STROKE_FILL,
+            )
+            self._glyphs[key] = g
+        return g
+
+    def quantize(self, deg: float) -> float:
+        if self.angle_step <= 0:
+            return deg
+        return (round(deg / self.angle_step) * self.angle_step) % 360.0
+
+    def rotated(self, ch: str, font, rot_deg: float, stroke: int, pad: int, min_side: int) -> Tile:
+        rot = self.quantize(rot_deg)
+        key = (_font_id(font), ch, stroke, pad, min_side, rot)
+        with self._lock:
+            tile = self._rotated.get(key)
+            if tile is not None:
+                self._rotated.move_to_end(key)
+                self.hits += 1
+                return tile
+        g = self._glyph(ch, font, stroke, pad, min_side)
+        img = g.rotate(rot, expand=True, resample=Image.BICUBIC)
+        box = img.getchannel("A").getbbox() or (0, 0, 1, 1)
+        tile = (img.crop(box), box[0] - img.width // 2, box[1] - img.height // 2)
+        with self._lock:
+            self.misses += 1
+            if key not in self._rotated:
+                self._rotated[key] = tile
+                self._bytes += tile[0].width * tile[0].height * 4
+                while self._bytes > self.budget and len(self._rotated) > 1:
+                    _, (old, _, _) = self._rotated.popitem(last=False)
+                    self._bytes -= old.width * old.height * 4
+        return tile
+
+    def paste(self, base_img: Image.Image, ch: str, font, center: Tuple[int, int],
+              rot_deg: float, stroke: int, pad: int, min_side: int):
+        img, dx, dy = self.rotated(ch, font, rot_deg, stroke, pad, min_side)
+        base_img.alpha_composite(img, (int(center[0] + dx), int(center[1] + dy)))
+
+    def clear(self):
+        with self._lock:
+            self._widths.clear()
+            self._glyphs.clear()
+            self._rotated.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {"glyphs": len(self._glyphs), "rotated": len(self._rotated),
+                "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+ATLAS = GlyphAtlas()
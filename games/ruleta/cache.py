@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# games/ruleta/cache.py
+# Caché de ruedas renderizadas: memoria (LRU) + disco, direccionada por contenido
+# + publicación como estático en assets/ (el cliente la descarga una vez por URL)
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from .config import PALETTE, SEGMENTS, WHEEL_SIZE, TEXT_STYLE, FONT_NAME
+
+try:
+    from .config import WHEEL_FORMAT, WHEEL_DENSITY
+except Exception:
+    WHEEL_FORMAT, WHEEL_DENSITY = "png", 1
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parents[1]
+CACHE_DIR = ROOT / "data" / "cache" / "ruleta"
+FONTS_DIR = ROOT / "assets" / "fonts"
+ASSETS_DIR = ROOT / "assets"          # el mismo assets_dir que recibe ft.app()
+ASSET_SUBDIR = "wheels"
+MEM_ITEMS = 8          # ruedas en memoria (base64 ≈ 200-300 KB cada una)
+DISK_ITEMS = 64        # PNG en disco antes de podar los más antiguos
+
+# formato -> opciones de PIL.Image.save (se codifica una vez por rueda publicada)
+ASSET_FORMATS = {
+    "png":  {"format": "PNG", "optimize": True},
+    "webp": {"format": "WEBP", "lossless": True, "method": 4},   # ≈ 55% del PNG
+}
+
+# si cambian estos ficheros, cambian todas las claves (nada que invalidar a mano)
+_SOURCES = (HERE / "config.py", HERE / "draw.py", HERE / "atlas.py", HERE / "fonts.py")
+
+
+def _sources_digest() -> str:
+    h = hashlib.sha256()
+    for p in _SOURCES:
+        try:
+            h.update(p.read_bytes())
+        except OSError:
+            h.update(p.name.encode("utf-8"))
+    # fuentes disponibles: añadir/quitar un .ttf puede cambiar la que se resuelve
+    try:
+        for f in sorted(FONTS_DIR.iterdir()):
+            st = f.stat()
+            h.update(f"{f.name}:{st.st_size}:{int(st.st_mtime)}".encode("utf-8"))
+    except OSError:
+        pass
+    return h.hexdigest()
+
+
+# los fuentes no cambian sin reimportar el módulo: se leen una vez al importar
+_SOURCES_DIGEST = _sources_digest()
+
+
+def wheel_key(segments: Sequence[str], size: int = WHEEL_SIZE, density: int = 1) -> str:
+    """Hash de todo lo que decide los píxeles de la rueda."""
+    src = json.dumps({
+        "segments": list(segments),
+        "palette": list(PALETTE),
+        "size": int(size),
+        "density": int(density),
+        "text_style": TEXT_STYLE,
+        "font": FONT_NAME,
+        "sources": _SOURCES_DIGEST,
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(src.encode("utf-8")).hexdigest()[:32]
+
+
+class WheelCache:
+    """
+    get() devuelve el PNG en base64:
+      memoria (LRU) -> disco (data/cache/ruleta/<clave>.png) -> render
+    La clave incluye el contenido de config.py/draw.py, así que editar la
+    configuración genera claves nuevas y las viejas se podan solas.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, mem_items: int = MEM_ITEMS,
+                 disk_items: int = DISK_ITEMS, assets_dir: Path = ASSETS_DIR / ASSET_SUBDIR):
+        self.dir = Path(directory)
+        self.assets_dir = Path(assets_dir)
+        self.mem_items = mem_items
+        self.disk_items = disk_items
+        self._mem: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._render_locks: dict = {}
+        self.hits = self.disk_hits = self.misses = 0
+
+    def _remember(self, key: str, b64: str):
+        with self._lock:
+            self._mem[key] = b64
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.mem_items:
+                self._mem.popitem(last=False)
+
+    def _from_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            b64 = self._mem.get(key)
+            if b64 is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+            return b64
+
+    def _from_disk(self, key: str) -> Optional[str]:
+        try:
+            data = (self.dir / f"{key}.png").read_bytes()
+        except OSError:
+            return None
+        self.disk_hits += 1
+        return base64.b64encode(data).decode("ascii")
+
+    def _store(self, key: str, b64: str):
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.dir / f"{key}.png.tmp"
+            tmp.write_bytes(base64.b64decode(b64))
+            os.replace(tmp, self.dir / f"{key}.png")
+            self._prune()
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la rueda en caché: {e}")
+
+    def _prune(self):
+        files = sorted(self.dir.glob("*.png"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for p in files[self.disk_items:]:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+    def get(self, segments: Sequence[str], size: int = WHEEL_SIZE, density: int = 1) -> str:
+        key = wheel_key(segments, size, density)
+        b64 = self._from_memory(key)
+        if b64 is not None:
+            return b64
+        # un solo render por clave aunque pidan la misma rueda a la vez
+        with self._lock:
+            lock = self._render_locks.setdefault(key, threading.Lock())
+        with lock:
+            b64 = self._from_memory(key) or self._from_disk(key)
+            if b64 is None:
+                from .draw import make_wheel_base64   # PIL solo si hay que dibujar
+                self.misses += 1
+                b64 = make_wheel_base64(list(segments), size, density=int(density))
+                self._store(key, b64)
+            self._remember(key, b64)
+        with self._lock:
+            self._render_locks.pop(key, None)
+        return b64
+
+    # ---------- estáticos en assets/ ----------
+    def publish(self, segments: Sequence[str], size: int = WHEEL_SIZE,
+                fmt: str = WHEEL_FORMAT, density: int = WHEEL_DENSITY) -> str:
+        """
+        Escribe la rueda en assets/wheels/ruleta-<hash>[@2x].<fmt> (si no está)
+        y devuelve su URL para ft.Image(src=...). `density=2` la dibuja al
+        doble de resolución (mismas proporciones de texto y trazos) para
+        pantallas HiDPI; se muestra igualmente a `size` px.
+        """
+        opts = ASSET_FORMATS[fmt]
+        suffix = f"@{int(density)}x" if density != 1 else ""
+        name = f"ruleta-{wheel_key(segments, size, density)[:20]}{suffix}.{fmt}"
+        url = f"/{ASSET_SUBDIR}/{name}"
+        target = self.assets_dir / name
+        if target.exists():
+            return url
+        with self._lock:
+            lock = self._render_locks.setdefault(name, threading.Lock())
+        with lock:
+            if not target.exists():
+                import io
+                from PIL import Image
+                img = Image.open(io.BytesIO(base64.b64decode(self.get(segments, size, density))))
+                self.assets_dir.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(target.name + ".tmp")
+                with open(tmp, "wb") as f:
+                    img.save(f, **opts)
+                os.replace(tmp, target)
+                self._prune_assets()
+        with self._lock:
+            self._render_locks.pop(name, None)
+        return url
+
+    def _prune_assets(self):
+        files = sorted(self.assets_dir.glob("ruleta-*"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for p in files[self.disk_items:]:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+    def image_source(self, segments: Sequence[str], size: int = WHEEL_SIZE) -> dict:
+        """kwargs para ft.Image: {"src": url} o, si no se puede publicar, {"src_base64": ...}."""
+        try:
+            return {"src": self.publish(segments, size)}
+        except Exception as e:
+            print(f"⚠️ No se pudo publicar la rueda en assets/, se envía en base64: {e}")
+            return {"src_base64": self.get(segments, size)}
+
+    def clear(self, disk: bool = False):
+        with self._lock:
+            self._mem.clear()
+        if disk:
+            for p in self.dir.glob("*.png"):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        return {"memory": len(self._mem), "hits": self.hits,
+                "disk_hits": self.disk_hits, "misses": self.misses}
+
+
+WHEELS = WheelCache()
+
+
+def get_wheel_base64(segments: Sequence[str], size: int = WHEEL_SIZE) -> str:
+    return WHEELS.get(segments, size)
+
+
+def wheel_image_source(segments: Sequence[str], size: int = WHEEL_SIZE) -> dict:
+    return WHEELS.image_source(segments, size)
+
+
+def warm(wheels: Optional[List[Sequence[str]]] = None, size: int = WHEEL_SIZE) -> threading.Thread:
+    """Publica (o encuentra ya publicadas) las ruedas en segundo plano al arrancar."""
+    def _run():
+        for segs in wheels or [SEGMENTS]:
+            try:
+                WHEELS.publish(segs, size)
+            except Exception as e:
+                print(f"⚠️ No se pudo precalentar la ruleta: {e}")
+    t = threading.Thread(target=_run, name="ruleta-warm", daemon=True)
+    t.start()
+    return t
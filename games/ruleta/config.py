@@ -2,8 +2,10 @@
 # games/ruleta/config.py
 # -*- coding: utf-8 -*-
 
-FONT_NAME = "assets/fonts/DejaVuSans-Bold.ttf"
+FONT_NAME = "assets/fonts/arialbd.ttf"   # si falta: resto de assets/fonts, Pillow, sistema
 WHEEL_SIZE = 560       # o 600 para más grande
+WHEEL_FORMAT = "webp"  # estático servido desde assets/wheels: "webp" (sin pérdida) | "png"
+WHEEL_DENSITY = 2      # 2 = variante @2x para pantallas HiDPI (se muestra a WHEEL_SIZE)
 
 
 PRIMARY = "#4F46E5"
@@ -12,7 +14,8 @@ BORDER  = "#E5E7EB"
 POINTER_SIZE = 52       # ▲ tamaño de la flecha (ajústalo si quieres)
 ANIMATION_MS = 2500
 
-SCALE = 3
+SCALE = 3               # solo para RENDERER = "pil"
+RENDERER = "numpy"      # "numpy" (tamaño final) | "pil" (referencia ×SCALE + LANCZOS)
 
 # Anillo donde va el texto (entre el 40% y 92% del radio)
 INNER_RATIO = 0.40
@@ -25,6 +28,10 @@ MIN_FONT_SIZE  = 18
 # Estilo de texto
 TEXT_STYLE = "tangent"   # "tangent" (a lo largo del arco) | "radial"
 
+# Atlas de glifos: giro cuantizado (grados, 0 = exacto) y memoria máxima
+ATLAS_ANGLE_STEP = 1.0
+ATLAS_BUDGET_MB = 48
+
 
 
 
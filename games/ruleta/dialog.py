@@ -1,26 +1,27 @@
 # -*- coding: utf-8 -*-
-import math, random, asyncio
+import asyncio
 import flet as ft
 from .config import (
     PRIMARY, BORDER, WHEEL_SIZE, POINTER_SIZE, ANIMATION_MS,
     SEGMENTS,
 )
-from .draw import make_wheel_base64
 from .questions import get_question
+from .scoring import spin_target, score_tally
+from ui.batching import UpdateBatcher
 
 def open_ruleta_dialog(page: ft.Page, on_finish, spins_range=(5, 8)):
     """
     Muestra la ruleta animada y hace 1 pregunta por giro.
     on_finish recibe: {"game":"ruleta","area":..., "score":0..100, "why":...}
     """
+    from .cache import wheel_image_source  # URL en assets/ (o base64 si no se pudo escribir)
+    ui = UpdateBatcher.for_page(page)      # agrupa los update() de cada acción
     segments = SEGMENTS[:]                 # copia
     n = len(segments)
-    slice_angle = 2 * math.pi / n
-    BASE_OFFSET = -math.pi/2 + slice_angle/2  # sector 0 centrado bajo la flecha
 
     state = {"busy": False, "rounds": 0, "tally": {a: 0.0 for a in segments}}
 
-    wheel = ft.Image(src_base64=make_wheel_base64(segments), width=WHEEL_SIZE, height=WHEEL_SIZE)
+    wheel = ft.Image(**wheel_image_source(segments), width=WHEEL_SIZE, height=WHEEL_SIZE)
     wheel.rotate = ft.Rotate(angle=0.0, alignment=ft.alignment.center)
     wheel.animate_rotation = ft.Animation(ANIMATION_MS, ft.AnimationCurve.DECELERATE)
 
@@ -78,14 +79,14 @@ def open_ruleta_dialog(page: ft.Page, on_finish, spins_range=(5, 8)):
         except Exception:
             page.dialog = dlg
             dlg.open = True
-            page.update()
+            ui.update()
 
     def close_dialog(_=None):
         try:
             page.close(dlg)
         except Exception:
             dlg.open = False
-            page.update()
+            ui.update()
 
     # --- preguntas ---
     def render_question(area: str):
@@ -99,7 +100,7 @@ def open_ruleta_dialog(page: ft.Page, on_finish, spins_range=(5, 8)):
             state["rounds"] += 1
             lbl_rounds.value = f"Rondas respondidas: {state['rounds']}"
             btn_spin.disabled = False
-            panel.update()
+            ui.update()
 
         for label, w in opts:
             opts_col.controls.append(
@@ -117,42 +118,32 @@ def open_ruleta_dialog(page: ft.Page, on_finish, spins_range=(5, 8)):
         if state["busy"]:
             return
         state["busy"] = True
-        btn_spin.disabled = True
-        panel.update()
 
-        idx = random.randrange(n)  # sector ganador
-        full_turns = random.randint(*spins_range)
-        final_angle = full_turns * 2 * math.pi + BASE_OFFSET + idx * slice_angle
+        idx, final_angle = spin_target(n, spins_range)  # sector ganador + ángulo final
 
-        wheel.rotate = ft.Rotate(angle=final_angle, alignment=ft.alignment.center)
-        page.update()
+        # botón deshabilitado + giro en un solo envío
+        with ui.batch():
+            btn_spin.disabled = True
+            wheel.rotate = ft.Rotate(angle=final_angle, alignment=ft.alignment.center)
+            ui.update()
         await asyncio.sleep((wheel.animate_rotation.duration + 200) / 1000)
 
-        winner = segments[idx]
-        lbl_winner.value = f"Ganó: {winner} 🎯"
-        render_question(winner)
-
-        state["busy"] = False
-        panel.update()
+        with ui.batch():
+            winner = segments[idx]
+            lbl_winner.value = f"Ganó: {winner} 🎯"
+            render_question(winner)
+            state["busy"] = False
+            ui.update()
 
     # --- cerrar + enviar ---
     def finalize_and_send(_):
-        r = state["rounds"]
-        if r <= 0:
-            close_dialog()
-            on_finish({"game":"ruleta","area":"Sin datos","score":0,"why":"No se respondieron rondas."})
-            return
-        ranked = sorted(state["tally"].items(), key=lambda kv: kv[1], reverse=True)
-        best_area, best = ranked[0]
-        score = int((best / r) * 100)
-        top3 = ", ".join([f"{a}:{v:.1f}" for a, v in ranked[:3]])
+        with ui.batch():
+            _finalize_and_send()
+
+    def _finalize_and_send():
+        result = score_tally(state["tally"], state["rounds"])
         close_dialog()
-        on_finish({
-            "game":"ruleta",
-            "area":best_area,
-            "score":score,
-            "why": f"Afinidad acumulada → {top3} (de {r} rondas). Rueda procedural"
-        })
+        on_finish(result)
 
     # wire-up
     btn_spin.on_click  = lambda e: page.run_task(spin_task)
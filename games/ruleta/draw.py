@@ -3,36 +3,17 @@
 import io, base64, math
 from typing import Tuple, List
 from PIL import Image, ImageDraw, ImageFont
-from pathlib import Path
-import os
-from pathlib import Path
-from PIL import ImageFont, __file__ as PIL_FILE
-
-def _font(size: int) -> ImageFont.FreeTypeFont:
-    size = int(size)
-    here = Path(__file__).resolve()
-    project_root = here.parents[2]
-
-    candidates = [
-        project_root / "assets" / "fonts" / "Arial-Bold.ttf",          # 👈 tu copia
-        project_root / "assets" / "fonts" / "DejaVuSans-Bold.ttf",     # 👈 si usaste la de Pillow
-        r"C:\Windows\Fonts\arialbd.ttf",                               # Windows
-        (Path(PIL_FILE).parent / "fonts" / "DejaVuSans-Bold.ttf"),     # fallback Pillow
-    ]
-
-    for c in candidates:
-        try:
-            return ImageFont.truetype(str(c), size)
-        except Exception:
-            pass
-
-    return ImageFont.load_default()   # si llega aquí verás “puntitos”
+from PIL import ImageColor
+from collections import OrderedDict
+import numpy as np
+from .atlas import ATLAS
+from .fonts import get_font as _font   # ruta resuelta una vez + LRU por tamaño
 
 # ---------------------------------------------
 # Config (usa lo que haya en config; si falta, fallback)
 # ---------------------------------------------
 try:
-    from .config import WHEEL_SIZE, PALETTE, FONT_NAME, BASE_FONT_SIZE, MIN_FONT_SIZE
+    from .config import WHEEL_SIZE, PALETTE, BASE_FONT_SIZE, MIN_FONT_SIZE
 except Exception:
     WHEEL_SIZE = 560
     PALETTE = [
@@ -40,7 +21,6 @@ except Exception:
         "#27ae60", "#3498db", "#e74c3c", "#95a5a6",
         "#8e44ad", "#16a085"
     ]
-    FONT_NAME = "DejaVuSans-Bold.ttf"   # si no existe, caemos a fallback
     BASE_FONT_SIZE = 44
     MIN_FONT_SIZE  = 18
 
@@ -56,19 +36,16 @@ OUTER_RATIO = 0.92
 # Estilo: "tangent" (curvado a lo largo del arco) | "radial"
 TEXT_STYLE = "tangent"
 
+# "numpy" (tamaño final, antialias analítico) | "pil" (×SCALE + LANCZOS)
+try:
+    from .config import RENDERER
+except Exception:
+    RENDERER = "numpy"
+
 
 # ---------------------------------------------
 # Utilidades
 # ---------------------------------------------
-def _font(size: int) -> ImageFont.FreeTypeFont:
-    try:
-        return ImageFont.truetype(FONT_NAME, int(size))
-    except Exception:
-        try:
-            return ImageFont.truetype("DejaVuSans-Bold.ttf", int(size))
-        except Exception:
-            return ImageFont.load_default()
-
 def _text_size(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFont) -> Tuple[int, int]:
     # tamaño de UNA línea
     b = draw.textbbox((0, 0), text, font=font, anchor="lt")
@@ -83,10 +60,69 @@ def _render_label_tangent(base_img: Image.Image,
                           center: Tuple[int, int],
                           mid_deg: float,
                           r: int,
-                          slice_deg: float):
+                          slice_deg: float,
+                          scale: float = SCALE):
     """
     Dibuja la etiqueta siguiendo el arco del sector (tangente),
     centrada en el sector y siempre legible (nunca cabeza abajo).
+    Los glifos (ya rotados) salen del atlas: se dibujan una vez por ángulo.
+    """
+    cx, cy = center
+
+    # radio donde apoyamos el texto (centro del anillo, sesgo leve hacia fuera)
+    base_ratio = (INNER_RATIO * 0.45 + OUTER_RATIO * 0.55)
+    radius = float(base_ratio * r)
+
+    font = _font(int(BASE_FONT_SIZE * scale))
+    stroke = int(5 * scale)
+    pad = int(12 * scale)
+    min_side = int(8 * scale)
+
+    # construir lista de (char, ancho_px)
+    chars: List[Tuple[str, int]] = []
+    space_w = ATLAS.size(" ", font)[0]
+    for ch in label:
+        if ch == "\n":
+            w = int(space_w * 1.2)
+        else:
+            w = ATLAS.size(ch, font)[0]
+        w += int(1.2 * scale)  # pequeña separación extra
+        chars.append((ch, w))
+
+    total_theta = sum(w for _, w in chars) / radius  # radianes
+    mid_rad = math.radians(mid_deg)
+
+    # si estaría al revés, invertimos el orden para escribir “desde el otro lado”
+    flip = 90.0 < ((math.degrees(mid_rad) + 90.0) % 360.0) < 270.0
+    if flip:
+        chars = list(reversed(chars))
+
+    start_angle = mid_rad - (total_theta / 2.0)
+    acc = 0.0
+    for ch, w in chars:
+        ang = start_angle + (acc + w / 2.0) / radius
+        acc += w
+        px = int(cx + radius * math.cos(ang))
+        py = int(cy - radius * math.sin(ang))
+        rot = math.degrees(ang) + 90.0
+        if flip:
+            rot -= 180.0  # enderezar
+        ATLAS.paste(base_img, ch, font, (px, py), rot, stroke, pad, min_side)
+
+
+# ---------------------------------------------
+# Texto tangente: render de referencia (sin atlas)
+# ---------------------------------------------
+def _render_label_tangent_reference(base_img: Image.Image,
+                          label: str,
+                          center: Tuple[int, int],
+                          mid_deg: float,
+                          r: int,
+                          slice_deg: float,
+                          scale: float = SCALE):
+    """
+    Versión original (un lienzo + rotate por carácter). Se conserva como
+    referencia para comparar píxeles con la del atlas.
     """
     cx, cy = center
 
@@ -95,7 +131,7 @@ def _render_label_tangent(base_img: Image.Image,
     radius = float(base_ratio * r)
 
     # fuente grande para empezar
-    font = _font(int(BASE_FONT_SIZE * SCALE))
+    font = _font(int(BASE_FONT_SIZE * scale))
 
     # lienzo para medir
     probe = Image.new("RGBA", (int(2*radius)+200, int(2*radius)+200), (0, 0, 0, 0))
@@ -109,7 +145,7 @@ def _render_label_tangent(base_img: Image.Image,
             w = int(space_w * 1.2)
         else:
             w = _text_size(d, ch, font)[0]
-        w += int(1.2 * SCALE)  # pequeña separación extra
+        w += int(1.2 * scale)  # pequeña separación extra
         chars.append((ch, w))
 
     # longitud total del texto en píxeles y en radianes sobre este radio
@@ -145,8 +181,8 @@ def _render_label_tangent(base_img: Image.Image,
 
         # canvas temporal para el carácter
         ch_w, ch_h = _text_size(d, ch, font)
-        cw = max(int(8 * SCALE), int(ch_w + 12 * SCALE))
-        chh = max(int(8 * SCALE), int(ch_h + 12 * SCALE))
+        cw = max(int(8 * scale), int(ch_w + 12 * scale))
+        chh = max(int(8 * scale), int(ch_h + 12 * scale))
 
         tmp = Image.new("RGBA", (cw, chh), (0, 0, 0, 0))
         td = ImageDraw.Draw(tmp)
@@ -156,7 +192,7 @@ def _render_label_tangent(base_img: Image.Image,
             font=font,
             fill="white",
             anchor="mm",
-            stroke_width=int(5 * SCALE),
+            stroke_width=int(5 * scale),
             stroke_fill=(0, 0, 0, 220),
         )
         tmp = tmp.rotate(rot, expand=True, resample=Image.BICUBIC)
@@ -172,7 +208,8 @@ def _render_label_radial(base_img: Image.Image,
                          center: Tuple[int, int],
                          mid_deg: float,
                          r: int,
-                         slice_deg: float):
+                         slice_deg: float,
+                         scale: float = SCALE):
     cx, cy = center
     mid_rad = math.radians(mid_deg)
 
@@ -185,15 +222,15 @@ def _render_label_radial(base_img: Image.Image,
     max_h = int(arc_span * 0.92)    # alto a lo largo del arco
 
     # fuente grande
-    font = _font(int(BASE_FONT_SIZE * SCALE))
+    font = _font(int(BASE_FONT_SIZE * scale))
     # medir “label” en una fila (si no encaja, el texto quedará más pequeño)
     probe = Image.new("RGBA", (int(2*mid_radius)+200, int(2*mid_radius)+200), (0, 0, 0, 0))
     d = ImageDraw.Draw(probe)
     tw, th = _text_size(d, label, font)
 
     # lienzo del bloque
-    bw = max(int(tw + 24 * SCALE), 12)
-    bh = max(int(th + 24 * SCALE), 12)
+    bw = max(int(tw + 24 * scale), 12)
+    bh = max(int(th + 24 * scale), 12)
     block = Image.new("RGBA", (bw, bh), (0, 0, 0, 0))
     bd = ImageDraw.Draw(block)
     bd.text(
@@ -202,7 +239,7 @@ def _render_label_radial(base_img: Image.Image,
         fill="white",
         font=font,
         anchor="mm",
-        stroke_width=int(5 * SCALE),
+        stroke_width=int(5 * scale),
         stroke_fill=(0, 0, 0, 220),
     )
 
@@ -222,12 +259,149 @@ def _render_label_radial(base_img: Image.Image,
     base_img.alpha_composite(block, (px, py))
 
 
+# ---------------------------------------------
+# Rasterizado NumPy (tamaño final, antialias analítico)
+# ---------------------------------------------
+# anchos en píxeles finales a densidad 1 (equivalen a los width=k*SCALE del render PIL)
+SEP_WIDTH = 3.0      # separadores blancos entre sectores
+RING_WIDTH = 6.0     # aro exterior
+HUB_RATIO = 0.10
+HUB_OUTLINE = 3.0
+HUB_OUTLINE_RGB = (229, 231, 235)   # #e5e7eb
+_FIELDS_MAX = 4
+
+_FIELDS: "OrderedDict[Tuple[int, float], dict]" = OrderedDict()
+
+
+def _rgb(color: str) -> Tuple[int, int, int]:
+    return ImageColor.getrgb(color)[:3]
+
+
+def _cov(x: np.ndarray) -> np.ndarray:
+    """Cobertura de un borde a distancia con signo `x` (px) del centro del píxel."""
+    return np.clip(x + 0.5, 0.0, 1.0)
+
+
+def _fields(size: int, density: float = 1) -> dict:
+    """
+    Campos por tamaño en píxeles y densidad (se calculan una vez): radio y ángulo
+    de cada píxel, alfa del disco y la capa fija de aro + centro.
+    """
+    key = (size, density)
+    f = _FIELDS.get(key)
+    if f is not None:
+        _FIELDS.move_to_end(key)
+        return f
+    c = size / 2.0
+    axis = np.arange(size, dtype=np.float32) + 0.5 - c
+    dx, dy = axis[None, :], axis[:, None]          # y hacia abajo, como PIL
+    rho = np.hypot(dx, dy)
+    # grados en sentido horario desde las 3 en punto (mismo criterio que pieslice)
+    theta = np.degrees(np.arctan2(dy, dx)) % 360.0
+
+    disc = _cov(c - rho)
+    hub_r = c * HUB_RATIO
+    hub = _cov(hub_r - rho)
+    ring = _cov(rho - (c - RING_WIDTH * density)) * (hub == 0) * (disc > 0)
+    outline = _cov(rho - (hub_r - HUB_OUTLINE * density))[..., None]
+    hub_rgb = 255.0 * (1.0 - outline) + np.asarray(HUB_OUTLINE_RGB, np.float32) * outline
+    over = np.empty((size, size, 4), np.uint8)
+    over[..., :3] = np.where(ring[..., None] > 0, 255.0, hub_rgb).astype(np.uint8)
+    over[..., 3] = (np.maximum(ring, hub) * 255.0 + 0.5).astype(np.uint8)
+
+    f = {
+        "rho": rho,
+        "theta": theta,
+        "outside": disc == 0,
+        "disc": Image.fromarray((disc * 255.0 + 0.5).astype(np.uint8), "L"),
+        "overlay": Image.fromarray(over, "RGBA"),
+    }
+    _FIELDS[key] = f
+    while len(_FIELDS) > _FIELDS_MAX:
+        _FIELDS.popitem(last=False)
+    return f
+
+
+def _sectors_numpy(n: int, size: int, density: float = 1) -> Image.Image:
+    """Sectores (color por porción + separadores blancos) sin supersampling."""
+    f = _fields(size, density)
+    half = SEP_WIDTH * density / 2.0
+    rho, theta = f["rho"], f["theta"]
+    slice_deg = np.float32(360.0 / n)
+    k = (theta / slice_deg).astype(np.intp)
+    np.minimum(k, n - 1, out=k)
+    palette = np.asarray([_rgb(PALETTE[i % len(PALETTE)]) for i in range(n)], np.uint8)
+
+    out = np.empty((size, size, 4), np.uint8)
+    out[..., :3] = palette[k]
+    out[..., 3] = 255
+
+    # separadores: solo los píxeles cerca de un borde (sin(x) ≥ 2x/π acota la distancia)
+    rel = theta - k.astype(np.float32) * slice_deg
+    gap = np.minimum(rel, slice_deg - rel)
+    near = rho * gap < (half + 0.5) * 90.0
+    if near.any():
+        g = np.radians(np.minimum(gap[near], 90.0))
+        white = _cov(half - rho[near] * np.sin(g))[:, None]
+        rgb = out[near, :3] * (1.0 - white) + 255.0 * white
+        out[near, :3] = (rgb + 0.5).astype(np.uint8)
+    out[f["outside"]] = 0            # fuera del disco: transparente (como el render PIL)
+    return Image.fromarray(out, "RGBA")
+
+
+def _make_wheel_numpy(segments: List[str], size: int, density: float = 1) -> Image.Image:
+    """`size` en píxeles finales; texto y trazos a escala `density`."""
+    n = len(segments)
+    f = _fields(size, density)
+    img = _sectors_numpy(n, size, density)
+
+    # etiquetas a escala `density` (mismo criterio de ángulos que el render PIL)
+    r = size // 2
+    slice_deg = 360.0 / n
+    label = _render_label_tangent if TEXT_STYLE == "tangent" else _render_label_radial
+    for i, text in enumerate(segments):
+        label(img, text, (r, r), (i + 0.5) * slice_deg, r, slice_deg, scale=density)
+
+    img.alpha_composite(f["overlay"])     # aro y centro
+    img.putalpha(f["disc"])               # borde del disco antialiasado
+    return img
+
+
 # ---------------------------------------------
 # Construcción de la ruleta
 # ---------------------------------------------
-def make_wheel_base64(segments: List[str], size: int = WHEEL_SIZE) -> str:
+def make_wheel_base64(segments: List[str], size: int = WHEEL_SIZE, reference: bool = False,
+                      density: float = 1) -> str:
+    """
+    PNG en base64. Por defecto rasteriza con NumPy al tamaño final;
+    `reference=True` usa el render original (PIL ×SCALE + LANCZOS, sin atlas).
+    """
+    return encode_png_base64(render_wheel(segments, size, reference, density))
+
+
+def render_wheel(segments: List[str], size: int = WHEEL_SIZE, reference: bool = False,
+                 density: float = 1) -> Image.Image:
+    """
+    La rueda como imagen RGBA (sin codificar) de size×density píxeles.
+    `density` solo cambia la resolución: fuente, trazos y márgenes se escalan con ella.
+    """
     n = len(segments)
     assert n >= 3, "Se requieren al menos 3 segmentos"
+    px = int(int(size) * density)
+    if reference or RENDERER == "pil":
+        return _make_wheel_pil(segments, px, reference, density)
+    return _make_wheel_numpy(segments, px, density)
+
+
+def encode_png_base64(img: Image.Image) -> str:
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def _make_wheel_pil(segments: List[str], size: int, reference: bool, density: float = 1) -> Image.Image:
+    n = len(segments)
+    k = SCALE * density        # factor de trazos/texto sobre el lienzo ×SCALE
 
     SIZE = int(size * SCALE)
     r = SIZE // 2
@@ -237,7 +411,8 @@ def make_wheel_base64(segments: List[str], size: int = WHEEL_SIZE) -> str:
 
     # sombra suave
     shadow = Image.new("RGBA", (SIZE, SIZE), (0, 0, 0, 0))
-    ImageDraw.Draw(shadow).ellipse((10, 10, SIZE-10, SIZE-10), fill=(0, 0, 0, 40))
+    m = int(10 * density)
+    ImageDraw.Draw(shadow).ellipse((m, m, SIZE-m, SIZE-m), fill=(0, 0, 0, 40))
     img.alpha_composite(shadow, (0, 0))
 
     # fondo
@@ -251,12 +426,12 @@ def make_wheel_base64(segments: List[str], size: int = WHEEL_SIZE) -> str:
         start = i * slice_deg
         end   = (i + 1) * slice_deg
         color = PALETTE[i % len(PALETTE)]
-        d.pieslice(bbox, start, end, fill=color, outline="white", width=int(3 * SCALE))
+        d.pieslice(bbox, start, end, fill=color, outline="white", width=int(3 * k))
 
         a = math.radians(start)
         x = int(r + r * math.cos(a))
         y = int(r - r * math.sin(a))
-        d.line((r, r, x, y), fill=(255, 255, 255, 255), width=int(2 * SCALE))
+        d.line((r, r, x, y), fill=(255, 255, 255, 255), width=int(2 * k))
 
     # etiquetas
     center = (r, r)
@@ -266,18 +441,16 @@ def make_wheel_base64(segments: List[str], size: int = WHEEL_SIZE) -> str:
         mid_deg = (start + end) / 2.0
 
         if TEXT_STYLE == "tangent":
-            _render_label_tangent(img, label, center, mid_deg, r, slice_deg)
+            tangent = _render_label_tangent_reference if reference else _render_label_tangent
+            tangent(img, label, center, mid_deg, r, slice_deg, scale=k)
         else:
-            _render_label_radial(img, label, center, mid_deg, r, slice_deg)
+            _render_label_radial(img, label, center, mid_deg, r, slice_deg, scale=k)
 
     # aro y centro
-    d.ellipse(bbox, outline="#ffffff", width=int(6 * SCALE))
+    d.ellipse(bbox, outline="#ffffff", width=int(6 * k))
     hub_r = int(r * 0.10)
     d.ellipse((r - hub_r, r - hub_r, r + hub_r, r + hub_r),
-              fill="#ffffff", outline="#e5e7eb", width=int(3 * SCALE))
+              fill="#ffffff", outline="#e5e7eb", width=int(3 * k))
 
     # downscale para nitidez
-    final = img.resize((int(size), int(size)), Image.LANCZOS)
-    buf = io.BytesIO()
-    final.save(buf, format="PNG")
-    return base64.b64encode(buf.getvalue()).decode("ascii")
+    return img.resize((int(size), int(size)), Image.LANCZOS)
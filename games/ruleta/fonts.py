@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# games/ruleta/fonts.py
+# Fuentes de la ruleta: la ruta se resuelve una vez y los FreeTypeFont se reutilizan
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from PIL import ImageFont, __file__ as PIL_FILE
+
+try:
+    from .config import FONT_NAME
+except Exception:
+    FONT_NAME = "assets/fonts/arialbd.ttf"
+
+ROOT = Path(__file__).resolve().parents[2]
+FONTS_DIR = ROOT / "assets" / "fonts"
+PIL_FONTS_DIR = Path(PIL_FILE).parent / "fonts"
+FONT_CACHE_SIZE = 32     # (ruta, tamaño) distintos en memoria
+
+# preferidas dentro de assets/fonts y de las fuentes de Pillow (en este orden)
+_PREFERRED = ("arialbd.ttf", "Arial-Bold.ttf", "DejaVuSans-Bold.ttf")
+# último recurso: nombres que FreeType busca en las carpetas del sistema
+_SYSTEM = ("DejaVuSans-Bold.ttf", r"C:\Windows\Fonts\arialbd.ttf")
+
+_lock = threading.Lock()
+_resolved: List[Optional[str]] = []     # [ruta] una vez resuelta (None = sin TrueType)
+
+
+def _in_dir(folder: Path) -> List[str]:
+    if not folder.is_dir():
+        return []
+    files = sorted(p.name for p in folder.iterdir() if p.suffix.lower() in (".ttf", ".otf"))
+    ordered = [n for n in _PREFERRED if n in files] + [n for n in files if n not in _PREFERRED]
+    return [str(folder / n) for n in ordered]
+
+
+def candidates() -> List[str]:
+    """FONT_NAME, assets/fonts (arialbd.ttf primero), fuentes de Pillow, sistema."""
+    first = Path(FONT_NAME)
+    if not first.is_absolute():
+        first = ROOT / first
+    out = [str(first)] + _in_dir(FONTS_DIR) + _in_dir(PIL_FONTS_DIR) + list(_SYSTEM)
+    return list(dict.fromkeys(out))
+
+
+def font_path() -> Optional[str]:
+    """Primera candidata que FreeType puede abrir (se calcula una sola vez)."""
+    if not _resolved:
+        with _lock:
+            if not _resolved:
+                path = None
+                for c in candidates():
+                    try:
+                        path = ImageFont.truetype(c, 12).path
+                        break
+                    except OSError:
+                        continue
+                if path is None:
+                    print("⚠️ Ruleta: no se encontró ninguna fuente TrueType; "
+                          "se usará la fuente por defecto de Pillow (texto pequeño)")
+                _resolved.append(path)
+    return _resolved[0]
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _load(path: Optional[str], size: int):
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+def get_font(size: int):
+    """FreeTypeFont de la fuente resuelta, compartido por tamaño."""
+    return _load(font_path(), int(size))
+
+
+def reset():
+    """Olvida la ruta resuelta y las fuentes cargadas (p. ej. tras cambiar FONT_NAME)."""
+    with _lock:
+        _resolved.clear()
+        _load.cache_clear()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# games/ruleta/scoring.py
+# Lógica de la ruleta sin Flet: elección del giro y puntaje final (la usan el diálogo y el simulador)
+import math
+import random
+from typing import Dict, Tuple
+
+
+def spin_sector(u, n: int):
+    """
+    Sector que sale para un número uniforme `u` en [0, 1). Acepta un escalar
+    (diálogo) o un array de NumPy (el simulador sortea todos los giros a la vez).
+    """
+    k = u * n
+    if hasattr(k, "astype"):
+        return k.astype("int64").clip(0, n - 1)
+    return min(int(k), n - 1)
+
+
+def spin_target(n: int, spins_range: Tuple[int, int] = (5, 8), rng=random) -> Tuple[int, float]:
+    """
+    Sector ganador (uniforme) y ángulo final de la rueda para que ese sector
+    quede bajo la flecha tras `spins_range` vueltas completas.
+    """
+    slice_angle = 2 * math.pi / n
+    base_offset = -math.pi / 2 + slice_angle / 2   # sector 0 centrado bajo la flecha
+    idx = spin_sector(rng.random(), n)
+    full_turns = rng.randint(*spins_range)
+    return idx, full_turns * 2 * math.pi + base_offset + idx * slice_angle
+
+
+def score_tally(tally: Dict[str, float], rounds: int) -> dict:
+    """Resultado para on_finish a partir de la afinidad acumulada por área."""
+    if rounds <= 0:
+        return {"game": "ruleta", "area": "Sin datos", "score": 0, "why": "No se respondieron rondas."}
+    ranked = sorted(tally.items(), key=lambda kv: kv[1], reverse=True)
+    best_area, best = ranked[0]
+    score = int((best / rounds) * 100)
+    top3 = ", ".join([f"{a}:{v:.1f}" for a, v in ranked[:3]])
+    return {
+        "game": "ruleta",
+        "area": best_area,
+        "score": score,
+        "why": f"Afinidad acumulada → {top3} (de {rounds} rondas). Rueda procedural",
+    }
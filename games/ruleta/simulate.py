@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# games/ruleta/simulate.py
+# Simulador Monte Carlo (sin Flet) del puntaje de la ruleta, vectorizado con NumPy
+# Uso: python -m games.ruleta.simulate --sessions 1000000 --policy uniform --seed 7
+import argparse
+import json
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import SEGMENTS
+from .questions import get_question
+from .scoring import spin_sector
+
+ROUNDS = (3, 8)          # rondas respondidas por sesión (uniforme, ambos incluidos)
+CHUNK = 250_000          # sesiones por bloque (acota la memoria)
+BINS = np.arange(0, 101, 10)
+
+
+# ---------- banco de preguntas como matrices ----------
+def option_table(segments: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (pesos, n_opciones): pesos[s, o] = peso de la opción o en la pregunta del
+    sector s (NaN si no existe), tal como lo devuelve get_question().
+    """
+    opts = [get_question(a)[1] for a in segments]
+    width = max(len(o) for o in opts)
+    weights = np.full((len(segments), width), np.nan)
+    for s, row in enumerate(opts):
+        weights[s, :len(row)] = [float(w) for _, w in row]
+    return weights, np.array([len(o) for o in opts])
+
+
+# ---------- políticas de respuesta ----------
+# política(rng, sector (S×R), pesos, n_opciones, favorita (S,)) -> opción elegida (S×R)
+Policy = Callable[..., np.ndarray]
+
+
+def _uniform(rng, sector, weights, n_opts, favorite):
+    return (rng.random(sector.shape) * n_opts[sector]).astype(np.int64)
+
+
+def _extreme(best: bool):
+    def policy(rng, sector, weights, n_opts, favorite):
+        w = np.where(np.isnan(weights), -np.inf if best else np.inf, weights)
+        pick = np.argmax(w, axis=1) if best else np.argmin(w, axis=1)
+        return pick[sector]
+    return policy
+
+
+def _affinity(p_fav: float = 0.8):
+    """Cada estudiante tiene un área favorita: ahí elige la opción más alta con prob. p_fav."""
+    top = _extreme(True)
+
+    def policy(rng, sector, weights, n_opts, favorite):
+        pick = _uniform(rng, sector, weights, n_opts, favorite)
+        fav = (sector == favorite[:, None]) & (rng.random(sector.shape) < p_fav)
+        return np.where(fav, top(rng, sector, weights, n_opts, favorite), pick)
+    return policy
+
+
+def _positional(probs: Sequence[float]):
+    """Probabilidad fija por posición de opción (p. ej. 0.5/0.3/0.2 = tendencia a “Mucho”)."""
+    p = np.asarray(probs, dtype=float)
+    cum = np.cumsum(p / p.sum())
+
+    def policy(rng, sector, weights, n_opts, favorite):
+        pick = np.searchsorted(cum, rng.random(sector.shape), side="right")
+        return np.minimum(pick, n_opts[sector] - 1)
+    return policy
+
+
+POLICIES: Dict[str, Policy] = {
+    "uniform": _uniform,
+    "enthusiast": _extreme(True),
+    "indifferent": _extreme(False),
+    "affinity": _affinity(0.8),
+    "optimist": _positional((0.5, 0.3, 0.2)),
+}
+
+
+# ---------- simulación ----------
+def _simulate_chunk(rng, n_sessions: int, segments, weights, n_opts, policy: Policy,
+                    rounds: Tuple[int, int]):
+    n = len(segments)
+    lo, hi = rounds
+    r = rng.integers(lo, hi + 1, size=n_sessions)
+    width = max(hi, 1)
+    sector = spin_sector(rng.random((n_sessions, width)), n)     # misma regla que spin_target
+    favorite = rng.integers(0, n, size=n_sessions)
+    option = policy(rng, sector, weights, n_opts, favorite)
+    w = weights[sector, option]
+    w[np.arange(width)[None, :] >= r[:, None]] = 0.0             # rondas no jugadas
+
+    # tally[s, área] (bincount sobre sesión*n + sector)
+    flat = (np.arange(n_sessions)[:, None] * n + sector).ravel()
+    tally = np.bincount(flat, weights=w.ravel(), minlength=n_sessions * n).reshape(n_sessions, n)
+
+    best_area = np.argmax(tally, axis=1)                          # empate -> primera (como sorted estable)
+    best = tally[np.arange(n_sessions), best_area]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.where(r > 0, np.trunc((best / r) * 100), 0).astype(np.int64)
+    best_area = np.where(r > 0, best_area, -1)                    # -1 = “Sin datos”
+    return best_area, score, r
+
+
+def simulate(n_sessions: int = 1_000_000, policy: str = "uniform", seed: int = 0,
+             rounds: Tuple[int, int] = ROUNDS, segments: Sequence[str] = SEGMENTS,
+             chunk: int = CHUNK) -> Dict[str, np.ndarray]:
+    """
+    Simula `n_sessions` partidas completas (misma semilla -> mismos resultados).
+    Devuelve arrays: area (índice en segments, -1 sin datos), score (0-100), rounds.
+    """
+    rng = np.random.default_rng(seed)
+    weights, n_opts = option_table(segments)
+    fn = POLICIES[policy]
+    parts = []
+    done = 0
+    while done < n_sessions:
+        k = min(chunk, n_sessions - done)
+        parts.append(_simulate_chunk(rng, k, segments, weights, n_opts, fn, rounds))
+        done += k
+    area, score, r = (np.concatenate(x) for x in zip(*parts))
+    return {"area": area, "score": score, "rounds": r}
+
+
+def report(sim: Dict[str, np.ndarray], segments: Sequence[str] = SEGMENTS) -> dict:
+    """Distribución del puntaje por área ganadora (cuota, media, percentiles, histograma)."""
+    area, score = sim["area"], sim["score"]
+    total = len(area)
+    out = {"sessions": total, "expected_share": round(1 / len(segments), 4), "areas": {}}
+    for i, name in enumerate(list(segments) + ["Sin datos"]):
+        m = area == (i if i < len(segments) else -1)
+        k = int(m.sum())
+        if k == 0 and i >= len(segments):
+            continue
+        s = score[m]
+        hist = np.histogram(s, bins=BINS)[0] if k else np.zeros(len(BINS) - 1, int)
+        out["areas"][name] = {
+            "share": round(k / total, 4),
+            "mean": round(float(s.mean()), 2) if k else None,
+            "p10": int(np.percentile(s, 10)) if k else None,
+            "p50": int(np.percentile(s, 50)) if k else None,
+            "p90": int(np.percentile(s, 90)) if k else None,
+            "hist": [round(h / max(k, 1), 4) for h in hist.tolist()],
+        }
+    out["overall"] = {"mean": round(float(score.mean()), 2),
+                      "hist": [round(h / total, 4) for h in np.histogram(score, bins=BINS)[0].tolist()]}
+    return out
+
+
+def _print(rep: dict, policy: str):
+    print(f"Sesiones: {rep['sessions']:,}  política: {policy}  cuota esperada por área: {rep['expected_share']:.1%}")
+    head = " ".join(f"{b:>4}" for b in BINS[:-1])
+    print(f"\n{'área':<16}{'cuota':>7}{'media':>7}{'p10':>5}{'p50':>5}{'p90':>5}   hist% [{head}]")
+    for name, a in rep["areas"].items():
+        hist = " ".join(f"{h * 100:4.0f}" for h in a["hist"])
+        mean = f"{a['mean']:.1f}" if a["mean"] is not None else "-"
+        print(f"{name:<16}{a['share']:>7.1%}{mean:>7}{a['p10'] if a['p10'] is not None else '-':>5}"
+              f"{a['p50'] if a['p50'] is not None else '-':>5}{a['p90'] if a['p90'] is not None else '-':>5}   [{hist}]")
+    print(f"\nglobal: media {rep['overall']['mean']:.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Monte Carlo del puntaje de la ruleta")
+    ap.add_argument("--sessions", type=int, default=1_000_000)
+    ap.add_argument("--policy", choices=sorted(POLICIES), default="uniform")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--rounds", type=int, nargs=2, default=list(ROUNDS), metavar=("MIN", "MAX"))
+    ap.add_argument("--json", default=None, help="guardar el reporte en JSON")
+    a = ap.parse_args(argv)
+
+    sim = simulate(a.sessions, a.policy, a.seed, tuple(a.rounds))
+    rep = report(sim)
+    _print(rep, a.policy)
+    if a.json:
+        with open(a.json, "w", encoding="utf-8") as f:
+            json.dump({"policy": a.policy, "seed": a.seed, "rounds": a.rounds, **rep}, f,
+                      ensure_ascii=False, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Puntuación vectorizada (NumPy) de muchos tests completos a la vez
+
+from typing import Dict, Optional, Sequence
+import numpy as np
+from logic.engine import W_TEST, W_GAMES
+from logic.question_index import get_question_index
+
+
+def option_area_matrix() -> np.ndarray:
+    """(n_preguntas × max_opciones) con la columna de área de cada opción (-1 = no existe)."""
+    idx = get_question_index()
+    width = max((len(r) for r in idx.option_area), default=0)
+    m = np.full((idx.n_questions, width), -1, dtype=np.int64)
+    for q, row in enumerate(idx.option_area):
+        m[q, :len(row)] = row
+    return m
+
+
+def raw_counts(answers: np.ndarray) -> np.ndarray:
+    """
+    answers: (n_sesiones × n_preguntas) con el índice de opción elegido.
+    Devuelve los conteos crudos por área (n_sesiones × n_áreas).
+    """
+    idx = get_question_index()
+    answers = np.asarray(answers, dtype=np.int64)
+    if answers.ndim != 2 or answers.shape[1] != idx.n_questions:
+        raise ValueError(f"answers debe ser (n, {idx.n_questions})")
+    n, n_areas = answers.shape[0], len(idx.areas)
+    cols = option_area_matrix()[np.arange(idx.n_questions), answers]
+    if (cols < 0).any():
+        raise ValueError("answers contiene opciones fuera de rango")
+    flat = (np.arange(n, dtype=np.int64)[:, None] * n_areas + cols).ravel()
+    return np.bincount(flat, minlength=n * n_areas).reshape(n, n_areas)
+
+
+def score_batch(answers: np.ndarray,
+                game_scores: Optional[np.ndarray] = None,
+                game_counts: Optional[np.ndarray] = None) -> Dict[str, object]:
+    """
+    Equivalente vectorizado de AssistantController.finish_test.
+
+    answers:      (n × n_preguntas) índices de opción
+    game_scores:  (n × n_áreas) suma de puntajes de juegos (0..100 por juego)
+    game_counts:  (n × n_áreas) cuántos juegos por área
+
+    Devuelve arrays: scores, normalized, games_avg, weights (n × 2),
+    blended, ranking (columnas en orden desc., estable), top3 y area (columna).
+    """
+    idx = get_question_index()
+    scores = raw_counts(answers)
+    n, n_areas = scores.shape
+
+    counts = np.maximum(1, np.asarray(idx.count_list, dtype=np.int64))
+    normalized = scores / counts
+
+    if game_scores is None:
+        game_scores = np.zeros((n, n_areas))
+    if game_counts is None:
+        game_counts = np.zeros((n, n_areas), dtype=np.int64)
+    game_scores = np.asarray(game_scores, dtype=np.float64)
+    game_counts = np.asarray(game_counts, dtype=np.int64)
+    if game_scores.shape != (n, n_areas) or game_counts.shape != (n, n_areas):
+        raise ValueError(f"game_scores/game_counts deben ser ({n}, {n_areas})")
+
+    played = game_counts > 0
+    games_avg = np.divide(game_scores, game_counts, out=np.zeros((n, n_areas)), where=played)
+
+    any_games = played.any(axis=1)
+    w_test = np.where(any_games, W_TEST, 1.0)[:, None]
+    w_games = np.where(any_games, W_GAMES, 0.0)[:, None]
+    blended = w_test * normalized + w_games * (games_avg / 100.0)
+
+    # sorted(..., reverse=True) es estable: empates en el orden de AREAS
+    ranking = np.argsort(-blended, axis=1, kind="stable")
+    return {
+        "areas": idx.areas,
+        "scores": scores,
+        "normalized": normalized,
+        "games_avg": games_avg,
+        "weights": np.hstack([w_test, w_games]),
+        "blended": blended,
+        "ranking": ranking,
+        "top3": ranking[:, :3],
+        "area": ranking[:, 0],
+    }
+
+
+def area_names(columns: np.ndarray, areas: Sequence[str]) -> np.ndarray:
+    """Traduce columnas de área a nombres (mismo shape)."""
+    return np.asarray(areas, dtype=object)[columns]
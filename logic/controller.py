@@ -1,38 +1,48 @@
 # -*- coding: utf-8 -*-
 # Orquesta el flujo: menú, test, favoritas, texto libre, resultados
-import os
-import sys
-import subprocess
 import json
 import datetime
 import flet as ft
-from ui.widgets import HEX, bubble, primary_btn
-from data.catalog import AREAS, QUESTIONS, SEED_FAVORITES
-from logic.engine import smart_infer_area, suggest_profession, normalized_scores
-from services.exporter import export_all
-from games.debug_runner import build_debug_runner
-from games.color_quest import build_color_quest
-from games.ruleta import open_ruleta_dialog
-from games.damas.damas_vocacional import open_damas_dialog
+from ui.widgets import HEX, primary_btn
+from ui.chat import ChatWindow
+from ui.batching import UpdateBatcher, batched
+from data.catalog import AREAS, QUESTIONS
+from logic.sessions import FROZEN_AREAS, SessionState, state_field
+from logic.engine import smart_infer_area_fuzzy, suggest_profession, normalized_scores, blend_scores
+from logic.question_index import get_question_index
+from logic.result_table import lookup_result, profession_for
+from games import registry   # juegos/exportador: se importan al primer uso
+
+# Historial del chat: mensajes vivos en pantalla y tope de registros guardados
+CHAT_LIVE = 60
+CHAT_MAX_RECORDS = 1000
+CHAT_COMPACT = False   # True: burbujas solo texto (kioscos lentos)
 
 
 class AssistantController:
+    # -------- Estado (compacto, en self.state; ver logic/sessions.py) --------
+    stage = state_field("stage")                  # menu | test | result | favorites
+    q_index = state_field("q_index")
+    answers = state_field("answers")              # índice de opción elegido por pregunta
+    scores = state_field("scores")                # conteos del test por área
+    game_scores = state_field("game_scores")      # suma de puntajes
+    game_counts = state_field("game_counts")      # cuántos juegos por área
+    last_area = state_field("last_area")
+    last_prof_index = state_field("last_prof_index")
+    last_result = state_field("last_result")
+    favorites = state_field("favorites")
+
     def __init__(self, page: ft.Page):
         self.page = page
-
-        # -------- Estado --------
-        self.stage = "menu"   # menu | test | result | favorites
-        self.q_index = 0
-        self.scores = {a: 0 for a in AREAS}
-        self.game_scores = {a: 0.0 for a in AREAS}   # suma de puntajes
-        self.game_counts = {a: 0   for a in AREAS}   # cuántos juegos por área
-        self.last_area = None
-        self.last_prof_index = 0
-        self.last_result = None
-        self.favorites: list[str] = SEED_FAVORITES.copy()
+        # Un solo page.update() por acción del usuario (ver ui/batching.py)
+        self.ui = UpdateBatcher.for_page(page)
+        self.state = SessionState()
 
         # -------- UI (chat principal) --------
-        self.chat = ft.ListView(expand=True, spacing=8, auto_scroll=True, padding=12)
+        # Ventana de chat: solo los últimos CHAT_LIVE mensajes quedan como controles
+        self.history = ChatWindow(live=CHAT_LIVE, max_records=CHAT_MAX_RECORDS, compact=CHAT_COMPACT,
+                                  expand=True, spacing=8, auto_scroll=True, padding=12)
+        self.chat = self.history.view
         self.quick = ft.Row(spacing=8, wrap=True, alignment=ft.MainAxisAlignment.START)
         self.entry = ft.TextField(
             hint_text="Escribe aquí… (o usa los botones)",
@@ -64,6 +74,7 @@ class AssistantController:
         self.page.on_keyboard_event = self.on_key
 
     # ---------- Montaje ----------
+    @batched
     def mount(self):
         self.page.appbar = ft.AppBar(title=ft.Text("Chatbot de Orientación Vocacional"))
         self.page.add(
@@ -84,26 +95,48 @@ class AssistantController:
         )
         self.welcome()
 
+    # ---------- Sesión ----------
+    def memory_estimate(self) -> int:
+        """Bytes aproximados de esta sesión (estado + historial del chat)."""
+        return self.state.nbytes() + self.history.nbytes()
+
+    def release(self):
+        """
+        Libera la sesión (inactiva): vacía el chat y avisa en la página.
+        Corre en el hilo de limpieza: dentro de un batch, con un solo page.update().
+        """
+        with self.ui.batch():
+            self.history.clear()
+            self.state = SessionState()
+            self.current_handlers = []
+            try:
+                self.page.controls.clear()
+                self.page.controls.append(
+                    ft.Text("Sesión cerrada por inactividad. Recarga la página para empezar de nuevo."))
+                self.ui.update()
+            except Exception:
+                pass
+
     # ---------- Helpers UI ----------
     def add_bot(self, text: str):
-        self.chat.controls.append(bubble(text, user=False))
-        self.page.update()
+        self.history.add_message(text, user=False)
+        self.ui.update()
 
     def add_user(self, text: str):
-        self.chat.controls.append(bubble(text, user=True))
-        self.page.update()
+        self.history.add_message(text, user=True)
+        self.ui.update()
 
     def set_quick(self, buttons: list[ft.Control]):
         self.quick.controls.clear()
         self.quick.controls.extend(buttons)
-        self.page.update()
+        self.ui.update()
 
     def show_status(self, show: bool):
         self.status_container.visible = show
-        self.page.update()
+        self.ui.update()
 
     def update_status(self):
-        total = len(QUESTIONS)
+        total = get_question_index().n_questions
         cur = min(self.q_index, total)
         self.progress_label.value = f"Progreso del test: {cur}/{total}"
         self.progress_bar.value = (cur / total) if total else 0
@@ -111,7 +144,7 @@ class AssistantController:
         norm = normalized_scores(self.scores)
         for a in AREAS:
             self.area_rows[a].value = max(0.0, min(1.0, norm[a]))
-        self.page.update()
+        self.ui.update()
 
     # ---------- Pantallas ----------
     def menu_buttons(self):
@@ -123,6 +156,7 @@ class AssistantController:
             ft.OutlinedButton(text="Exportar resultado", on_click=lambda e: self.export_result()),
         ]
 
+    @batched
     def welcome(self):
         self.add_bot("¡Hola 👋 Soy tu asistente virtual!")
         # Recuperar último resultado (si existe)
@@ -145,13 +179,14 @@ class AssistantController:
         self.set_quick(self.menu_buttons())
 
     # ---------- Favoritas ----------
+    @batched
     def open_favorites(self):
         self.stage = "favorites"
         self.add_bot("Selecciona / deselecciona tus profesiones favoritas y guarda cambios.")
         # UI simple con Checkboxes
         checks = []
         # Listado plano a partir de todas las áreas
-        all_roles = [r for roles in AREAS.values() for r in roles]
+        all_roles = [r for roles in FROZEN_AREAS.values() for r in roles]
         self._fav_checks = {}
         for r in all_roles:
             cb = ft.Checkbox(label=r, value=(r in self.favorites))
@@ -159,10 +194,11 @@ class AssistantController:
             checks.append(cb)
 
         def save_favs(e):
-            self.favorites = [role for role, cb in self._fav_checks.items() if cb.value]
-            self.page.client_storage.set("favorites", json.dumps(self.favorites, ensure_ascii=False))
-            self.add_bot("✅ Guardé tus favoritas. ¡Listo!")
-            self.back_to_menu()
+            with self.ui.batch():
+                self.favorites = [role for role, cb in self._fav_checks.items() if cb.value]
+                self.page.client_storage.set("favorites", json.dumps(self.favorites, ensure_ascii=False))
+                self.add_bot("✅ Guardé tus favoritas. ¡Listo!")
+                self.back_to_menu()
 
         self.set_quick([
             primary_btn("Guardar favoritas", save_favs),
@@ -170,22 +206,23 @@ class AssistantController:
         ])
 
         # Mostrar lista dentro del chat como bloque (scroll interno del chat)
-        self.chat.controls.append(
+        self.history.add_control(
             ft.Container(
                 content=ft.Column(checks, tight=True, spacing=4),
                 padding=10,
                 border=ft.border.all(1, HEX["BORDER"]),
                 border_radius=12,
                 bgcolor="#FFFFFF",
-            )
+            ),
+            "(lista de favoritas)",
         )
-        self.page.update()
+        self.ui.update()
 
     # ---------- Test ----------
+    @batched
     def go_test(self):
         self.stage = "test"
-        self.q_index = 0
-        for k in self.scores: self.scores[k] = 0
+        self.state.reset_test()
         self.add_bot("Haré preguntas rápidas; elige **1 opción** por pregunta.")
         self.show_status(True)
         self.update_status()
@@ -201,41 +238,39 @@ class AssistantController:
 
         self.current_handlers = []
         opts = []
-        for label, area in qd["opts"]:
-            def make(area_name, label_text):
+        for opt, (label, area) in enumerate(qd["opts"]):
+            def make(area_name, label_text, opt_index):
                 def _h(e):
-                    self.add_user(label_text)
-                    self.scores[area_name] += 1
-                    self.q_index += 1
-                    self.update_status()
-                    self.ask_question()
+                    with self.ui.batch():
+                        self.add_user(label_text)
+                        self.answers.append(opt_index)
+                        self.scores[area_name] += 1
+                        self.q_index += 1
+                        self.update_status()
+                        self.ask_question()
                 return _h
-            h = make(area, label)
+            h = make(area, label, opt)
             self.current_handlers.append(h)
             opts.append(primary_btn(label, h))
         self.set_quick(opts)
 
+    @batched
     def finish_test(self):
         self.stage = "result"
         self.show_status(False)
 
-        # --- 1) Normalizados del TEST (0..1) ---
-        test_norm = normalized_scores(self.scores)  # dict área -> float
-
-        # --- 2) Promedio de JUEGOS por área (0..100) ---
-        def _avg_game(a: str) -> float:
-            return (self.game_scores[a] / self.game_counts[a]) if self.game_counts[a] else 0.0
-
-        any_games = sum(self.game_counts.values()) > 0
-        w_test = 0.7 if any_games else 1.0
-        w_games = 0.3 if any_games else 0.0
-
-        # --- 3) Mezcla (blended) ---
-        blended = {
-            a: w_test * test_norm[a] + w_games * (_avg_game(a) / 100.0)
-            for a in AREAS
-        }
-        blended_ranked = sorted(blended.items(), key=lambda kv: kv[1], reverse=True)
+        # --- 1) Normalizados del TEST, 2) promedios de JUEGOS, 3) mezcla ---
+        # (tabla precalculada por vector de respuestas; corrección si hubo juegos)
+        try:
+            mix = lookup_result(self.answers, self.game_scores, self.game_counts)
+        except KeyError:
+            mix = blend_scores(self.scores, self.game_scores, self.game_counts)
+        test_norm = mix["test_norm"]        # dict área -> 0..1
+        games_avg = mix["games_avg"]        # dict área -> 0..100
+        any_games = mix["any_games"]
+        w_test, w_games = mix["weights"]["test"], mix["weights"]["games"]
+        blended = mix["blended"]
+        blended_ranked = mix["ranked"]
 
         # Área ganadora y Top3 según mezcla
         area = blended_ranked[0][0]
@@ -244,14 +279,14 @@ class AssistantController:
         self.last_prof_index = 0
 
         # Profesión sugerida (fav si existe en el área ganadora)
-        base_prof = self._pick_profession_with_favorites(area) or area
+        base_prof = profession_for(area, self.favorites) or area
 
         # --- 4) Guardar resultado (incluye info del blend) ---
         self.last_result = {
             "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "scores": self.scores.copy(),  # crudos del test (conteos)
             "normalized_test": {k: round(v, 2) for k, v in test_norm.items()},  # 0..1
-            "games_avg": {a: round(_avg_game(a), 1) for a in AREAS},            # 0..100
+            "games_avg": {a: round(games_avg[a], 1) for a in AREAS},            # 0..100
             "weights": {"test": w_test, "games": w_games},
             "blended": {k: round(v, 2) for k, v in blended.items()},            # 0..1
             "top3": top3,
@@ -276,20 +311,9 @@ class AssistantController:
             ft.OutlinedButton(text="Volver al menú", on_click=lambda e: self.back_to_menu()),
         ])
 
-
-
-    def _pick_profession_with_favorites(self, area: str) -> str | None:
-        roles = AREAS.get(area, [])
-        if not roles:
-            return None
-        # Si alguna favorita pertenece al área ganadora, sugiérela primero
-        for fav in self.favorites:
-            if fav in roles:
-                return fav
-        return roles[0]
-
+    @batched
     def show_profession(self, area: str, next_one: bool = False):
-        roles = AREAS.get(area, [])
+        roles = FROZEN_AREAS.get(area, ())
         if not roles:
             self.add_bot("No tengo profesiones cargadas para esa área 😅."); return
         if next_one:
@@ -305,19 +329,22 @@ class AssistantController:
         self.add_bot("¿Quieres ver otra opción, exportar, repetir el test o volver al menú?")
 
     # ---------- Texto libre “inteligente” ----------
+    @batched
     def explain_free_text(self):
         self.add_bot("Cuéntame qué te gusta (ej.: 'me encanta diseñar interfaces y dibujar').")
         self.set_quick([primary_btn("Iniciar Test", lambda e: self.go_test())])
 
     # ---------- Export ----------
+    @batched
     def export_result(self):
         if not self.last_result:
             self.add_bot("Aún no tengo un resultado. Inicia el **Test** o cuéntame tus intereses.")
             return
-        created = export_all(self.last_result)
+        created = registry.load("export")(self.last_result)
         self.add_bot("Archivos generados:\n- " + "\n- ".join(created))
 
     # ---------- Entrada de texto ----------
+    @batched
     def on_send(self, e=None):
         msg = self.entry.value.strip()
         if not msg: return
@@ -339,23 +366,27 @@ class AssistantController:
             return
 
         # Inteligencia simple para texto libre
-        area, pts, tokens = smart_infer_area(msg)
+        area, pts, tokens, conf = smart_infer_area_fuzzy(msg)
         if pts == 0:
             self.add_bot("Puedo iniciar un **Test vocacional** o entender mejor si me cuentas lo que te gusta.")
             return
         # Sugerencia con ligero sesgo a favoritas
-        prof = self._pick_profession_with_favorites(area) or suggest_profession(area)
+        prof = profession_for(area, self.favorites) or suggest_profession(area)
         why = f"(detecté: {', '.join(tokens)})" if tokens else ""
+        if conf < 1.0:
+            why += f" — coincidencia aproximada ({conf:.0%})"
         self.add_bot(f"Por lo que dices, suena a **{area}** {why}")
         self.add_bot(f"💡 Profesión sugerida: **{prof}**. ¿Quieres correr el **test** para confirmarlo?")
 
     # ---------- Navegación ----------
+    @batched
     def back_to_menu(self):
         self.stage = "menu"
         self.add_bot("¿Qué te gustaría hacer ahora?")
         self.set_quick(self.menu_buttons())
 
     # ---------- Atajos de teclado (1..5) ----------
+    @batched
     def on_key(self, e: ft.KeyboardEvent):
         if self.stage != "test":
             return
@@ -366,6 +397,7 @@ class AssistantController:
             if 0 <= idx < len(self.current_handlers):
                 self.current_handlers[idx](None)
 
+    @batched
     def open_games_menu(self):
         self.add_bot("Elige un minijuego (60–90 s). Suma afinidad por área.")
         self.set_quick([
@@ -378,45 +410,36 @@ class AssistantController:
 
 
 
+    @batched
     def play_debug(self):
         self.add_bot("Iniciando Debug Runner…")
-        game = build_debug_runner(self.on_game_finish)
-        self.chat.controls.append(game); self.page.update()
+        game = registry.load("debug_runner")(self.on_game_finish)
+        self.history.add_control(game, "(minijuego: Debug Runner)"); self.ui.update()
         self.set_quick([])
 
+    @batched
     def play_color(self):
         self.add_bot("Iniciando Color Quest…")
-        game = build_color_quest(self.on_game_finish)
-        self.chat.controls.append(game); self.page.update()
+        game = registry.load("color_quest")(self.on_game_finish)
+        self.history.add_control(game, "(minijuego: Color Quest)"); self.ui.update()
         self.set_quick([])
     
+    @batched
     def play_ruleta(self):
         self.add_bot("Iniciando Ruleta Vocacional…")
-        open_ruleta_dialog(self.page, self.on_game_finish)  # abre modal animado
+        registry.load("ruleta")(self.page, self.on_game_finish)  # abre modal animado
         self.set_quick([])  # opcional: limpiar botones mientras está el modal
 
+    @batched
     def play_damas(self):
         self.add_bot("Iniciando Juego de Damas…")
-
-        # 1) Lanzar la ventana pygame en un proceso aparte
-        #    (elige UNA de las dos formas)
-
-        # (A) Por ruta directa al archivo:
-        script_path = os.path.abspath(
-            os.path.join(os.path.dirname(__file__), "..", "games", "damas", "damas_vocacional.py")
-        )
-        subprocess.Popen([sys.executable, script_path],
-                        cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
-
-        # (B) Por módulo (requiere __init__.py en games y damas):
-        # subprocess.Popen([sys.executable, "-m", "games.damas.damas_vocacional"],
-        #                  cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
-
-        # 2) Abrir el modal (hojita) para capturar score cuando cierre el juego
-        open_damas_dialog(self.page, self.on_game_finish)
+        # ventana pygame en otro proceso; su resultado llega solo a on_game_finish
+        # (si el juego falla, se pide el puntaje con el slider)
+        registry.load("damas")(self.page, self.on_game_finish)
 
         self.set_quick([])  # opcion
 
+    @batched
     def on_game_finish(self, result: dict):
         # result: {"game": "...", "area": "Tecnología", "score": 0..100, "why": "..."}
         area = result.get("area")
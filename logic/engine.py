@@ -1,23 +1,37 @@
 # -*- coding: utf-8 -*-
 # "Inteligencia" simple y helpers de cálculo
 
-from typing import Dict, List, Tuple, Optional
-from data.catalog import AREAS, SMART_KEYWORDS, QUESTIONS
+from typing import Dict, Iterable, List, Tuple, Optional
+from data.catalog import AREAS, SMART_KEYWORDS
+from logic.matcher import KeywordAutomaton
+from logic.sessions import FROZEN_AREAS
+from logic.question_index import get_question_index
+
+# Pesos de la mezcla Test / Juegos (cuando hubo al menos un juego)
+W_TEST, W_GAMES = 0.7, 0.3
+
+# Autómata compilado una sola vez a partir del catálogo; el índice difuso
+# (rapidfuzz) se construye en el primer mensaje libre
+_MATCHER = KeywordAutomaton(SMART_KEYWORDS)
+_FUZZY = None
 
 def smart_infer_area(message: str) -> Tuple[str, int, List[str]]:
-    low = message.lower()
-    scores: Dict[str, int] = {a: 0 for a in SMART_KEYWORDS}
-    hits: Dict[str, List[str]] = {a: [] for a in SMART_KEYWORDS}
-    for area, keys in SMART_KEYWORDS.items():
-        for k in keys:
-            if k in low:
-                scores[area] += 1
-                hits[area].append(k)
-    area = max(scores.items(), key=lambda kv: kv[1])[0]
-    return area, scores[area], hits[area]
+    return _MATCHER.best(message.lower())
+
+def smart_infer_area_batch(messages: Iterable[str]) -> List[Tuple[str, int, List[str]]]:
+    """Clasifica muchos textos (p. ej. exportaciones de respuestas libres)."""
+    return [smart_infer_area(m or "") for m in messages]
+
+def smart_infer_area_fuzzy(message: str) -> Tuple[str, int, List[str], float]:
+    """Como smart_infer_area, pero sin tildes y tolerante a typos; añade la confianza (0..1)."""
+    global _FUZZY
+    if _FUZZY is None:
+        from logic.fuzzy import FuzzyKeywordIndex
+        _FUZZY = FuzzyKeywordIndex(SMART_KEYWORDS)
+    return _FUZZY.infer(message)
 
 def suggest_profession(area: str, used: Optional[List[str]] = None) -> Optional[str]:
-    roles = AREAS.get(area, [])
+    roles = FROZEN_AREAS.get(area, ())
     if not roles:
         return None
     used = set(used or [])
@@ -27,12 +41,40 @@ def suggest_profession(area: str, used: Optional[List[str]] = None) -> Optional[
     return roles[0] if roles else None
 
 def area_counts_in_questions() -> Dict[str, int]:
-    counts = {a: 0 for a in AREAS}
-    for q in QUESTIONS:
-        for _, ar in q["opts"]:
-            counts[ar] += 1
-    return counts
+    return dict(get_question_index().counts)
 
 def normalized_scores(scores: Dict[str, int]) -> Dict[str, float]:
-    counts = area_counts_in_questions()
+    counts = get_question_index().counts
     return {a: (scores[a] / max(1, counts[a])) for a in scores}
+
+def game_averages(game_scores: Dict[str, float], game_counts: Dict[str, int]) -> Dict[str, float]:
+    """Promedio de juegos por área (0..100); 0 si no se jugó esa área."""
+    return {a: (game_scores[a] / game_counts[a]) if game_counts[a] else 0.0 for a in game_scores}
+
+def blend_scores(scores: Dict[str, int],
+                 game_scores: Dict[str, float],
+                 game_counts: Dict[str, int]) -> Dict[str, object]:
+    """
+    Mezcla 70% Test + 30% Juegos (solo Test si no hubo juegos).
+    Devuelve normalizados, promedios, pesos, mezcla y ranking (desc, estable).
+    """
+    test_norm = normalized_scores(scores)
+    games_avg = game_averages(game_scores, game_counts)
+
+    any_games = sum(game_counts.values()) > 0
+    w_test = W_TEST if any_games else 1.0
+    w_games = W_GAMES if any_games else 0.0
+
+    blended = {
+        a: w_test * test_norm[a] + w_games * (games_avg[a] / 100.0)
+        for a in AREAS
+    }
+    ranked = sorted(blended.items(), key=lambda kv: kv[1], reverse=True)
+    return {
+        "test_norm": test_norm,
+        "games_avg": games_avg,
+        "any_games": any_games,
+        "weights": {"test": w_test, "games": w_games},
+        "blended": blended,
+        "ranked": ranked,
+    }
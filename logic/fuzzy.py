@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Índice difuso (sin acentos + trigramas) sobre SMART_KEYWORDS, tolerante a typos
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, List, Set, Tuple
+
+from logic.matcher import KeywordAutomaton
+
+# rapidfuzz es opcional (ya lo usa tools/calibrate_wheel.py); si no, difflib
+try:
+    from rapidfuzz import fuzz
+    RAPIDFUZZ = True
+except Exception:
+    RAPIDFUZZ = False
+
+MIN_FUZZY_LEN = 4       # keywords más cortas (app, ux, ui, web…): exactas y al inicio de palabra
+MIN_SIMILARITY = 0.84   # 0..1; por debajo no cuenta como coincidencia
+MIN_TYPO_LEN = 6        # keywords de ≤5 letras solo exactas: un cambio ya es otra palabra (campo ~ campeón)
+
+_WORD = re.compile(r"\w+")
+
+
+def fold(text: str) -> str:
+    """Minúsculas y sin tildes/diacríticos ("Código" -> "codigo")."""
+    nfd = unicodedata.normalize("NFD", text.lower())
+    return "".join(ch for ch in nfd if not unicodedata.combining(ch))
+
+
+def _trigrams(word: str) -> Set[str]:
+    w = f" {word} "
+    return {w[i:i + 3] for i in range(len(w) - 2)}
+
+
+def _similarity(key: str, token: str) -> float:
+    """Mejor parecido (0..1) de la keyword (raíz) contra el inicio del token."""
+    head = token[:len(key) + 1]
+    if RAPIDFUZZ:
+        return max(fuzz.ratio(key, head), fuzz.ratio(key, token[:len(key)])) / 100.0
+    return max(SequenceMatcher(None, key, head).ratio(),
+               SequenceMatcher(None, key, token[:len(key)]).ratio())
+
+
+class FuzzyKeywordIndex:
+    """
+    Índice construido una vez:
+      - exacto sobre keywords sin tildes (autómata de logic.matcher)
+      - keywords cortas solo al inicio de palabra ("ui" no cuenta en "quiero")
+      - trigramas -> keywords de MIN_TYPO_LEN+ letras para proponer candidatos ante typos
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]]):
+        self.areas: List[str] = list(keywords)
+        folded = {a: [fold(k) for k in ks if len(fold(k)) >= MIN_FUZZY_LEN]
+                  for a, ks in keywords.items()}
+        self.exact = KeywordAutomaton(folded)
+        self.short: Tuple[str, ...] = tuple(sorted({
+            fold(k) for ks in keywords.values() for k in ks if 0 < len(fold(k)) < MIN_FUZZY_LEN
+        }))
+        # keyword plegada -> [(área, posición en el catálogo, keyword original)]
+        self.owner: Dict[str, List[Tuple[str, int, str]]] = {}
+        for area, ks in keywords.items():
+            for pos, k in enumerate(ks):
+                self.owner.setdefault(fold(k), []).append((area, pos, k))
+        self.grams: Dict[str, Set[str]] = {}
+        for fk in self.owner:
+            if len(fk) >= MIN_TYPO_LEN:
+                for g in _trigrams(fk):
+                    self.grams.setdefault(g, set()).add(fk)
+        self._cache: Dict[str, List[Tuple[str, float]]] = {}
+
+    def _fuzzy_token(self, token: str) -> List[Tuple[str, float]]:
+        """Keywords plegadas parecidas al token, con su similitud."""
+        hit = self._cache.get(token)
+        if hit is not None:
+            return hit
+        votes: Dict[str, int] = {}
+        for g in _trigrams(token[:12]):
+            for fk in self.grams.get(g, ()):
+                votes[fk] = votes.get(fk, 0) + 1
+        out = []
+        for fk, v in votes.items():
+            # con 1 solo trigrama en común no vale la pena comparar
+            if v >= 2:
+                sim = _similarity(fk, token)
+                if sim >= MIN_SIMILARITY:
+                    out.append((fk, sim))
+        if len(self._cache) < 50_000:
+            self._cache[token] = out
+        return out
+
+    def infer(self, message: str) -> Tuple[str, int, List[str], float]:
+        """
+        (área, puntos, keywords detectadas, confianza 0..1).
+        Las coincidencias exactas (sin tildes) valen confianza 1.0.
+        """
+        text = fold(message)
+        best: Dict[str, float] = {}
+        for wid in self.exact.scan(text):
+            best[self.exact.words[wid]] = 1.0
+        for token in set(_WORD.findall(text)):
+            if self.short and token.startswith(self.short):
+                for k in self.short:
+                    if token.startswith(k):
+                        best[k] = 1.0
+            if len(token) < MIN_FUZZY_LEN:
+                continue
+            for fk, sim in self._fuzzy_token(token):
+                if sim > best.get(fk, 0.0):
+                    best[fk] = sim
+
+        # se ordena por puntos ponderados (un typo pesa menos que un acierto exacto)
+        weight = {a: 0.0 for a in self.areas}
+        hits: Dict[str, List[Tuple[int, str]]] = {a: [] for a in self.areas}
+        for fk, sim in best.items():
+            for area, pos, original in self.owner[fk]:
+                weight[area] += sim
+                hits[area].append((pos, original))
+        area = max(weight.items(), key=lambda kv: kv[1])[0]
+        pts = len(hits[area])
+        found = [k for _, k in sorted(hits[area])]
+        return area, pts, found, (weight[area] / pts) if pts else 0.0
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Autómata multi-patrón (Aho-Corasick) para puntuar keywords en una sola pasada
+
+import re
+from typing import Dict, List, Tuple
+
+# pyahocorasick es opcional: si no está, el trie se compila a una única regex
+try:
+    import ahocorasick
+    AHOCORASICK = True
+except Exception:
+    AHOCORASICK = False
+
+
+def _trie_regex(words: List[str]) -> str:
+    """Trie de keywords como regex (prefijos comunes factorizados)."""
+    root: dict = {}
+    for w in words:
+        node = root
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node: dict) -> str:
+        alts = [re.escape(ch) + emit(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # si aquí termina una keyword, el resto es opcional (se captura la más larga)
+        return "(?:" + body + ")?" if "" in node else body
+
+    return "(?=(" + emit(root) + "))"
+
+
+class KeywordAutomaton:
+    """
+    Compila un diccionario área -> keywords una sola vez.
+    `scan(texto)` recorre el texto en una pasada y devuelve las keywords
+    presentes (cada una cuenta una vez, igual que el antiguo `k in low`).
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]]):
+        self.areas: List[str] = list(keywords)
+        self.words: List[str] = []
+        # por keyword: [(área, posición en la lista del área)]
+        self.owners: List[List[Tuple[str, int]]] = []
+
+        ids: Dict[str, int] = {}
+        for area, keys in keywords.items():
+            for pos, k in enumerate(keys):
+                if not k:
+                    continue
+                if k not in ids:
+                    ids[k] = len(self.words)
+                    self.words.append(k)
+                    self.owners.append([])
+                self.owners[ids[k]].append((area, pos))
+        self._ids = ids
+        # sin keywords compartidas, el orden de ids ya es el orden de catálogo
+        self._shared = any(len(o) > 1 for o in self.owners)
+
+        if AHOCORASICK:
+            self._aho = ahocorasick.Automaton()
+            for k, wid in ids.items():
+                self._aho.add_word(k, wid)
+            self._aho.make_automaton()
+        else:
+            self._aho = None
+            self._rx = re.compile(_trie_regex(self.words))
+            # la regex captura la keyword más larga por posición; las que son
+            # prefijo de ella también están presentes
+            self._implied = {
+                k: [ids[p] for p in self.words if p != k and k.startswith(p)] + [ids[k]]
+                for k in self.words
+            }
+
+    # ---------- Búsqueda ----------
+    def scan(self, text: str) -> set:
+        """Ids de las keywords que aparecen en `text` (ya en minúsculas)."""
+        if self._aho is not None:
+            return {wid for _, wid in self._aho.iter(text)}
+        found = set()
+        for k in set(self._rx.findall(text)):
+            found.update(self._implied[k])
+        return found
+
+    def score(self, text: str) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+        """Puntos y keywords detectadas por área (hits en el orden del catálogo)."""
+        return self.score_found(self.scan(text))
+
+    def score_found(self, found: set) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+        scores: Dict[str, int] = dict.fromkeys(self.areas, 0)
+        hits: Dict[str, List[str]] = {a: [] for a in self.areas}
+        for wid in sorted(found):
+            word = self.words[wid]
+            for area, _ in self.owners[wid]:
+                scores[area] += 1
+                hits[area].append(word)
+        if self._shared:
+            for area, words in hits.items():
+                words.sort(key=lambda w: next(p for a, p in self.owners[self._ids[w]] if a == area))
+        return scores, hits
+
+    def best(self, text: str) -> Tuple[str, int, List[str]]:
+        """(área, puntos, hits) de la mejor área; empate -> primera del catálogo."""
+        found = self.scan(text)
+        if not found:
+            return self.areas[0], 0, []
+        scores, hits = self.score_found(found)
+        area = max(scores.items(), key=lambda kv: kv[1])[0]
+        return area, scores[area], hits[area]
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Índice compilado de QUESTIONS: conteos por área y matriz opción -> área
+
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+import data.catalog as catalog
+
+
+class QuestionIndex:
+    """
+    Se construye una vez a partir del catálogo:
+      - areas:       orden de columnas (el de AREAS)
+      - col:         área -> índice de columna
+      - counts:      área -> nº de opciones que suman a esa área
+      - option_area: [pregunta][opción] -> columna del área
+      - n_questions: nº de preguntas
+    """
+
+    def __init__(self, areas: Dict[str, List[str]], questions: list):
+        self.areas: Tuple[str, ...] = tuple(areas)
+        self.col: Dict[str, int] = {a: i for i, a in enumerate(self.areas)}
+        self.option_area: List[List[int]] = [
+            [self.col[ar] for _, ar in q["opts"]] for q in questions
+        ]
+        self.n_questions = len(questions)
+        counts = [0] * len(self.areas)
+        for row in self.option_area:
+            for c in row:
+                counts[c] += 1
+        self.count_list: List[int] = counts
+        self.counts: Dict[str, int] = dict(zip(self.areas, counts))
+
+        # hash del contenido que decide el índice: detecta también ediciones in situ
+        # (cambiar el área de una opción no cambia ni id() ni len())
+        self._sig = self._signature(areas, questions)
+
+    @staticmethod
+    def _signature(areas, questions) -> str:
+        src = json.dumps([list(areas), [[ar for _, ar in q["opts"]] for q in questions]],
+                         ensure_ascii=False)
+        return hashlib.sha1(src.encode("utf-8")).hexdigest()
+
+    def is_stale(self) -> bool:
+        return self._sig != self._signature(catalog.AREAS, catalog.QUESTIONS)
+
+
+_INDEX: Optional[QuestionIndex] = None
+
+
+def get_question_index() -> QuestionIndex:
+    """Índice vigente; solo se reconstruye si el catálogo cambió."""
+    global _INDEX
+    if _INDEX is None or _INDEX.is_stale():
+        _INDEX = QuestionIndex(catalog.AREAS, catalog.QUESTIONS)
+    return _INDEX
+
+
+def rebuild_question_index() -> QuestionIndex:
+    """Fuerza la reconstrucción (p. ej. tras editar preguntas in situ)."""
+    global _INDEX
+    _INDEX = None
+    return get_question_index()
+
+
+get_question_index()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Tabla precalculada de resultados del Test (todas las combinaciones de respuestas)
+
+import hashlib
+import itertools
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import data.catalog as catalog
+from logic.engine import W_GAMES, W_TEST, blend_scores
+from logic.question_index import QuestionIndex, get_question_index
+
+SCHEMA = 1
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+TABLE_FILE = os.path.join(ROOT, "data", "result_table.json")
+
+
+def catalog_version(idx: QuestionIndex) -> str:
+    """Versión de la tabla: esquema + hash de áreas y opciones del catálogo."""
+    src = json.dumps([idx.areas, idx.option_area], ensure_ascii=False)
+    return f"{SCHEMA}:{hashlib.sha1(src.encode('utf-8')).hexdigest()}"
+
+
+def _key(answers: Sequence[int]) -> str:
+    return ",".join(str(int(o)) for o in answers)
+
+
+def build_table(idx: QuestionIndex) -> Dict[str, dict]:
+    """Resultado solo-Test para cada vector de respuestas posible."""
+    zeros_f = {a: 0.0 for a in idx.areas}
+    zeros_i = {a: 0 for a in idx.areas}
+    table = {}
+    for combo in itertools.product(*(range(len(r)) for r in idx.option_area)):
+        scores = {a: 0 for a in idx.areas}
+        for q, o in enumerate(combo):
+            scores[idx.areas[idx.option_area[q][o]]] += 1
+        mix = blend_scores(scores, zeros_f, zeros_i)
+        table[_key(combo)] = {
+            "scores": scores,
+            "test_norm": mix["test_norm"],
+            "ranked": [list(kv) for kv in mix["ranked"]],
+        }
+    return table
+
+
+class ResultTable:
+    """
+    Tabla versionada en disco (data/result_table.json) + en memoria.
+    Si la versión guardada no coincide con el catálogo actual, se regenera.
+    """
+
+    def __init__(self, path: str = TABLE_FILE):
+        self.path = path
+        self.version: Optional[str] = None
+        self.table: Dict[str, dict] = {}
+        self._index: Optional[QuestionIndex] = None
+        self._lock = threading.Lock()
+
+    def _load_or_build(self):
+        idx = get_question_index()
+        version = catalog_version(idx)
+        table = None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == version:
+                table = data["table"]
+        except (OSError, ValueError, KeyError):
+            pass
+        if table is None:
+            table = build_table(idx)
+            try:
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"version": version, "areas": list(idx.areas), "table": table},
+                              f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"⚠️ No se pudo guardar la tabla de resultados: {e}")
+        self.table, self.version, self._index = table, version, idx
+
+    def ensure(self):
+        # el índice de preguntas se reconstruye solo si cambió el catálogo
+        if self._index is not get_question_index():
+            with self._lock:
+                if self._index is not get_question_index():
+                    self._load_or_build()
+
+    def lookup(self, answers: Sequence[int]) -> Optional[dict]:
+        self.ensure()
+        return self.table.get(_key(answers))
+
+
+_TABLE = ResultTable()
+
+
+def lookup_result(answers: Sequence[int],
+                  game_scores: Dict[str, float],
+                  game_counts: Dict[str, int]) -> dict:
+    """
+    Mismo formato que engine.blend_scores (+ "scores"), usando la tabla.
+    Con juegos, la mezcla 70/30 se aplica como corrección sobre test_norm.
+    """
+    entry = _TABLE.lookup(answers)
+    if entry is None:   # vector incompleto o fuera de rango
+        raise KeyError(f"Respuestas no válidas: {list(answers)}")
+
+    test_norm = entry["test_norm"]
+    any_games = sum(game_counts.values()) > 0
+    if not any_games:
+        games_avg = {a: 0.0 for a in test_norm}
+        return {
+            "scores": dict(entry["scores"]),
+            "test_norm": dict(test_norm),
+            "games_avg": games_avg,
+            "any_games": False,
+            "weights": {"test": 1.0, "games": 0.0},
+            "blended": dict(test_norm),   # 1.0 * norm + 0.0 * 0
+            "ranked": [tuple(kv) for kv in entry["ranked"]],
+        }
+
+    games_avg = {a: (game_scores[a] / game_counts[a]) if game_counts[a] else 0.0
+                 for a in test_norm}
+    blended = {a: W_TEST * test_norm[a] + W_GAMES * (games_avg[a] / 100.0)
+               for a in test_norm}
+    return {
+        "scores": dict(entry["scores"]),
+        "test_norm": dict(test_norm),
+        "games_avg": games_avg,
+        "any_games": True,
+        "weights": {"test": W_TEST, "games": W_GAMES},
+        "blended": blended,
+        "ranked": sorted(blended.items(), key=lambda kv: kv[1], reverse=True),
+    }
+
+
+def profession_for(area: str, favorites: List[str]) -> Optional[str]:
+    """Primera favorita que pertenezca al área; si no, el primer rol del área."""
+    roles = _roles_by_area().get(area)
+    if not roles:
+        return None
+    owned = roles[1]
+    for fav in favorites:
+        if fav in owned:
+            return fav
+    return roles[0]
+
+
+_ROLES: Tuple[object, Dict[str, Tuple[str, frozenset]]] = (None, {})
+
+
+def _roles_by_area() -> Dict[str, Tuple[str, frozenset]]:
+    global _ROLES
+    if _ROLES[0] is not catalog.AREAS:
+        _ROLES = (catalog.AREAS, {a: (roles[0], frozenset(roles))
+                                  for a, roles in catalog.AREAS.items() if roles})
+    return _ROLES[1]
+
+
+def warm():
+    """Carga (o regenera) la tabla por adelantado."""
+    _TABLE.ensure()
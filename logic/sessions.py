@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# Estado compacto por sesión + gestor de sesiones (modo servidor web)
+
+import sys
+import threading
+import time
+import uuid
+from array import array
+from types import MappingProxyType
+from typing import Dict, Iterator, Optional, Tuple
+
+from data.catalog import AREAS, SEED_FAVORITES
+
+# -------- Catálogo congelado, compartido por todas las sesiones --------
+AREA_KEYS: Tuple[str, ...] = tuple(AREAS)
+_COL = MappingProxyType({a: i for i, a in enumerate(AREA_KEYS)})
+FROZEN_AREAS = MappingProxyType({a: tuple(roles) for a, roles in AREAS.items()})   # área -> roles (solo lectura)
+SEED_FAVORITES_T: Tuple[str, ...] = tuple(SEED_FAVORITES)
+
+IDLE_TIMEOUT_S = 30 * 60        # sesión sin actividad -> se libera
+SESSION_BUDGET = 256 * 1024     # bytes aprox. por sesión antes de recortar historial
+SWEEP_EVERY_S = 60
+
+
+class AreaVector:
+    """
+    Vector área -> número respaldado por un `array` (4-8 bytes por área en vez
+    de un dict por sesión). Se usa como un dict: v[a], v[a] += 1, items(), copy().
+    """
+    __slots__ = ("_v",)
+
+    def __init__(self, typecode: str = "i"):
+        self._v = array(typecode, bytes(array(typecode).itemsize * len(AREA_KEYS)))
+
+    def __getitem__(self, area: str):
+        return self._v[_COL[area]]
+
+    def __setitem__(self, area: str, value):
+        self._v[_COL[area]] = value
+
+    def __contains__(self, area) -> bool:
+        return area in _COL
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(AREA_KEYS)
+
+    def __len__(self) -> int:
+        return len(AREA_KEYS)
+
+    def get(self, area: str, default=None):
+        i = _COL.get(area)
+        return default if i is None else self._v[i]
+
+    def keys(self):
+        return AREA_KEYS
+
+    def values(self):
+        return self._v.tolist()
+
+    def items(self):
+        return zip(AREA_KEYS, self._v)
+
+    def copy(self) -> Dict[str, float]:
+        return dict(zip(AREA_KEYS, self._v))
+
+    def clear_values(self):
+        for i in range(len(self._v)):
+            self._v[i] = 0
+
+    def nbytes(self) -> int:
+        return self._v.itemsize * len(self._v)
+
+
+class SessionState:
+    """Estado del test/juegos de UNA sesión (sin dicts por instancia)."""
+    __slots__ = ("stage", "q_index", "answers", "scores", "game_scores", "game_counts",
+                 "last_area", "last_prof_index", "last_result", "favorites")
+
+    def __init__(self):
+        self.stage = "menu"   # menu | test | result | favorites
+        self.q_index = 0
+        self.answers = array("b")            # índice de opción elegido por pregunta
+        self.scores = AreaVector("i")         # conteos del test
+        self.game_scores = AreaVector("d")    # suma de puntajes de juegos
+        self.game_counts = AreaVector("i")    # cuántos juegos por área
+        self.last_area = None
+        self.last_prof_index = 0
+        self.last_result = None
+        # tupla compartida hasta que el usuario guarde sus propias favoritas
+        self.favorites = SEED_FAVORITES_T
+
+    def reset_test(self):
+        self.q_index = 0
+        self.answers = array("b")
+        self.scores.clear_values()
+
+    def nbytes(self) -> int:
+        n = sys.getsizeof(self) + self.scores.nbytes() + self.game_scores.nbytes()
+        n += self.game_counts.nbytes() + sys.getsizeof(self.answers)
+        if self.favorites is not SEED_FAVORITES_T:
+            n += sys.getsizeof(self.favorites) + sum(sys.getsizeof(f) for f in self.favorites)
+        if self.last_result:
+            n += len(repr(self.last_result))
+        return n
+
+
+def state_field(name: str) -> property:
+    """Atributo del controlador que delega en `self.state.<name>`."""
+    return property(lambda self: getattr(self.state, name),
+                    lambda self, value: setattr(self.state, name, value))
+
+
+# -------- Gestor de sesiones --------
+class _Session:
+    __slots__ = ("sid", "controller", "created")
+
+    def __init__(self, sid: str, controller):
+        self.sid = sid
+        self.controller = controller
+        self.created = time.monotonic()
+
+
+class SessionManager:
+    """
+    Registro de controladores vivos (uno por página/pestaña):
+      - libera las sesiones inactivas más de `idle_timeout` segundos
+      - recorta el historial de las que superan `budget` bytes
+      - `report()` da sesiones activas y memoria aproximada
+    """
+
+    def __init__(self, idle_timeout: float = IDLE_TIMEOUT_S, budget: int = SESSION_BUDGET):
+        self.idle_timeout = idle_timeout
+        self.budget = budget
+        self.evicted = 0
+        self._sessions: Dict[str, _Session] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, controller, sid: Optional[str] = None) -> str:
+        sid = sid or uuid.uuid4().hex[:12]
+        with self._lock:
+            self._sessions[sid] = _Session(sid, controller)
+        return sid
+
+    def drop(self, sid: str, release: bool = False):
+        with self._lock:
+            s = self._sessions.pop(sid, None)
+        if s is not None and release:
+            try:
+                s.controller.release()
+            except Exception as e:
+                print(f"⚠️ Error liberando sesión {sid}: {e}")
+
+    def sweep(self):
+        """Desaloja inactivas y aplica el presupuesto de memoria."""
+        now = time.monotonic()
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for s in sessions:
+            idle = now - s.controller.ui.last_activity
+            if idle > self.idle_timeout:
+                if self._evict(s):
+                    self.evicted += 1
+            elif s.controller.memory_estimate() > self.budget:
+                s.controller.history.drop_archived()
+
+    def _evict(self, s: _Session) -> bool:
+        """
+        Vuelve a mirar la inactividad bajo el lock (pudo haber actividad desde la
+        lectura de sweep) y no desaloja si hay una acción en curso en la página.
+        """
+        ui = s.controller.ui
+        with self._lock:
+            if time.monotonic() - ui.last_activity <= self.idle_timeout or ui.busy:
+                return False
+            if self._sessions.pop(s.sid, None) is None:
+                return False
+        try:
+            s.controller.release()
+        except Exception as e:
+            print(f"⚠️ Error liberando sesión {s.sid}: {e}")
+        return True
+
+    def report(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            sessions = list(self._sessions.values())
+        mem = [s.controller.memory_estimate() for s in sessions]
+        idle = [now - s.controller.ui.last_activity for s in sessions]
+        return {
+            "sessions": len(sessions),
+            "evicted": self.evicted,
+            "memory_bytes": sum(mem),
+            "max_session_bytes": max(mem, default=0),
+            "max_idle_s": round(max(idle, default=0.0), 1),
+        }
+
+    def start(self, every: float = SWEEP_EVERY_S, verbose: bool = True):
+        """Hilo de fondo: sweep() periódico (+ una línea de reporte)."""
+        if self._thread is not None:
+            return
+
+        def _loop():
+            while True:
+                time.sleep(every)
+                try:
+                    self.sweep()
+                    if verbose:
+                        r = self.report()
+                        print(f"📊 sesiones={r['sessions']} memoria≈{r['memory_bytes'] / 1024:.0f} KiB "
+                              f"(máx {r['max_session_bytes'] / 1024:.0f} KiB) desalojadas={r['evicted']}")
+                except Exception as e:
+                    print(f"⚠️ Error en limpieza de sesiones: {e}")
+
+        self._thread = threading.Thread(target=_loop, name="sessions-sweep", daemon=True)
+        self._thread.start()
+
+
+SESSIONS = SessionManager()
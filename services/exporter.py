@@ -3,15 +3,10 @@
 
 import json
 import datetime
+import importlib.util
 
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem
-    from reportlab.lib.units import cm
-    REPORTLAB = True
-except Exception:
-    REPORTLAB = False
+# reportlab es opcional y pesado: solo se comprueba si existe; se importa en build_pdf
+REPORTLAB = importlib.util.find_spec("reportlab") is not None
 
 def export_all(result: dict) -> list[str]:
     ts = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -50,6 +45,11 @@ h1{{margin-bottom:4px}}.sub{{color:#666}}.card{{border:1px solid #e5e7eb;padding
 </body></html>"""
 
 def build_pdf(pdf_name: str, lr: dict):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, ListFlowable, ListItem
+    from reportlab.lib.units import cm
+
     doc = SimpleDocTemplate(pdf_name, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=2*cm, bottomMargin=2*cm)
     styles = getSampleStyleSheet()
     elems = [
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Micro-benchmark de ui.widgets.bubble: controles creados y bytes serializados por mensaje
+# Uso: python tools/bench_bubble.py [n_mensajes]
+import os, sys, json, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import flet as ft
+from flet.core.protocol import CommandEncoder
+from ui.widgets import HEX, bubble
+
+
+def bubble_legacy(text: str, user: bool = False):
+    """Versión anterior (referencia): dos avatares + hueco + tres niveles."""
+    user_avatar = ft.CircleAvatar(content=ft.Text("🐣", size=20), bgcolor=HEX["ACCENT"])
+    bot_avatar  = ft.CircleAvatar(content=ft.Text("🤖", size=20))
+    return ft.Row(
+        [
+            ft.Container(
+                ft.Row(
+                    [user_avatar if user else bot_avatar, ft.Container(width=6), ft.Text(text, size=14, selectable=True)],
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
+                bgcolor=HEX["USER"] if user else HEX["BOT"],
+                padding=12,
+                border=ft.border.all(1, HEX["BORDER"]),
+                border_radius=16 if user else 12,
+                width=740,
+            )
+        ],
+        alignment=ft.MainAxisAlignment.END if user else ft.MainAxisAlignment.START,
+    )
+
+
+class _Counter:
+    """Cuenta instancias de ft.Control creadas mientras está activo."""
+    def __enter__(self):
+        self.n = 0
+        self._orig = ft.Control.__init__
+        counter = self
+
+        def _init(ctrl, *a, **kw):
+            counter.n += 1
+            counter._orig(ctrl, *a, **kw)
+        ft.Control.__init__ = _init
+        return self
+
+    def __exit__(self, *exc):
+        ft.Control.__init__ = self._orig
+
+
+def serialized_bytes(control) -> int:
+    cmds = control._build_add_commands(index={}, added_controls=[])
+    return len(json.dumps(cmds, cls=CommandEncoder).encode("utf-8"))
+
+
+def measure(name, factory, n: int):
+    texts = [f"Mensaje de prueba número {i} 🤖" for i in range(n)]
+    with _Counter() as c:
+        t0 = time.perf_counter()
+        built = [factory(t, i % 2 == 0) for i, t in enumerate(texts)]
+        dt = time.perf_counter() - t0
+    sizes = [serialized_bytes(b) for b in built]
+    print(f"{name:10s} controles/msg={c.n / n:5.1f}  bytes/msg={sum(sizes) / n:7.1f}  "
+          f"construcción={dt / n * 1e6:6.1f} µs/msg")
+
+
+def main(n: int = 2000):
+    print(f"{n} mensajes (mitad usuario, mitad bot)")
+    measure("antes", bubble_legacy, n)
+    measure("ahora", lambda t, u: bubble(t, user=u), n)
+    measure("compacto", lambda t, u: bubble(t, user=u, compact=True), n)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Búsqueda de la IA de Damas: un proceso vs raíz repartida en N procesos (speedup por nº de procesos)
+# Uso: python tools/bench_damas_ai.py [--depth 10] [--workers 1 2 4]
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from games.damas import bitboard as bb
+from games.damas.ai import DamasAI, ParallelSearcher, Searcher
+
+
+def positions(plies=(0, 12, 24)):
+    """Inicial + posiciones de medio juego reproducibles (nivel fácil con semilla fija)."""
+    out = []
+    pos, ai = bb.Position(), DamasAI("facil", seed=7, workers=1)
+    for ply in range(max(plies) + 1):
+        if ply in plies:
+            out.append((f"ply{ply}", pos.copy()))
+        m = ai.choose(pos)
+        if m is None:
+            break
+        pos.play(m)
+    return out
+
+
+def run(searcher, pos: bb.Position, depth: int):
+    t = time.perf_counter()
+    r = searcher.search(pos, depth, 3600)
+    return time.perf_counter() - t, r
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--depth", type=int, default=10)
+    ap.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    a = ap.parse_args()
+
+    cases = positions()
+    print(f"Damas IA — profundidad {a.depth}, {os.cpu_count()} núcleo(s)")
+    if max(a.workers) > (os.cpu_count() or 1):
+        print("⚠️ Más procesos que núcleos: el speedup medido será < 1; mira la columna de nodos extra")
+    print(f"{'posición':<10}{'procesos':>9}{'tiempo':>10}{'nodos':>11}{'extra':>7}{'speedup':>9}  puntaje")
+    for name, pos in cases:
+        base, r1 = run(Searcher(), pos, a.depth)
+        print(f"{name:<10}{1:>9}{base:>9.2f}s{r1.nodes:>11,}{1.0:>6.2f}x{1.0:>8.2f}x  {r1.score} {r1.move}")
+        for w in a.workers:
+            ps = ParallelSearcher(w)          # procesos ya creados: el arranque no entra en la medida
+            try:
+                secs, r = run(ps, pos, a.depth)
+            finally:
+                ps.close()
+            same = "=" if r.score == r1.score else "≠"
+            extra = r.nodes / max(r1.nodes, 1)
+            print(f"{'':<10}{w:>9}{secs:>9.2f}s{r.nodes:>11,}{extra:>6.2f}x{base / secs:>8.2f}x  {r.score} {r.move} {same}")
+
+
+if __name__ == "__main__":
+    main()
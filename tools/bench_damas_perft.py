@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Perft de Damas: nodos/segundo del motor bitboard vs el generador 8×8 anterior
+# Uso: python tools/bench_damas_perft.py [--depth 7] [--forced] [--skip-legacy]
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from games.damas import bitboard as bb
+
+
+# ---- generador anterior (lista de listas + movimientos_validos por ficha) ----
+def _legacy_board():
+    t = [[0] * 8 for _ in range(8)]
+    for f in range(8):
+        for c in range(8):
+            if (f + c) % 2 != 0:
+                t[f][c] = 2 if f < 3 else 1 if f > 4 else 0
+    return t
+
+
+def _legacy_moves(t, f, c):
+    j = t[f][c]
+    moves = []
+    for df, dc in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+        nf, nc = f + df, c + dc
+        if 0 <= nf < 8 and 0 <= nc < 8:
+            if t[nf][nc] == 0:
+                moves.append((nf, nc, None))
+            elif t[nf][nc] != j:
+                sf, sc = nf + df, nc + dc
+                if 0 <= sf < 8 and 0 <= sc < 8 and t[sf][sc] == 0:
+                    moves.append((sf, sc, (nf, nc)))
+    return moves
+
+
+def _legacy_perft(t, turn, depth, forced):
+    if depth == 0:
+        return 1
+    moves = [(f, c, m) for f in range(8) for c in range(8) if t[f][c] == turn
+             for m in _legacy_moves(t, f, c)]
+    if forced and any(m[2][2] for m in moves):
+        moves = [m for m in moves if m[2][2]]
+    if depth == 1:
+        return len(moves)
+    total = 0
+    for f, c, (nf, nc, cap) in moves:
+        t[nf][nc], t[f][c] = turn, 0
+        if cap:
+            t[cap[0]][cap[1]] = 0
+        total += _legacy_perft(t, 3 - turn, depth - 1, forced)
+        t[f][c], t[nf][nc] = turn, 0
+        if cap:
+            t[cap[0]][cap[1]] = 3 - turn
+    return total
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--depth", type=int, default=7)
+    ap.add_argument("--forced", action="store_true", help="captura obligatoria")
+    ap.add_argument("--skip-legacy", action="store_true")
+    a = ap.parse_args()
+
+    print(f"{'prof':>4} {'nodos':>12} {'bitboard':>10} {'nodos/s':>12} {'8×8':>10} {'nodos/s':>12} {'×':>6}")
+    for d, n, s in bb.perft_report(range(1, a.depth + 1), a.forced):
+        line = f"{d:>4} {n:>12,} {s * 1000:>8.0f}ms {n / max(s, 1e-9):>12,.0f}"
+        if not a.skip_legacy:
+            t = time.perf_counter()
+            n_old = _legacy_perft(_legacy_board(), 1, d, a.forced)
+            s_old = time.perf_counter() - t
+            assert n_old == n, f"perft({d}) distinto: {n_old} vs {n}"
+            line += f" {s_old * 1000:>8.0f}ms {n_old / max(s_old, 1e-9):>12,.0f} {s_old / max(s, 1e-9):>5.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Benchmark: smart_infer_area (exacto) vs smart_infer_area_fuzzy (sin tildes + typos)
+# Uso: python tools/bench_fuzzy_infer.py [repeticiones]
+import os, sys, time, statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from logic.engine import smart_infer_area, smart_infer_area_fuzzy
+
+# (mensaje, área esperada)
+SAMPLES = [
+    ("me encanta la programación y crear apps", "Tecnología"),
+    ("me gusta la programacion", "Tecnología"),
+    ("quiero aprender a progarmar", "Tecnología"),
+    ("escribir codigo todo el dia", "Tecnología"),
+    ("analizar datos y bases de datos", "Tecnología"),
+    ("ciberseguridad y redes", "Tecnología"),
+    ("quiero estudiar enfermeria", "Salud"),
+    ("quiero estudiar enfemeria", "Salud"),
+    ("trabajar en un hopsital con pacientes", "Salud"),
+    ("nutricion y terapia", "Salud"),
+    ("ser medicina general", "Salud"),
+    ("marketing y ventas para una empresa", "Negocios"),
+    ("llevar las finansas de un negocio", "Negocios"),
+    ("ser analista comercial", "Negocios"),
+    ("diseno de interfaces y ux", "Arte y Diseño"),
+    ("me gusta la fotografia", "Arte y Diseño"),
+    ("ilustracion y animacion", "Arte y Diseño"),
+    ("arquitectura de casas", "Arte y Diseño"),
+    ("ensenar a ninos", "Educación y Sociales"),
+    ("ser docente en mi comunidad", "Educación y Sociales"),
+    ("psicologia y trabajo sosial", "Educación y Sociales"),
+    ("cuidar el ambiente y la ecologia", "Ambiente y Agro"),
+    ("biologia y bosques", "Ambiente y Agro"),
+    ("trabajar en el campo, agroindustria", "Ambiente y Agro"),
+    ("la mecanica automotriz", "Oficios e Ingeniería"),
+    ("construir casas y leer planos", "Oficios e Ingeniería"),
+    ("soldar y reparar en un taller", "Oficios e Ingeniería"),
+    ("instalaciones electricas", "Oficios e Ingeniería"),
+    ("hola, no sé qué me gusta", None),
+    ("me gusta el fútbol", None),
+    # negativos: palabras comunes parecidas a una keyword corta ("campo")
+    ("quiero ser campeón", None),
+    ("soy campeón de ajedrez", None),
+]
+
+
+def run(fn, reps: int):
+    lat = []
+    hits = ok = 0
+    for _ in range(reps):
+        for msg, _ in SAMPLES:
+            t0 = time.perf_counter()
+            fn(msg)
+            lat.append((time.perf_counter() - t0) * 1e6)
+    for msg, expected in SAMPLES:
+        area, pts = fn(msg)[:2]
+        if pts > 0:
+            hits += 1
+        if (pts > 0 and area == expected) or (pts == 0 and expected is None):
+            ok += 1
+    lat.sort()
+    return {
+        "p50_us": statistics.median(lat),
+        "p95_us": lat[int(0.95 * (len(lat) - 1))],
+        "hit_rate": hits / len(SAMPLES),
+        "accuracy": ok / len(SAMPLES),
+    }
+
+
+def main(reps: int = 200):
+    print(f"{len(SAMPLES)} mensajes × {reps} repeticiones")
+    for name, fn in (("exacto", smart_infer_area), ("difuso", smart_infer_area_fuzzy)):
+        r = run(fn, reps)
+        print(f"{name:7s} p50={r['p50_us']:7.1f} µs  p95={r['p95_us']:7.1f} µs  "
+              f"aciertos={r['hit_rate']:.0%}  exactitud={r['accuracy']:.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
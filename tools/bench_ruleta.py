@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+# Benchmark reproducible del render de la ruleta con línea base en JSON
+# Cada caso se cronometra intercalado con una carga de referencia fija (PIL + NumPy, sin
+# código de la ruleta) y se compara el cociente min(caso) / min(referencia) de la misma corrida
+# Uso: python tools/bench_ruleta.py                    (compara con la línea base; exit 1 si empeora)
+#      python tools/bench_ruleta.py --save-baseline    (guarda la mediana de 3 pasadas como línea base)
+#      python tools/bench_ruleta.py --full --repeat 15 (más tamaños / segmentos / repeticiones)
+import argparse, gc, json, os, platform, sys, time, tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image
+
+from games.ruleta import draw
+from games.ruleta.atlas import ATLAS
+from games.ruleta.config import SEGMENTS
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_ruleta_baseline.json")
+THRESHOLD = 0.30          # +30% en el cociente caso/referencia (o en memoria pico) = regresión
+SLOW_MS = 100.0           # casos más lentos: banda más ancha (el ruido crece con la duración)
+SLOW_THRESHOLD = 0.45
+MIN_DELTA_MS = 2.0        # por debajo de esto el ruido manda
+BASELINE_ROUNDS = 3       # la línea base guarda la mediana de varias pasadas (una sola puede salir atípica)
+
+SIZES = (400, 560, 800)
+SIZES_FULL = (400, 560, 800, 1200)
+COUNTS = (3, 10, 24)
+COUNTS_FULL = (3, 6, 10, 16, 24)
+STYLES = ("tangent", "radial")
+RENDERERS = ("numpy", "pil")
+
+
+def labels(n: int):
+    return [SEGMENTS[i % len(SEGMENTS)] + ("" if i < len(SEGMENTS) else f" {i // len(SEGMENTS) + 1}")
+            for i in range(n)]
+
+
+def _pct(sorted_ms, q: float) -> float:
+    i = min(len(sorted_ms) - 1, max(0, int(round(q * (len(sorted_ms) - 1)))))
+    return sorted_ms[i]
+
+
+def _reference():
+    """
+    Carga fija del mismo tipo que un render (pieslices, texto rotado, LANCZOS, NumPy)
+    pero sin código de games/ruleta: marca la velocidad de la máquina en cada momento.
+    """
+    import numpy as np
+    from PIL import ImageDraw, ImageFont
+    font = ImageFont.load_default()
+    axis = np.arange(400, dtype=np.float32)
+
+    def work():
+        img = Image.new("RGBA", (600, 600), (0, 0, 0, 0))
+        d = ImageDraw.Draw(img)
+        for k in range(10):
+            d.pieslice((0, 0, 600, 600), k * 36, (k + 1) * 36, fill=(20 * k, 90, 200, 255),
+                       outline="white", width=6)
+        for k in range(12):
+            t = Image.new("RGBA", (120, 60), (0, 0, 0, 0))
+            ImageDraw.Draw(t).text((10, 20), "Comunicación", font=font, fill="white")
+            img.alpha_composite(t.rotate(k * 30, expand=True, resample=Image.BICUBIC), (240, 240))
+        img.resize((200, 200), Image.LANCZOS)
+        np.degrees(np.arctan2(axis[:, None], axis[None, :])).sum()
+    return work
+
+
+REFERENCE = None
+
+
+def measure(fn, repeat: int, warmup: int = 2, memory: bool = True) -> dict:
+    """
+    Tiempos (ms) intercalando caso y referencia en `repeat` corridas:
+      p50/p95 del caso, ref_ms = min de la referencia, rel = min(caso) / ref_ms.
+    El mínimo es la medida menos afectada por interrupciones de la máquina.
+    Pico de memoria Python (tracemalloc) en una corrida aparte si `memory`.
+    """
+    global REFERENCE
+    if REFERENCE is None:
+        REFERENCE = _reference()
+    for _ in range(warmup):
+        REFERENCE()
+        fn()
+    times, refs = [], []
+    gc.collect()
+    gc.disable()             # como timeit: una recolección no cae al azar dentro de un caso
+    try:
+        for _ in range(repeat):
+            t = time.perf_counter()
+            REFERENCE()
+            t1 = time.perf_counter()
+            fn()
+            t2 = time.perf_counter()
+            refs.append((t1 - t) * 1000.0)
+            times.append((t2 - t1) * 1000.0)
+    finally:
+        gc.enable()
+    times.sort()
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        finally:
+            tracemalloc.stop()
+    ref = min(refs)
+    return {"p50_ms": round(_pct(times, 0.50), 3), "p95_ms": round(_pct(times, 0.95), 3),
+            "min_ms": round(times[0], 3), "ref_ms": round(ref, 3), "rel": round(times[0] / ref, 4),
+            "peak_kib": peak, "n": repeat}
+
+
+class _Config:
+    """Cambia RENDERER / TEXT_STYLE de draw.py durante un caso y los restaura."""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def __enter__(self):
+        self.prev = {k: getattr(draw, k) for k in self.values}
+        for k, v in self.values.items():
+            setattr(draw, k, v)
+
+    def __exit__(self, *exc):
+        for k, v in self.prev.items():
+            setattr(draw, k, v)
+
+
+def cases(full: bool):
+    """
+    (nombre, config, función, memoria) — mismo orden y mismos datos en cada ejecución.
+    memoria=False en los casos de PIL: tracemalloc no ve sus buffers (siempre ~4 KiB).
+    """
+    sizes = SIZES_FULL if full else SIZES
+    counts = COUNTS_FULL if full else COUNTS
+    out = []
+    for renderer in RENDERERS:
+        for style in STYLES:
+            for size in sizes:
+                for n in counts:
+                    segs = labels(n)
+                    out.append((f"render/{renderer}/{style}/{size}/{n}",
+                                {"RENDERER": renderer, "TEXT_STYLE": style},
+                                lambda segs=segs, size=size: draw.render_wheel(segs, size),
+                                renderer == "numpy"))
+
+    # codificación PNG + base64 aparte (misma imagen en cada corrida)
+    for size in sizes:
+        with _Config(RENDERER="numpy", TEXT_STYLE="tangent"):
+            img = draw.render_wheel(SEGMENTS, size)
+        out.append((f"encode/png/{size}", {}, lambda img=img: draw.encode_png_base64(img), True))
+
+    # una etiqueta suelta, al tamaño de lienzo de cada modo (×SCALE y escala 1)
+    for style, fn in (("tangent", draw._render_label_tangent), ("radial", draw._render_label_radial)):
+        for scale in (draw.SCALE, 1):
+            side = 560 * scale
+            canvas = Image.new("RGBA", (side, side), (0, 0, 0, 0))
+            out.append((f"label/{style}/x{scale}", {},
+                        lambda fn=fn, canvas=canvas, side=side, scale=scale:
+                        fn(canvas, "Comunicación", (side // 2, side // 2), 54.0, side // 2, 36.0, scale=scale),
+                        False))
+
+    # atlas frío: primer render tras arrancar el proceso
+    out.append(("render/numpy/tangent/560/10/cold", {"RENDERER": "numpy", "TEXT_STYLE": "tangent"},
+                lambda: (ATLAS.clear(), draw._FIELDS.clear(), draw.render_wheel(SEGMENTS, 560)), True))
+    return out
+
+
+def run(full: bool, repeat: int, only: str = "", names=None) -> dict:
+    results = {}
+    for name, config, fn, memory in cases(full):
+        if (only and only not in name) or (names is not None and name not in names):
+            continue
+        with _Config(**config):
+            results[name] = measure(fn, repeat, memory=memory)
+        r = results[name]
+        peak = f"{r['peak_kib']:9.1f} KiB" if r["peak_kib"] is not None else "        -"
+        print(f"  {name:<40} p50 {r['p50_ms']:8.1f} ms  min {r['min_ms']:8.1f} ms  "
+              f"×ref {r['rel']:7.3f}  pico {peak}")
+    return results
+
+
+def _meta() -> dict:
+    return {
+        "python": platform.python_version(), "machine": platform.machine(),
+        "system": platform.system(), "processor": platform.processor(),
+        "SCALE": draw.SCALE, "BASE_FONT_SIZE": draw.BASE_FONT_SIZE,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Lista de (caso, métrica, antes, ahora) que empeoran más de `threshold`
+    (SLOW_THRESHOLD si el caso pasa de SLOW_MS). El tiempo se compara como
+    cociente con la referencia de su propia corrida, no en ms absolutos.
+    """
+    bad = []
+    for name, r in results.items():
+        b = baseline.get("results", {}).get(name)
+        if b is None or "rel" not in b:
+            continue
+        limit = max(threshold, SLOW_THRESHOLD) if b["min_ms"] > SLOW_MS else threshold
+        expected_ms = b["rel"] * r["ref_ms"]        # lo que tardaría hoy sin regresión
+        if r["rel"] > b["rel"] * (1 + limit) and r["min_ms"] - expected_ms > MIN_DELTA_MS:
+            bad.append((name, "×ref", b["rel"], r["rel"]))
+        if r["peak_kib"] is not None and b.get("peak_kib") is not None \
+                and r["peak_kib"] > b["peak_kib"] * (1 + threshold) and r["peak_kib"] - b["peak_kib"] > 64:
+            bad.append((name, "peak_kib", b["peak_kib"], r["peak_kib"]))
+    return bad
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD, help="0.25 = +25%% permitido")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--full", action="store_true", help="tamaños 400-1200 y 3-24 segmentos")
+    ap.add_argument("--only", default="", help="solo casos que contengan este texto")
+    ap.add_argument("--rounds", type=int, default=BASELINE_ROUNDS, help="pasadas para --save-baseline")
+    ap.add_argument("--json", default=None, help="guardar también los resultados en este fichero")
+    a = ap.parse_args()
+
+    print(f"Ruleta — SCALE={draw.SCALE} BASE_FONT_SIZE={draw.BASE_FONT_SIZE} repeat={a.repeat}")
+    results = run(a.full, a.repeat, a.only)
+    if a.save_baseline:
+        rounds = [results]
+        for k in range(2, a.rounds + 1):
+            print(f"\n— pasada {k}/{a.rounds} —")
+            rounds.append(run(a.full, a.repeat, a.only))
+        results = {name: sorted((r[name] for r in rounds), key=lambda m: m["rel"])[len(rounds) // 2]
+                   for name in results}
+    report = {"meta": _meta(), "results": results}
+    if a.json:
+        with open(a.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+
+    if a.save_baseline:
+        with open(a.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+        print(f"\n💾 Línea base guardada en {a.baseline}")
+        return 0
+
+    try:
+        with open(a.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        print(f"\n⚠️ Sin línea base en {a.baseline} (usa --save-baseline)")
+        return 0
+    if not any("rel" in r for r in baseline.get("results", {}).values()):
+        print(f"\n⚠️ Línea base sin cocientes de referencia (formato antiguo): regenera con --save-baseline")
+        return 0
+    meta = baseline.get("meta", {})
+    if (meta.get("machine"), meta.get("python")) != (platform.machine(), platform.python_version()):
+        print(f"\n⚠️ Línea base de otra máquina/intérprete ({meta.get('machine')}, Python {meta.get('python')})")
+    bad = compare(results, baseline, a.threshold)
+    if bad:
+        # confirmar: repetir solo los casos sospechosos (el ruido de la máquina no es regresión)
+        print(f"\n🔁 Repitiendo {len(bad)} caso(s) por encima del umbral...")
+        again = run(a.full, a.repeat * 2, names={b[0] for b in bad})
+        bad = compare(again, baseline, a.threshold)
+        results.update(again)
+    if bad:
+        print(f"\n❌ Regresiones (> {a.threshold:.0%} sobre la línea base, {SLOW_THRESHOLD:.0%} si > {SLOW_MS:.0f} ms):")
+        for name, metric, before, now in bad:
+            print(f"  {name:<40} {metric}: {before} -> {now}")
+        return 1
+    print(f"\n✅ Sin regresiones (umbral {a.threshold:.0%}, {len(results)} casos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Benchmark del render de la ruleta: NumPy (tamaño final) vs PIL (×SCALE + LANCZOS)
+# Uso: python tools/bench_wheel_render.py [--sizes 400 560 800 1200] [--segments 3 6 10 16 24] [--repeat 3]
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from games.ruleta import draw
+from games.ruleta.atlas import ATLAS
+from games.ruleta.config import SEGMENTS
+
+
+def labels(n: int):
+    """n etiquetas a partir de las áreas reales (con sufijo si se repiten)."""
+    return [SEGMENTS[i % len(SEGMENTS)] + ("" if i < len(SEGMENTS) else f" {i // len(SEGMENTS) + 1}")
+            for i in range(n)]
+
+
+def timed(segments, size, renderer, reference=False, repeat=3):
+    prev, draw.RENDERER = draw.RENDERER, renderer
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            t = time.perf_counter()
+            draw.make_wheel_base64(segments, size, reference=reference)
+            best = min(best, time.perf_counter() - t)
+        return best
+    finally:
+        draw.RENDERER = prev
+
+
+def main(sizes, counts, repeat):
+    print(f"{'tamaño':>6} {'seg':>4} {'referencia':>11} {'pil+atlas':>10} {'numpy':>8} {'numpy frío':>11} {'×':>6}")
+    for size in sizes:
+        for n in counts:
+            segs = labels(n)
+            ref = timed(segs, size, "pil", reference=True, repeat=1)
+            pil = timed(segs, size, "pil", repeat=repeat)
+            ATLAS.clear()
+            draw._FIELDS.clear()
+            cold = timed(segs, size, "numpy", repeat=1)
+            fast = timed(segs, size, "numpy", repeat=repeat)
+            print(f"{size:>6} {n:>4} {ref * 1000:>9.0f}ms {pil * 1000:>8.0f}ms {fast * 1000:>6.0f}ms"
+                  f" {cold * 1000:>9.0f}ms {ref / fast:>5.1f}x")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[400, 560, 800, 1200])
+    ap.add_argument("--segments", type=int, nargs="+", default=[3, 6, 10, 16, 24])
+    ap.add_argument("--repeat", type=int, default=3)
+    a = ap.parse_args()
+    main(a.sizes, a.segments, a.repeat)
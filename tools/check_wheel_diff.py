@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Compara la rueda renderizada (atlas de glifos / rasterizado NumPy) contra el render de referencia
+# Uso: python tools/check_wheel_diff.py [--renderer numpy|pil] [--size 560] [--step 1.0] [--save /tmp/diff.png]
+import argparse, base64, io, os, sys, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from PIL import Image
+
+from games.ruleta import draw
+from games.ruleta.atlas import ATLAS
+from games.ruleta.config import SEGMENTS, WHEEL_SIZE
+from games.ruleta.draw import make_wheel_base64
+
+BAD_LEVEL = 32
+# renderer -> (desplazamiento tolerado en px, diferencia media máx., fracción máx. de píxeles > BAD_LEVEL)
+#   pil:   mismo lienzo ×SCALE, solo cambian las etiquetas (atlas)
+#   numpy: otro rasterizador; los bordes antialiasados pueden caer 1 px al lado
+TOLERANCE = {
+    "pil":   (0, 1.0, 0.005),
+    "numpy": (1, 3.0, 0.03),
+}
+
+
+def _decode(b64: str) -> np.ndarray:
+    return np.asarray(Image.open(io.BytesIO(base64.b64decode(b64))).convert("RGBA")).astype(np.int16)
+
+
+def pixel_diff(img: np.ndarray, ref: np.ndarray, shift: int = 0) -> np.ndarray:
+    """Máx. diferencia por canal de cada píxel contra el mejor vecino de `ref` a ≤ shift px."""
+    h, w = img.shape[:2]
+    pad = np.pad(ref, ((shift, shift), (shift, shift), (0, 0)), mode="edge")
+    best = None
+    for dy in range(2 * shift + 1):
+        for dx in range(2 * shift + 1):
+            d = np.abs(img - pad[dy:dy + h, dx:dx + w]).max(axis=2)
+            best = d if best is None else np.minimum(best, d)
+    return best
+
+
+def compare(segments=SEGMENTS, size: int = WHEEL_SIZE, renderer: str = "numpy"):
+    shift = TOLERANCE[renderer][0]
+    prev, draw.RENDERER = draw.RENDERER, renderer
+    try:
+        t0 = time.perf_counter()
+        ref = make_wheel_base64(segments, size, reference=True)
+        t1 = time.perf_counter()
+        ATLAS.clear()
+        new = make_wheel_base64(segments, size)
+        t2 = time.perf_counter()
+        new = make_wheel_base64(segments, size)          # atlas caliente
+        t3 = time.perf_counter()
+    finally:
+        draw.RENDERER = prev
+    diff = pixel_diff(_decode(new), _decode(ref), shift)
+    return {
+        "ref_s": t1 - t0, "cold_s": t2 - t1, "warm_s": t3 - t2,
+        "max": int(diff.max()), "mean": float(diff.mean()),
+        "bad_ratio": float((diff > BAD_LEVEL).mean()),
+        "diff": diff,
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--renderer", choices=sorted(TOLERANCE), default=draw.RENDERER)
+    ap.add_argument("--size", type=int, default=WHEEL_SIZE)
+    ap.add_argument("--step", type=float, default=None, help="ATLAS_ANGLE_STEP a probar")
+    ap.add_argument("--save", default=None, help="guardar mapa de diferencias (PNG)")
+    a = ap.parse_args()
+    if a.step is not None:
+        ATLAS.angle_step = a.step
+
+    r = compare(size=a.size, renderer=a.renderer)
+    _, max_mean, max_bad = TOLERANCE[a.renderer]
+    print(f"[{a.renderer}] referencia {r['ref_s'] * 1000:.0f} ms | frío {r['cold_s'] * 1000:.0f} ms"
+          f" | caliente {r['warm_s'] * 1000:.0f} ms")
+    print(f"diferencia: máx {r['max']}  media {r['mean']:.3f}  píxeles >{BAD_LEVEL}: {r['bad_ratio']:.4%}")
+    if a.save:
+        Image.fromarray(np.clip(r["diff"] * 4, 0, 255).astype(np.uint8)).save(a.save)
+
+    ok = r["mean"] <= max_mean and r["bad_ratio"] <= max_bad
+    print("✅ Dentro de la tolerancia" if ok else "❌ Fuera de la tolerancia")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Coste de importación del arranque (python -X importtime) con presupuesto fijo
+# Uso: python app.py --startup-profile   |   python tools/startup_profile.py [--budget-ms 900]
+import os, re, subprocess, sys, argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STARTUP_BUDGET_MS = 900        # import de app.py hasta poder mostrar el saludo
+ENTRY = "import app"           # lo mismo que carga `python app.py` antes de ft.app()
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(entry: str = ENTRY):
+    """Devuelve [(módulo, self_us, cumulative_us, nivel)] y el total en µs."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", entry],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "error")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cum_us, indent, mod = int(m[1]), int(m[2]), len(m[3]), m[4]
+            rows.append((mod, self_us, cum_us, (indent - 1) // 2))
+    total = sum(r[2] for r in rows if r[3] == 0)
+    return rows, total
+
+
+_OURS = ("app", "logic", "ui", "data", "games", "services", "tools")
+
+
+def report(budget_ms: float = STARTUP_BUDGET_MS, top: int = 20, entry: str = ENTRY) -> int:
+    rows, total = measure(entry)
+    print(f"Arranque ({entry}): {total / 1000:.0f} ms — presupuesto {budget_ms:.0f} ms\n")
+
+    print("Módulos del proyecto (acumulado):")
+    for mod, _, cum, _ in sorted((r for r in rows if r[0].split(".")[0] in _OURS), key=lambda r: -r[2]):
+        print(f"  {cum / 1000:8.1f} ms  {mod}")
+
+    print("\nPaquetes externos (acumulado):")
+    pkgs = [r for r in rows if "." not in r[0] and r[0] not in _OURS]
+    for mod, _, cum, _ in sorted(pkgs, key=lambda r: -r[2])[:top]:
+        print(f"  {cum / 1000:8.1f} ms  {mod}")
+
+    heavy = [m for m in ("PIL", "pygame", "reportlab", "numpy", "pandas") if any(r[0] == m for r in rows)]
+    if heavy:
+        print(f"\n⚠️ Dependencias pesadas cargadas al inicio: {', '.join(heavy)}")
+
+    if total / 1000 > budget_ms:
+        print(f"\n❌ Arranque sobre el presupuesto ({total / 1000:.0f} > {budget_ms:.0f} ms)")
+        return 1
+    print("\n✅ Dentro del presupuesto")
+    return 0
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    ap.add_argument("--top", type=int, default=20)
+    a = ap.parse_args()
+    sys.exit(report(a.budget_ms, a.top))
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Agrupa page.update(): una sola sincronización con el cliente por acción del usuario
+
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from functools import wraps
+
+DEBOUNCE_MS = 80   # espera por defecto de schedule() (sliders, eventos en ráfaga)
+
+_BATCHERS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_REG_LOCK = threading.Lock()
+
+
+class UpdateBatcher:
+    """
+    Sustituye las llamadas sueltas a page.update():
+      - `update()` dentro de `with batch():` solo marca la página como sucia;
+        al cerrar el bloque más externo se hace UN page.update()
+      - fuera de un batch, `update()` sincroniza en el acto
+      - `schedule()` agrupa ráfagas (p. ej. on_change de un slider) con debounce
+    Cuenta las sincronizaciones por acción para poder medir la mejora.
+    """
+
+    def __init__(self, page, debounce_ms: int = DEBOUNCE_MS):
+        # referencia débil: el registro por página no debe mantenerla viva
+        self._page = weakref.ref(page)
+        self.debounce_ms = debounce_ms
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._dirty = False
+        self._timer = None
+        self.last_activity = time.monotonic()   # para desalojar sesiones inactivas
+        # métricas
+        self.flushes = 0          # page.update() reales
+        self.requests = 0         # update()/schedule() pedidos
+        self.actions = 0          # bloques batch() externos
+        self.last_action_flushes = 0
+        self._action_flushes = 0
+
+    @property
+    def page(self):
+        return self._page()
+
+    @property
+    def busy(self) -> bool:
+        """True mientras alguna acción (batch) está en curso."""
+        with self._lock:
+            return self._depth > 0
+
+    @classmethod
+    def for_page(cls, page) -> "UpdateBatcher":
+        """Un batcher por página (lo comparten controlador y diálogos)."""
+        with _REG_LOCK:
+            b = _BATCHERS.get(page)
+            if b is None:
+                b = _BATCHERS[page] = cls(page)
+            return b
+
+    # ---------- API ----------
+    def update(self):
+        with self._lock:
+            self.requests += 1
+            if self._depth > 0:
+                self._dirty = True
+                return
+        self.flush()
+
+    def schedule(self, delay_ms: int | None = None):
+        """Sincroniza tras `delay_ms` sin nuevas peticiones (debounce)."""
+        delay = self.debounce_ms if delay_ms is None else delay_ms
+        with self._lock:
+            self.requests += 1
+            self._dirty = True
+            if self._depth > 0:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay / 1000.0, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                self._action_flushes = 0
+                self.last_activity = time.monotonic()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                outer = self._depth == 0
+                pending = outer and self._dirty
+            if pending:
+                self.flush()
+            if outer:
+                with self._lock:
+                    self.actions += 1
+                    self.last_action_flushes = self._action_flushes
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._dirty = False
+            self.flushes += 1
+            self._action_flushes += 1
+        page = self.page
+        if page is not None:
+            page.update()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            if not self._dirty or self._depth > 0:
+                return
+        self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "flushes": self.flushes,
+            "requests": self.requests,
+            "actions": self.actions,
+            "last_action_flushes": self.last_action_flushes,
+        }
+
+
+def batched(method):
+    """Decorador para métodos de clases con `self.ui` (UpdateBatcher)."""
+    @wraps(method)
+    def _wrapper(self, *args, **kwargs):
+        with self.ui.batch():
+            return method(self, *args, **kwargs)
+    return _wrapper
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Historial de chat con ventana: solo los últimos N mensajes viven como controles
+
+import sys
+import flet as ft
+from ui.batching import UpdateBatcher
+from ui.widgets import bubble
+
+LIVE_MESSAGES = 60      # controles renderizados a la vez
+MAX_RECORDS = 1000      # tope de mensajes guardados (registros planos)
+PAGE_SIZE = 20          # cuántos se rematerializan al hacer scroll hacia arriba
+
+
+class ChatWindow:
+    """
+    Envuelve el ListView del chat:
+      - cada mensaje se guarda como registro compacto (tipo, texto, es_usuario)
+      - solo los últimos `live` registros tienen control en la página
+      - al llegar arriba con el scroll se vuelven a construir los anteriores
+      - `max_records` limita la memoria total (se descartan los más viejos)
+    Los bloques (juegos, listas) se guardan con un resumen de texto y, una vez
+    fuera de la ventana, se rematerializan como burbuja con ese resumen.
+    """
+
+    def __init__(self, live: int = LIVE_MESSAGES, max_records: int = MAX_RECORDS,
+                 page_size: int = PAGE_SIZE, compact: bool = False, **listview_kwargs):
+        self.live = max(1, live)
+        self.compact = compact   # burbujas solo texto para los mensajes nuevos
+        self.max_records = max(self.live, max_records)
+        self.page_size = max(1, page_size)
+        self.records: list[tuple[str, str, bool]] = []
+        self.start = 0   # índice en `records` del primer control vivo
+        self.view = ft.ListView(on_scroll=self._on_scroll, **listview_kwargs)
+
+    # ---------- Alta de mensajes ----------
+    def add_message(self, text: str, user: bool = False):
+        self._push(("msg", text, user), bubble(text, user=user, compact=self.compact))
+
+    def add_control(self, control: ft.Control, summary: str = ""):
+        self._push(("block", summary, False), control)
+
+    def _push(self, record, control):
+        self.records.append(record)
+        self.view.controls.append(control)
+        self.view.auto_scroll = True   # mensaje nuevo: volver al final
+        self._trim()
+
+    def _trim(self):
+        extra = len(self.view.controls) - self.live
+        if extra > 0:
+            del self.view.controls[:extra]
+            self.start += extra
+        extra = len(self.records) - self.max_records
+        if extra > 0:
+            del self.records[:extra]
+            self.start = max(0, self.start - extra)
+
+    # ---------- Scroll hacia atrás ----------
+    def _materialize(self, record) -> ft.Control:
+        # el historial recuperado se muestra en modo compacto (más liviano)
+        kind, text, user = record
+        if kind == "block":
+            return bubble(text or "(contenido anterior)", user=False, compact=True)
+        return bubble(text, user=user, compact=True)
+
+    def load_older(self) -> int:
+        """Reconstruye hasta `page_size` mensajes anteriores; devuelve cuántos."""
+        if self.start <= 0:
+            return 0
+        first = max(0, self.start - self.page_size)
+        older = [self._materialize(r) for r in self.records[first:self.start]]
+        self.view.controls[:0] = older
+        self.start = first
+        self.view.auto_scroll = False  # no saltar al final mientras se lee
+        return len(older)
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        # por el batcher de la página: leer el historial también cuenta como actividad
+        page = self.view.page
+        if page is None:
+            return
+        ui = UpdateBatcher.for_page(page)
+        with ui.batch():
+            if e.pixels is not None and e.pixels <= 40 and self.start > 0:
+                if self.load_older():
+                    ui.update()
+
+    # ---------- Info ----------
+    def stats(self) -> dict:
+        return {
+            "records": len(self.records),
+            "live": len(self.view.controls),
+            "archived": self.start,
+            "chars": sum(len(t) for _, t, _ in self.records),
+        }
+
+    def nbytes(self) -> int:
+        """Tamaño aproximado de los registros guardados."""
+        return sys.getsizeof(self.records) + sum(
+            sys.getsizeof(r) + sys.getsizeof(r[1]) for r in self.records
+        )
+
+    def drop_archived(self, keep: int = 0) -> int:
+        """Descarta registros fuera de la ventana (deja `keep`); devuelve cuántos."""
+        n = max(0, self.start - keep)
+        if n:
+            del self.records[:n]
+            self.start -= n
+        return n
+
+    def clear(self):
+        self.records.clear()
+        self.view.controls.clear()
+        self.start = 0
@@ -26,19 +26,34 @@ def primary_btn(texto: str, on_click, width: int | None = None):
         width=width,
     )
 
-def bubble(text: str, user: bool = False):
-    user_avatar = ft.CircleAvatar(content=ft.Text("🐣", size=20), bgcolor=HEX["ACCENT"])
-    bot_avatar  = ft.CircleAvatar(content=ft.Text("🤖", size=20))
+# Piezas compartidas por todas las burbujas (se construyen una sola vez)
+_BORDER = ft.border.all(1, HEX["BORDER"])
+_AVATAR = {True: ("🐣", HEX["ACCENT"]), False: ("🤖", None)}   # user -> (emoji, color)
+_GAP = 26   # separación avatar-texto (antes: spacing 10 + hueco de 6 + spacing 10)
+
+
+def bubble(text: str, user: bool = False, compact: bool = False):
+    """
+    Mensaje del chat. Solo se crea el avatar que se muestra.
+    compact=True: sin CircleAvatar (el emoji va en el propio texto).
+    """
+    emoji, color = _AVATAR[user]
+    if compact:
+        body = ft.Text(f"{emoji}  {text}", size=14, selectable=True)
+    else:
+        body = ft.Row(
+            [ft.CircleAvatar(content=ft.Text(emoji, size=20), bgcolor=color),
+             ft.Text(text, size=14, selectable=True)],
+            spacing=_GAP,
+            vertical_alignment=ft.CrossAxisAlignment.CENTER,
+        )
     return ft.Row(
         [
             ft.Container(
-                ft.Row(
-                    [user_avatar if user else bot_avatar, ft.Container(width=6), ft.Text(text, size=14, selectable=True)],
-                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                ),
+                body,
                 bgcolor=HEX["USER"] if user else HEX["BOT"],
                 padding=12,
-                border=ft.border.all(1, HEX["BORDER"]),
+                border=_BORDER,
                 border_radius=16 if user else 12,
                 width=740,
             )